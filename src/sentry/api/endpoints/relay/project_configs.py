@@ -1,6 +1,5 @@
 import logging
 import random
-from typing import Optional
 
 from django.conf import settings
 from rest_framework.request import Request
@@ -12,7 +11,7 @@ from sentry.api.base import Endpoint
 from sentry.api.permissions import RelayPermission
 from sentry.models import Organization, OrganizationOption, Project, ProjectKey, ProjectKeyStatus
 from sentry.relay import config, projectconfig_cache
-from sentry.tasks.relay import schedule_build_project_config
+from sentry.tasks.relay import schedule_build_project_configs
 from sentry.utils import metrics
 
 logger = logging.getLogger(__name__)
@@ -113,33 +112,26 @@ class RelayProjectConfigsEndpoint(Endpoint):
 
         proj_configs = {}
         pending = []
+        cached = projectconfig_cache.get_many(public_keys)
         for key in public_keys:
-            computed = self._get_cached_or_schedule(key)
+            computed = cached.get(key)
             if not computed:
                 pending.append(key)
             else:
                 proj_configs[key] = computed
 
+        # Schedule all cache misses at once, so that they are computed in as few tasks
+        # as possible.  Debouncing of the keys happens after the tasks have been
+        # scheduled.
+        if pending:
+            schedule_build_project_configs(pending)
+
         metrics.incr("relay.project_configs.post_v3.pending", amount=len(pending))
         metrics.incr("relay.project_configs.post_v3.fetched", amount=len(proj_configs))
         res = {"configs": proj_configs, "pending": pending}
 
         return Response(res, status=200)
 
-    def _get_cached_or_schedule(self, public_key) -> Optional[dict]:
-        """
-        Returns the config of a project if it's in the cache; else, schedules a
-        task to compute and write it into the cache.
-
-        Debouncing of the project happens after the task has been scheduled.
-        """
-        cached_config = projectconfig_cache.get(public_key)
-        if cached_config:
-            return cached_config
-
-        schedule_build_project_config(public_key=public_key)
-        return None
-
     def _post_by_key(self, request: Request, full_config_requested):
         public_keys = request.relay_request_data.get("publicKeys")
         public_keys = set(public_keys or ())
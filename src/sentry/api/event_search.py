@@ -30,6 +30,7 @@ from sentry.search.utils import (
     parse_percentage,
     parse_size,
 )
+from sentry.utils.lru import LRUCache
 from sentry.utils.snuba import (
     Dataset,
     is_duration_measurement,
@@ -485,16 +486,23 @@ class SearchVisitor(NodeVisitor):
             config = SearchConfig()
         self.config = config
         self.params = params if params is not None else {}
-        if builder is None:
+        self._builder = builder
+        # Whether the result only depends on the query and the config, and not
+        # on the params, the builder or the current time.
+        self.cacheable = True
+
+    @property
+    def builder(self):
+        self.cacheable = False
+        if self._builder is None:
             # Avoid circular import
             from sentry.search.events.builder import UnresolvedQuery
 
             # TODO: read dataset from config
-            self.builder = UnresolvedQuery(
+            self._builder = UnresolvedQuery(
                 dataset=Dataset.Discover, params=self.params, functions_acl=FUNCTIONS.keys()
             )
-        else:
-            self.builder = builder
+        return self._builder
 
     @cached_property
     def key_mappings_lookup(self):
@@ -630,6 +638,7 @@ class SearchVisitor(NodeVisitor):
         (search_key, _, value) = children
 
         if self.is_date_key(search_key.name):
+            self.cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(value.text)
             except InvalidQuery as exc:
@@ -838,6 +847,7 @@ class SearchVisitor(NodeVisitor):
         operator = handle_negation(negation, operator)
         is_date_aggregate = any(key in search_key.name for key in self.config.date_keys)
         if is_date_aggregate:
+            self.cacheable = False
             try:
                 from_val, to_val = parse_datetime_range(search_value.text)
             except InvalidQuery as exc:
@@ -1089,6 +1099,13 @@ class SearchVisitor(NodeVisitor):
         return children or node
 
 
+# Parse trees of queries, which are independent of the config.
+_parse_tree_cache = LRUCache(maxsize=1000, metrics_key="event_search.parse_tree_cache")
+
+# Results of ``parse_search_query`` keyed by the query, the config and its
+# overrides, for queries that can be resolved without params or a builder.
+_parse_result_cache = LRUCache(maxsize=5000, metrics_key="event_search.parse_result_cache")
+
 default_config = SearchConfig(
     duration_keys={"transaction.duration"},
     percentage_keys={"percentage"},
@@ -1121,25 +1138,71 @@ default_config = SearchConfig(
 )
 
 
+def _freeze(value):
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(val) for val in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    hash(value)
+    return value
+
+
+def _parse_tree(query):
+    tree = _parse_tree_cache.get(query)
+    if tree is None:
+        try:
+            tree = event_search_grammar.parse(query)
+        except IncompleteParseError as e:
+            idx = e.column()
+            prefix = query[max(0, idx - 5) : idx]
+            suffix = query[idx : (idx + 5)]
+            raise InvalidSearchQuery(
+                "{} {}".format(
+                    f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
+                    "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
+                )
+            )
+        _parse_tree_cache.set(query, tree)
+    return tree
+
+
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
 ) -> Sequence[SearchFilter]:
+    """
+    Parses a search query into a list of search filters, boolean operators and
+    paren expressions.
+
+    Parse trees and results that only depend on the query and the config are
+    cached in-process. Cached filters are shared between callers, so the
+    returned list may be modified but the filters in it must not be mutated.
+    """
     if config is None:
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
-    except IncompleteParseError as e:
-        idx = e.column()
-        prefix = query[max(0, idx - 5) : idx]
-        suffix = query[idx : (idx + 5)]
-        raise InvalidSearchQuery(
-            "{} {}".format(
-                f"Parse error at '{prefix}{suffix}' (column {e.column():d}).",
-                "This is commonly caused by unmatched parentheses. Enclose any text in double quotes.",
-            )
-        )
+        cache_key = (query, id(config), _freeze(config_overrides or {}))
+    except TypeError:
+        # Unhashable overrides can't be part of a cache key.
+        cache_key = None
+
+    if cache_key is not None:
+        cached = _parse_result_cache.get(cache_key)
+        # The config is kept alive by the cache, so it can't be another config
+        # that was allocated with the same id.
+        if cached is not None and cached[0] is config:
+            return list(cached[1])
 
+    tree = _parse_tree(query)
+
+    visitor_config = config
     if config_overrides:
-        config = SearchConfig.create_from(config, **config_overrides)
-    return SearchVisitor(config, params=params, builder=builder).visit(tree)
+        visitor_config = SearchConfig.create_from(config, **config_overrides)
+    visitor = SearchVisitor(visitor_config, params=params, builder=builder)
+    result = visitor.visit(tree)
+
+    if cache_key is not None and visitor.cacheable:
+        _parse_result_cache.set(cache_key, (config, tuple(result)))
+    return result
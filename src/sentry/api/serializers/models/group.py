@@ -894,9 +894,9 @@ class GroupSerializerSnuba(GroupSerializerBase):
         )
 
     @staticmethod
-    def _execute_error_seen_stats_query(
+    def _get_error_seen_stats_query(
         item_list, start=None, end=None, conditions=None, environment_ids=None
-    ):
+    ) -> MutableMapping[str, Any]:
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
         aggregations = [
@@ -908,7 +908,7 @@ class GroupSerializerSnuba(GroupSerializerBase):
         filters = {"project_id": project_ids, "group_id": group_ids}
         if environment_ids:
             filters["environment"] = environment_ids
-        return aliased_query(
+        return dict(
             dataset=Dataset.Events,
             start=start,
             end=end,
@@ -916,13 +916,12 @@ class GroupSerializerSnuba(GroupSerializerBase):
             conditions=conditions,
             filter_keys=filters,
             aggregations=aggregations,
-            referrer="serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
         )
 
     @staticmethod
-    def _execute_perf_seen_stats_query(
+    def _get_perf_seen_stats_query(
         item_list, start=None, end=None, conditions=None, environment_ids=None
-    ):
+    ) -> MutableMapping[str, Any]:
         project_ids = list({item.project_id for item in item_list})
         group_ids = [item.id for item in item_list]
         aggregations = [
@@ -935,7 +934,7 @@ class GroupSerializerSnuba(GroupSerializerBase):
         filters = {"project_id": project_ids, "group_id": group_ids}
         if environment_ids:
             filters["environment"] = environment_ids
-        return aliased_query(
+        return dict(
             dataset=Dataset.Transactions,
             start=start,
             end=end,
@@ -943,6 +942,23 @@ class GroupSerializerSnuba(GroupSerializerBase):
             conditions=conditions,
             filter_keys=filters,
             aggregations=aggregations,
+        )
+
+    @classmethod
+    def _execute_error_seen_stats_query(
+        cls, item_list, start=None, end=None, conditions=None, environment_ids=None
+    ):
+        return aliased_query(
+            **cls._get_error_seen_stats_query(item_list, start, end, conditions, environment_ids),
+            referrer="serializers.GroupSerializerSnuba._execute_error_seen_stats_query",
+        )
+
+    @classmethod
+    def _execute_perf_seen_stats_query(
+        cls, item_list, start=None, end=None, conditions=None, environment_ids=None
+    ):
+        return aliased_query(
+            **cls._get_perf_seen_stats_query(item_list, start, end, conditions, environment_ids),
             referrer="serializers.GroupSerializerSnuba._execute_perf_seen_stats_query",
         )
 
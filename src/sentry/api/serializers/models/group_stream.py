@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import functools
 from abc import abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Callable, Mapping, MutableMapping, Optional, Sequence
+from typing import Any, Callable, Mapping, MutableMapping, Optional, Sequence, Tuple
 
+import sentry_sdk
 from django.utils import timezone
 
 from sentry import release_health, tsdb
@@ -20,9 +22,12 @@ from sentry.constants import StatsPeriod
 from sentry.models import Environment, Group
 from sentry.models.groupinbox import get_inbox_details
 from sentry.models.groupowner import get_owner_details
+from sentry.snuba.referrer import Referrer
+from sentry.types.issues import GroupCategory
 from sentry.utils import metrics
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
+from sentry.utils.snuba import aliased_query_params, bulk_raw_query
 
 
 @dataclass
@@ -368,60 +373,104 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
             **query_params,
         )
 
+    def _get_seen_stats(
+        self, item_list: Sequence[Group], user
+    ) -> Optional[Mapping[Group, SeenStats]]:
+        if self._collapse("stats"):
+            return None
+
+        # Query the stats of all issue types at once instead of one type after the other
+        error_issues = [group for group in item_list if GroupCategory.ERROR == group.issue_category]
+        perf_issues = [
+            group for group in item_list if GroupCategory.PERFORMANCE == group.issue_category
+        ]
+        agg_stats = self.__seen_stats_impl(
+            [
+                (error_issues, self._get_error_seen_stats_query),
+                (perf_issues, self._get_perf_seen_stats_query),
+            ]
+        )
+        return {group: agg_stats.get(group, {}) for group in item_list}
+
     def _seen_stats_error(
         self, error_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(error_issue_list, self._execute_error_seen_stats_query)
+        return self.__seen_stats_impl([(error_issue_list, self._get_error_seen_stats_query)])
 
     def _seen_stats_performance(
         self, perf_issue_list: Sequence[Group], user
     ) -> Mapping[Group, SeenStats]:
-        return self.__seen_stats_impl(perf_issue_list, self._execute_perf_seen_stats_query)
+        return self.__seen_stats_impl([(perf_issue_list, self._get_perf_seen_stats_query)])
 
     def __seen_stats_impl(
         self,
-        error_issue_list: Sequence[Group],
-        seen_stats_func: Callable[[Any, Any, Any, Any, Any], Mapping[str, Any]],
-    ) -> Mapping[Any, SeenStats]:
-        partial_execute_seen_stats_query = functools.partial(
-            seen_stats_func,
-            item_list=error_issue_list,
-            environment_ids=self.environment_ids,
-            start=self.start,
-            end=self.end,
-        )
-        time_range_result = self._parse_seen_stats_results(
-            partial_execute_seen_stats_query(),
-            error_issue_list,
-            self.start or self.end or self.conditions,
-            self.environment_ids,
-        )
-        filtered_result = (
-            self._parse_seen_stats_results(
-                partial_execute_seen_stats_query(conditions=self.conditions),
-                error_issue_list,
-                self.start or self.end or self.conditions,
-                self.environment_ids,
+        issue_lists: Sequence[Tuple[Sequence[Group], Callable[..., MutableMapping[str, Any]]]],
+    ) -> MutableMapping[Any, SeenStats]:
+        """
+        Sends the time range, filtered and lifetime seen stats queries for every
+        list of issues to Snuba in a single batch, which runs them concurrently.
+        """
+        use_filtered = self.conditions and not self._collapse("filtered")
+        use_lifetime = not self._collapse("lifetime") and (self.start or self.end)
+
+        queries = []
+        for issue_list, get_query in issue_lists:
+            if not issue_list:
+                continue
+            partial_get_query = functools.partial(
+                get_query,
+                item_list=issue_list,
+                environment_ids=self.environment_ids,
+                start=self.start,
+                end=self.end,
             )
-            if self.conditions and not self._collapse("filtered")
-            else None
-        )
-        lifetime_result = (
-            (
+            queries.append(("time_range", issue_list, partial_get_query()))
+            if use_filtered:
+                queries.append(
+                    ("filtered", issue_list, partial_get_query(conditions=self.conditions))
+                )
+            if use_lifetime:
+                queries.append(("lifetime", issue_list, partial_get_query(start=None, end=None)))
+
+        if not queries:
+            return {}
+
+        with sentry_sdk.start_span(
+            op="serializers.StreamGroupSerializerSnuba", description="seen_stats"
+        ) as span:
+            span.set_data("query_count", len(queries))
+            query_params = []
+            for kind, issue_list, query in queries:
+                with sentry_sdk.start_span(
+                    op="serializers.StreamGroupSerializerSnuba.prepare_seen_stats",
+                    description=f"{kind}:{query['dataset'].value}",
+                ):
+                    query_params.append(aliased_query_params(**query))
+            results = bulk_raw_query(
+                query_params,
+                referrer=Referrer.SERIALIZERS_STREAMGROUPSERIALIZERSNUBA_SEEN_STATS.value,
+            )
+
+        parsed: MutableMapping[str, MutableMapping[Any, SeenStats]] = defaultdict(dict)
+        for (kind, issue_list, _), result in zip(queries, results):
+            parsed[kind].update(
                 self._parse_seen_stats_results(
-                    partial_execute_seen_stats_query(start=None, end=None),
-                    error_issue_list,
-                    False,
+                    result,
+                    issue_list,
+                    kind != "lifetime" and (self.start or self.end or self.conditions),
                     self.environment_ids,
                 )
-                if self.start or self.end
-                else time_range_result
             )
+
+        time_range_result = parsed["time_range"]
+        filtered_result = parsed["filtered"] if use_filtered else None
+        lifetime_result = (
+            (parsed["lifetime"] if use_lifetime else time_range_result)
             if not self._collapse("lifetime")
             else None
         )
 
-        for item in error_issue_list:
+        for item in time_range_result:
             time_range_result[item].update(
                 {
                     "filtered": filtered_result.get(item) if filtered_result else None,
@@ -1,6 +1,9 @@
 import logging
+from collections import defaultdict
 
-from django.db.models import F
+from django.db import connections, router, transaction
+from django.db.models import F, Model
+from django.db.models.signals import post_save
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
@@ -28,7 +31,7 @@ class Buffer(Service, metaclass=BufferMount):
     keep up with the updates.
     """
 
-    __all__ = ("get", "incr", "process", "process_pending", "validate")
+    __all__ = ("get", "incr", "process", "process_batch", "process_pending", "validate")
 
     def get(self, model, columns, filters):
         """
@@ -102,3 +105,192 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, batch):
+        """
+        Applies many buffered increments at once.
+
+        ``batch`` is a sequence of ``(model, columns, filters, extra,
+        signal_only)`` tuples, see ``process``. Increments of the same model
+        that touch the same set of columns are applied with a single ``UPDATE
+        ... FROM (VALUES ...)`` statement. Rows that do not exist yet are
+        created through ``process``.
+
+        Subclasses may override ``process`` with a different signature, which
+        is why ``Buffer.process`` is called explicitly.
+        """
+        coalesced = defaultdict(list)
+        for model, columns, filters, extra, signal_only in batch:
+            if signal_only:
+                Buffer.process(self, model, columns, filters, extra, signal_only)
+                continue
+
+            extra = extra or {}
+            coalesced[
+                (model, tuple(sorted(filters)), tuple(sorted(columns)), tuple(sorted(extra)))
+            ].append((columns, filters, extra))
+
+        for (model, filter_names, column_names, extra_names), entries in coalesced.items():
+            if len(entries) == 1:
+                columns, filters, extra = entries[0]
+                Buffer.process(self, model, columns, filters, extra)
+                continue
+
+            updated = _bulk_update(model, filter_names, column_names, extra_names, entries)
+            if updated is None:
+                # The model or its filters are not supported by the bulk path
+                for columns, filters, extra in entries:
+                    Buffer.process(self, model, columns, filters, extra)
+                continue
+
+            for columns, filters, extra in entries:
+                missing = _filter_values(model, filter_names, filters) not in updated
+                if missing and not _is_update_only(model):
+                    Buffer.process(self, model, columns, filters, extra)
+                    continue
+
+                # Like ``process``, the signal is also sent for deleted groups
+                buffer_incr_complete.send_robust(
+                    model=model,
+                    columns=columns,
+                    filters=filters,
+                    extra=extra,
+                    created=False,
+                    sender=model,
+                )
+
+
+def _is_update_only(model):
+    from sentry.models import Group
+
+    # Deleted groups are never recreated, see ``Buffer.process``
+    return model is Group
+
+
+def _coerce_filter_value(value):
+    if isinstance(value, Model):
+        return value.pk
+    return value
+
+
+def _filter_values(model, filter_names, filters):
+    return tuple(_coerce_filter_value(filters[name]) for name in filter_names)
+
+
+def _get_field(model, name):
+    if name == "pk":
+        return model._meta.pk
+    return model._meta.get_field(name)
+
+
+def _get_cast_type(field, connection):
+    # Serial types only exist in column definitions, cast primary keys to the
+    # type referencing them instead (see ``FlexibleForeignKey``).
+    if hasattr(field, "get_related_db_type"):
+        return field.get_related_db_type(connection)
+    return field.cast_db_type(connection)
+
+
+def _bulk_update(model, filter_names, column_names, extra_names, entries):
+    """
+    Increments ``column_names`` and sets ``extra_names`` for all rows matching
+    the filters of ``entries`` in one statement. Returns the set of filter
+    values that matched a row, or ``None`` if the bulk path cannot be used.
+    """
+    from sentry.models import Group
+
+    try:
+        filter_fields = [_get_field(model, name) for name in filter_names]
+        column_fields = [_get_field(model, name) for name in column_names]
+        extra_fields = [_get_field(model, name) for name in extra_names]
+    except Exception:
+        return None
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+
+    all_fields = filter_fields + column_fields + extra_fields
+    aliases = [f"v{i}" for i in range(len(all_fields))]
+    filter_aliases = aliases[: len(filter_fields)]
+    column_aliases = aliases[len(filter_fields) : len(filter_fields) + len(column_fields)]
+    extra_aliases = aliases[len(filter_fields) + len(column_fields) :]
+
+    placeholder = "({})".format(
+        ", ".join(f"%s::{_get_cast_type(field, connection)}" for field in all_fields)
+    )
+
+    # Postgres updates every row only once per statement, so increments of
+    # the same row are summed up front. Like in ``process``, the last extra
+    # values win.
+    merged = {}
+    for columns, filters, extra in entries:
+        key = _filter_values(model, filter_names, filters)
+        if key in merged:
+            merged_columns, _ = merged[key]
+            columns = {name: merged_columns[name] + columns[name] for name in column_names}
+        merged[key] = (columns, extra)
+
+    rows = []
+    for key, (columns, extra) in merged.items():
+        values = list(key)
+        values += [columns[name] for name in column_names]
+        values += [extra[name] for name in extra_names]
+        rows.append(
+            [field.get_db_prep_save(value, connection) for field, value in zip(all_fields, values)]
+        )
+
+    # Update rows in a stable order to avoid deadlocks between concurrent flushes
+    rows.sort(key=lambda row: tuple(str(value) for value in row[: len(filter_fields)]))
+
+    assignments = [
+        f"{quote(field.column)} = t.{quote(field.column)} + v.{alias}"
+        for field, alias in zip(column_fields, column_aliases)
+    ]
+    assignments += [
+        f"{quote(field.column)} = v.{alias}" for field, alias in zip(extra_fields, extra_aliases)
+    ]
+
+    # Keep in sync with ``ScoreClause``
+    if model is Group and "times_seen" in column_names and "last_seen" in extra_names:
+        times_seen = column_aliases[column_names.index("times_seen")]
+        last_seen = extra_aliases[extra_names.index("last_seen")]
+        assignments.append(
+            f"score = log(t.times_seen + v.{times_seen}) * 600"
+            f" + floor(extract(epoch from v.{last_seen}))::int"
+        )
+
+    if not assignments:
+        return None
+
+    sql = (
+        "UPDATE {table} AS t SET {assignments} "
+        "FROM (VALUES {values}) AS v ({aliases}) "
+        "WHERE {where} "
+        "RETURNING {returning}"
+    ).format(
+        table=quote(model._meta.db_table),
+        assignments=", ".join(assignments),
+        values=", ".join([placeholder] * len(rows)),
+        aliases=", ".join(aliases),
+        where=" AND ".join(
+            f"t.{quote(field.column)} = v.{alias}"
+            for field, alias in zip(filter_fields, filter_aliases)
+        ),
+        returning=", ".join(
+            [f"t.{quote(model._meta.pk.column)}"]
+            + [f"t.{quote(field.column)}" for field in filter_fields]
+        ),
+    )
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        cursor.execute(sql, [value for row in rows for value in row])
+        returned = cursor.fetchall()
+
+    if model is Group and returned:
+        # ``Group.update`` fires ``post_save`` to refresh the group cache, keep
+        # doing that for bulk updates.
+        for group in Group.objects.filter(id__in=[row[0] for row in returned]):
+            post_save.send(sender=Group, instance=group, created=False)
+
+    return {tuple(row[1:]) for row in returned}
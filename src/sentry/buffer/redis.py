@@ -1,5 +1,6 @@
 import pickle
 import threading
+from collections import defaultdict
 from datetime import datetime
 from time import time
 
@@ -14,6 +15,7 @@ from sentry.utils import json, metrics
 from sentry.utils.compat import crc32
 from sentry.utils.hashlib import md5_text
 from sentry.utils.imports import import_string
+from sentry.utils.lru import LRUCache
 from sentry.utils.redis import get_cluster_from_options
 
 _local_buffers = None
@@ -51,13 +53,37 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        local_cache_ttl=0,
+        local_cache_size=10000,
+        bulk_process=False,
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
+        # Drain batches of keys with one pipeline per Redis node and apply them
+        # with bulk updates instead of processing (and locking) each key on its
+        # own. Best combined with a larger ``incr_batch_size``.
+        self.bulk_process = bulk_process
+
+        # Optional in-process tier for ``get``. During an error storm on a
+        # single group, post processing reads the buffered counters of that
+        # group for every event. Caching them for a short time trades a little
+        # staleness of ``times_seen_pending`` for far fewer Redis roundtrips.
+        if local_cache_ttl > 0:
+            self.local_cache = LRUCache(
+                local_cache_size, ttl=local_cache_ttl, metrics_key="buffer.get.local_cache"
+            )
+        else:
+            self.local_cache = None
+
     def validate(self):
         try:
             # wait 10 seconds at most
@@ -150,6 +176,12 @@ class RedisBuffer(Buffer):
         Fetches buffered values for a model/filter. Passed columns must be integer columns.
         """
         key = self._make_key(model, filters)
+
+        if self.local_cache is not None:
+            cached = self.local_cache.get(key)
+            if cached is not None and all(col in cached for col in columns):
+                return {col: cached[col] for col in columns}
+
         conn = self.cluster.get_local_client_for_key(key)
         pipe = conn.pipeline()
 
@@ -157,9 +189,21 @@ class RedisBuffer(Buffer):
             pipe.hget(key, f"i+{col}")
         results = pipe.execute()
 
-        return {
+        result = {
             col: (int(results[i]) if results[i] is not None else 0) for i, col in enumerate(columns)
         }
+        if self.local_cache is not None:
+            self.local_cache.set(key, dict(result))
+        return result
+
+    def _invalidate_local_cache(self, key):
+        """
+        Drops the locally cached ``get`` result of a buffer key. This only
+        affects the current process, other processes see the change once their
+        entries expire.
+        """
+        if self.local_cache is not None:
+            self.local_cache.delete(key)
 
     def incr(self, model, columns, filters, extra=None, signal_only=None, return_incr_results=True):
         """
@@ -206,6 +250,8 @@ class RedisBuffer(Buffer):
         pipe.zadd(pending_key, {key: time()})
         pipe.execute()
 
+        self._invalidate_local_cache(key)
+
         metrics.incr(
             "buffer.incr",
             skip_internal=True,
@@ -262,9 +308,43 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if self.bulk_process and len(batch_keys) > 1:
+            self._process_many_incrs(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
+    def _process_many_incrs(self, keys):
+        keys_by_host = defaultdict(list)
+        router = self.cluster.get_router()
+        for key in keys:
+            keys_by_host[router.get_host_for_key(key)].append(key)
+
+        batch = []
+        for host_id, host_keys in keys_by_host.items():
+            # Reading and deleting a key happens atomically within the
+            # transaction, so duplicate tasks for the same key cannot apply its
+            # increments twice and no per-key lock is needed.
+            pipe = self.cluster.get_local_client(host_id).pipeline(transaction=True)
+            for key in host_keys:
+                pipe.hgetall(key)
+                pipe.zrem(self._make_pending_key_from_key(key), key)
+                pipe.delete(key)
+            results = pipe.execute()
+
+            for key, values in zip(host_keys, results[::3]):
+                self._invalidate_local_cache(key)
+                values = {force_text(k): v for k, v in values.items()}
+                if not values:
+                    metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+                    continue
+                batch.append(self._load_incr_values(values))
+
+        metrics.timing("buffer.process_many.size", len(batch))
+        if batch:
+            self.process_batch(batch)
+
     def _process_single_incr(self, key):
         client = self.cluster.get_routing_client()
         lock_key = self._make_lock_key(key)
@@ -285,6 +365,8 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
+            self._invalidate_local_cache(key)
+
             # XXX(python3): In python2 this isn't as important since redis will
             # return string tyes (be it, byte strings), but in py3 we get bytes
             # back, and really we just want to deal with keys as strings.
@@ -295,32 +377,39 @@ class RedisBuffer(Buffer):
                 self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            super().process(model, incr_values, filters, extra_values, signal_only)
+            super().process(*self._load_incr_values(values))
         finally:
             client.delete(lock_key)
+
+    def _load_incr_values(self, values):
+        """
+        Turns the hash of a buffer key into the ``(model, columns, filters,
+        extra, signal_only)`` arguments of ``Buffer.process``.
+        """
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
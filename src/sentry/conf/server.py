@@ -1433,11 +1433,30 @@ SENTRY_DEFAULT_MAX_EVENTS_PER_MINUTE = "90%"
 SENTRY_SNUBA = os.environ.get("SNUBA", "http://127.0.0.1:1218")
 SENTRY_SNUBA_TIMEOUT = 30
 SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
+# How long a cached Snuba result can still be served after it expired, while
+# another worker recomputes it.
+SENTRY_SNUBA_CACHE_STALE_SECONDS = 60
+# The maximum time a worker holds the lease to compute a cached Snuba result.
+SENTRY_SNUBA_CACHE_LEASE_SECONDS = SENTRY_SNUBA_TIMEOUT
+# How long workers wait for the lease holder to cache a result before they run
+# the query themselves.
+SENTRY_SNUBA_CACHE_LEASE_WAIT_SECONDS = 5
 
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
 
+# Binary codec for node storage payloads, see ``sentry.nodestore.codecs``. An
+# empty config keeps writing the legacy JSON format. Payloads written with any
+# codec can always be read back. For example:
+# SENTRY_NODESTORE_CODEC = {
+#     "serializer": "msgpack",
+#     "compression": "zstd",
+#     "level": 3,
+#     "dictionaries": {"javascript": "/etc/sentry/nodestore-javascript.zstd-dict"},
+# }
+SENTRY_NODESTORE_CODEC = {}
+
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
 SENTRY_TAGSTORE_OPTIONS = {}
@@ -1559,6 +1578,12 @@ SENTRY_SOURCE_FETCH_SOCKET_TIMEOUT = 2
 # Maximum content length for source files before we abort fetching
 SENTRY_SOURCE_FETCH_MAX_SIZE = 40 * 1024 * 1024
 
+# Budget for parsed JavaScript source and source map views that are shared
+# between the events processed by a single process, or 0 to parse the files
+# again for every event. The budget counts the bytes of the original files, the
+# parsed views take up a multiple of that in memory.
+SENTRY_JS_PARSED_VIEW_CACHE_SIZE = 0
+
 # Maximum content length for cache value.  Currently used only to avoid
 # pointless compression of sourcemaps and other release files because we
 # silently fail to cache the compressed result anyway.  Defaults to None which
@@ -2606,6 +2631,11 @@ SENTRY_GROUPING_AUTO_UPDATE_ENABLED = False
 # How long is the migration phase for grouping updates?
 SENTRY_GROUPING_UPDATE_MIGRATION_PHASE = 30 * 24 * 3600  # 30 days
 
+# Directory into which sampled stage profiles of `EventManager.save` are dumped
+# as JSON files (see the `store.save-event-stage-profiler.sample-rate` option).
+# Profiles are only emitted as metrics if this is not set.
+SENTRY_SAVE_EVENT_STAGE_PROFILE_DIR = None
+
 SENTRY_USE_UWSGI = True
 
 # When copying attachments for to-be-reprocessed events into processing store,
@@ -2775,6 +2805,8 @@ ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 
 
 # Default string indexer cache options
+# Set "local_cache_size" to additionally keep indexed strings in process, see
+# ``sentry.sentry_metrics.indexer.cache.StringIndexerCache``.
 SENTRY_STRING_INDEXER_CACHE_OPTIONS = {
     "cache_name": "default",
 }
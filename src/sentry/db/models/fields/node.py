@@ -138,10 +138,32 @@ class NodeData(MutableMapping):
             See documentation of nodestore.
         """
 
+        subkeys = self._get_subkeys_to_write(subkeys)
+        if subkeys is not None:
+            nodestore.set_subkeys(self.id, subkeys)
+
+    @staticmethod
+    def save_many(items):
+        """
+        Write multiple nodes back to nodestore in a single batch.
+
+        :param items: A sequence of ``(node_data, subkeys)`` tuples, see
+            ``save`` for the meaning of ``subkeys``.
+        """
+        to_write = {}
+        for node_data, subkeys in items:
+            subkeys = node_data._get_subkeys_to_write(subkeys)
+            if subkeys is not None:
+                to_write[node_data.id] = subkeys
+
+        if to_write:
+            nodestore.set_subkeys_multi(to_write)
+
+    def _get_subkeys_to_write(self, subkeys):
         # We never loaded any data for reading or writing, so there
         # is nothing to save.
         if self._node_data is None:
-            return
+            return None
 
         # We can't put our wrappers into the nodestore, so we need to
         # ensure that the data is converted into a plain old dict
@@ -151,8 +173,7 @@ class NodeData(MutableMapping):
 
         subkeys = subkeys or {}
         subkeys[None] = to_write
-
-        nodestore.set_subkeys(self.id, subkeys)
+        return subkeys
 
 
 class NodeField(GzippedDictField):
@@ -1,10 +1,11 @@
-from typing import Any, Dict, Union
+from typing import Any, Dict, Iterable, Union
 
 from celery.signals import task_postrun
 from django.core.signals import request_finished
 
 from sentry.db.models.manager import M
 from sentry.db.models.manager.base import BaseManager, _local_cache
+from sentry.utils.cache import cache
 
 
 class OptionManager(BaseManager[M]):
@@ -28,3 +29,47 @@ class OptionManager(BaseManager[M]):
     def _make_key(self, instance_id: Union[int, str]) -> str:
         assert instance_id
         return f"{self.model._meta.db_table}:{instance_id}"
+
+    def _get_all_values_many(
+        self, instance_ids: Iterable[int], field_name: str
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Returns the options of many instances and loads them into the local cache,
+        with a single cache lookup and a single query for instances missing from
+        the cache.
+        """
+        keys = {instance_id: self._make_key(instance_id) for instance_id in instance_ids}
+        missing = {
+            cache_key: instance_id
+            for instance_id, cache_key in keys.items()
+            if cache_key not in self._option_cache
+        }
+
+        if missing:
+            cached = cache.get_many(list(missing))
+            self._option_cache.update(
+                {cache_key: value for cache_key, value in cached.items() if value is not None}
+            )
+
+            uncached_ids = [
+                instance_id
+                for cache_key, instance_id in missing.items()
+                if cached.get(cache_key) is None
+            ]
+            if uncached_ids:
+                results: Dict[int, Dict[str, Any]] = {
+                    instance_id: {} for instance_id in uncached_ids
+                }
+                for option in self.filter(**{f"{field_name}__in": uncached_ids}):
+                    results[getattr(option, f"{field_name}_id")][option.key] = option.value
+
+                values = {
+                    self._make_key(instance_id): result for instance_id, result in results.items()
+                }
+                cache.set_many(values)
+                self._option_cache.update(values)
+
+        return {
+            instance_id: self._option_cache.get(cache_key, {})
+            for instance_id, cache_key in keys.items()
+        }
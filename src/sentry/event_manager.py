@@ -37,6 +37,7 @@ from sentry.constants import (
     DataCategory,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.eventstore.processing import event_processing_store
 from sentry.grouping.api import (
     BackgroundGroupingConfigLoader,
@@ -97,6 +98,7 @@ from sentry.utils.cache import cache_key_for_event
 from sentry.utils.canonical import CanonicalKeyDict
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.outcomes import Outcome, track_outcome
+from sentry.utils.performance import stageprofiler
 from sentry.utils.performance_issues.performance_detection import (
     PerformanceProblem,
     detect_performance_problems,
@@ -367,6 +369,34 @@ class EventManager:
                 self.normalize(project_id=project_id)
             self._normalized = True
 
+        with stageprofiler.profile(
+            "event_manager.save",
+            sample_rate=options.get("store.save-event-stage-profiler.sample-rate"),
+            tags={
+                "platform": self._data.get("platform") or "other",
+                "event_type": self._data.get("type") or "default",
+            },
+            extra={"project_id": project_id, "event_id": self._data.get("event_id")},
+            dump_dir=settings.SENTRY_SAVE_EVENT_STAGE_PROFILE_DIR,
+        ):
+            return self._save_impl(
+                project_id,
+                raw=raw,
+                start_time=start_time,
+                cache_key=cache_key,
+                skip_send_first_transaction=skip_send_first_transaction,
+                auto_upgrade_grouping=auto_upgrade_grouping,
+            )
+
+    def _save_impl(
+        self,
+        project_id,
+        raw,
+        start_time,
+        cache_key,
+        skip_send_first_transaction,
+        auto_upgrade_grouping,
+    ):
         with metrics.timer("event_manager.save.project.get_from_cache"):
             project = Project.objects.get_from_cache(id=project_id)
 
@@ -424,7 +454,9 @@ class EventManager:
             secondary_grouping_config = project.get_option("sentry:secondary_grouping_config")
             secondary_grouping_expiry = project.get_option("sentry:secondary_grouping_expiry")
             if secondary_grouping_config and (secondary_grouping_expiry or 0) >= time.time():
-                with metrics.timer("event_manager.secondary_grouping"):
+                with metrics.timer("event_manager.secondary_grouping"), stageprofiler.stage(
+                    "calculate_secondary_grouping"
+                ):
                     secondary_event = copy.deepcopy(job["event"])
                     loader = SecondaryGroupingConfigLoader()
                     secondary_grouping_config = loader.get_config_dict(project)
@@ -434,7 +466,9 @@ class EventManager:
         except Exception:
             sentry_sdk.capture_exception()
 
-        with metrics.timer("event_manager.load_grouping_config"):
+        with metrics.timer("event_manager.load_grouping_config"), stageprofiler.stage(
+            "load_grouping_config"
+        ):
             # At this point we want to normalize the in_app values in case the
             # clients did not set this appropriately so far.
             if is_reprocessed:
@@ -452,7 +486,7 @@ class EventManager:
 
         with sentry_sdk.start_span(op="event_manager.save.calculate_event_grouping"), metrics.timer(
             "event_manager.calculate_event_grouping"
-        ):
+        ), stageprofiler.stage("calculate_event_grouping"):
             hashes = _calculate_event_grouping(project, job["event"], grouping_config)
 
         hashes = CalculatedHashes(
@@ -477,12 +511,14 @@ class EventManager:
         # posting to eventstream to make sure all counters and eventstream are
         # incremented for sure. Also wait for grouping to remove attachments
         # based on the group counter.
-        with metrics.timer("event_manager.get_attachments"):
+        with metrics.timer("event_manager.get_attachments"), stageprofiler.stage("get_attachments"):
             with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
                 attachments = get_attachments(cache_key, job)
 
         try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+            with sentry_sdk.start_span(
+                op="event_manager.save.save_aggregate_fn"
+            ), stageprofiler.stage("save_aggregate"):
                 group_info = _save_aggregate(
                     event=job["event"],
                     hashes=hashes,
@@ -519,7 +555,9 @@ class EventManager:
             group_id=group_info.group.id, environment_id=job["environment"].id
         )
 
-        with metrics.timer("event_manager.filter_attachments_for_group"):
+        with metrics.timer("event_manager.filter_attachments_for_group"), stageprofiler.stage(
+            "filter_attachments_for_group"
+        ):
             attachments = filter_attachments_for_group(attachments, job)
 
         # XXX: DO NOT MUTATE THE EVENT PAYLOAD AFTER THIS POINT
@@ -561,7 +599,9 @@ class EventManager:
         # group_id on existing models in post_process_group, which already does
         # this because of indiv. attachments.
         if not is_reprocessed:
-            with metrics.timer("event_manager.save_attachments"):
+            with metrics.timer("event_manager.save_attachments"), stageprofiler.stage(
+                "save_attachments"
+            ):
                 save_attachments(cache_key, attachments, job)
 
         metric_tags = {"from_relay": "_relay_processed" in job["data"]}
@@ -610,6 +650,7 @@ def _auto_update_grouping(project):
 
 
 @metrics.wraps("event_manager.background_grouping")
+@stageprofiler.stage("calculate_background_grouping")
 def _calculate_background_grouping(project, event, config):
     return _calculate_event_grouping(project, event, config)
 
@@ -631,6 +672,7 @@ def _run_background_grouping(project, job):
 
 
 @metrics.wraps("save_event.pull_out_data")
+@stageprofiler.stage("pull_out_data")
 def _pull_out_data(jobs, projects):
     """
     A bunch of (probably) CPU bound stuff.
@@ -731,6 +773,7 @@ def _associate_commits_with_release(release: Release, project: Project):
 
 
 @metrics.wraps("save_event.get_or_create_release_many")
+@stageprofiler.stage("get_or_create_release_many")
 def _get_or_create_release_many(jobs, projects):
     jobs_with_releases = {}
     release_date_added = {}
@@ -786,6 +829,7 @@ def _get_or_create_release_many(jobs, projects):
 
 
 @metrics.wraps("save_event.get_event_user_many")
+@stageprofiler.stage("get_event_user_many")
 def _get_event_user_many(jobs, projects):
     for job in jobs:
         data = job["data"]
@@ -799,6 +843,7 @@ def _get_event_user_many(jobs, projects):
 
 
 @metrics.wraps("save_event.derive_plugin_tags_many")
+@stageprofiler.stage("derive_plugin_tags_many")
 def _derive_plugin_tags_many(jobs, projects):
     # XXX: We ought to inline or remove this one for sure
     plugins_for_projects = {p.id: plugins.for_project(p, version=None) for p in projects.values()}
@@ -815,6 +860,7 @@ def _derive_plugin_tags_many(jobs, projects):
 
 
 @metrics.wraps("save_event.derive_interface_tags_many")
+@stageprofiler.stage("derive_interface_tags_many")
 def _derive_interface_tags_many(jobs):
     # XXX: We ought to inline or remove this one for sure
     for job in jobs:
@@ -829,6 +875,7 @@ def _derive_interface_tags_many(jobs):
 
 
 @metrics.wraps("save_event.materialize_metadata_many")
+@stageprofiler.stage("materialize_metadata_many")
 def _materialize_metadata_many(jobs):
     for job in jobs:
         # we want to freeze not just the metadata and type in but also the
@@ -874,6 +921,7 @@ def _create_kwargs(job):
 
 
 @metrics.wraps("save_event.get_or_create_environment_many")
+@stageprofiler.stage("get_or_create_environment_many")
 def _get_or_create_environment_many(jobs, projects):
     for job in jobs:
         job["environment"] = Environment.get_or_create(
@@ -882,6 +930,7 @@ def _get_or_create_environment_many(jobs, projects):
 
 
 @metrics.wraps("save_event.get_or_create_group_environment_many")
+@stageprofiler.stage("get_or_create_group_environment_many")
 def _get_or_create_group_environment_many(jobs, projects):
     for job in jobs:
         for group_info in job["groups"]:
@@ -893,6 +942,7 @@ def _get_or_create_group_environment_many(jobs, projects):
 
 
 @metrics.wraps("save_event.get_or_create_release_associated_models")
+@stageprofiler.stage("get_or_create_release_associated_models")
 def _get_or_create_release_associated_models(jobs, projects):
     # XXX: This is possibly unnecessarily detached from
     # _get_or_create_release_many, but we do not want to destroy order of
@@ -939,6 +989,7 @@ def _get_or_create_release_associated_models(jobs, projects):
 
 
 @metrics.wraps("save_event.get_or_create_group_release_many")
+@stageprofiler.stage("get_or_create_group_release_many")
 def _get_or_create_group_release_many(jobs, projects):
     for job in jobs:
         if job["release"]:
@@ -952,30 +1003,36 @@ def _get_or_create_group_release_many(jobs, projects):
 
 
 @metrics.wraps("save_event.tsdb_record_all_metrics")
+@stageprofiler.stage("tsdb_record_all_metrics")
 def _tsdb_record_all_metrics(jobs):
     """
-    Do all tsdb-related things for save_event in here s.t. we can potentially
-    put everything in a single redis pipeline someday.
+    Do all tsdb-related things for save_event in here s.t. they are written in
+    a single batch for all jobs.
     """
 
     # XXX: validate whether anybody actually uses those metrics
 
+    incrs = []
+    frequencies = []
+    records = []
+
     for job in jobs:
-        incrs = []
-        frequencies = []
-        records = []
-        incrs.append((tsdb.models.project, job["project_id"]))
         event = job["event"]
         release = job["release"]
         environment = job["environment"]
         user = job["user"]
+        timestamp = event.datetime
+
+        incrs.append((tsdb.models.project, job["project_id"], timestamp, environment.id))
 
         for group_info in job["groups"]:
-            incrs.append((tsdb.models.group, group_info.group.id))
+            incrs.append((tsdb.models.group, group_info.group.id, timestamp, environment.id))
             frequencies.append(
                 (
                     tsdb.models.frequent_environments_by_group,
                     {group_info.group.id: {environment.id: 1}},
+                    timestamp,
+                    None,
                 )
             )
 
@@ -984,33 +1041,44 @@ def _tsdb_record_all_metrics(jobs):
                     (
                         tsdb.models.frequent_releases_by_group,
                         {group_info.group.id: {group_info.group_release.id: 1}},
+                        timestamp,
+                        None,
                     )
                 )
             if user:
                 records.append(
-                    (tsdb.models.users_affected_by_group, group_info.group.id, (user.tag_value,))
+                    (
+                        tsdb.models.users_affected_by_group,
+                        group_info.group.id,
+                        (user.tag_value,),
+                        timestamp,
+                        environment.id,
+                    )
                 )
 
         if release:
-            incrs.append((tsdb.models.release, release.id))
+            incrs.append((tsdb.models.release, release.id, timestamp, environment.id))
 
         if user:
-            project_id = job["project_id"]
-            records.append((tsdb.models.users_affected_by_project, project_id, (user.tag_value,)))
-
-        if incrs:
-            tsdb.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
-
-        if records:
-            tsdb.record_multi(records, timestamp=event.datetime, environment_id=environment.id)
+            records.append(
+                (
+                    tsdb.models.users_affected_by_project,
+                    job["project_id"],
+                    (user.tag_value,),
+                    timestamp,
+                    environment.id,
+                )
+            )
 
-        if frequencies:
-            tsdb.record_frequency_multi(frequencies, timestamp=event.datetime)
+    if incrs or records or frequencies:
+        tsdb.write_batch(incrs=incrs, records=records, frequencies=frequencies)
 
 
 @metrics.wraps("save_event.nodestore_save_many")
+@stageprofiler.stage("nodestore_save_many")
 def _nodestore_save_many(jobs):
     inserted_time = datetime.utcnow().replace(tzinfo=UTC).timestamp()
+    to_save = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1026,11 +1094,16 @@ def _nodestore_save_many(jobs):
                 subkeys["unprocessed"] = unprocessed
 
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        to_save.append((job["event"].data, subkeys))
+
+    # Write all events of the batch with a single nodestore round-trip.
+    NodeData.save_many(to_save)
 
 
 @metrics.wraps("save_event.eventstream_insert_many")
+@stageprofiler.stage("eventstream_insert_many")
 def _eventstream_insert_many(jobs):
+    inserts = []
     for job in jobs:
         if job["event"].project_id == settings.SENTRY_PROJECT:
             metrics.incr(
@@ -1050,23 +1123,31 @@ def _eventstream_insert_many(jobs):
             is_regression = group_info.is_regression
             is_new_group_environment = group_info.is_new_group_environment
 
-        eventstream.insert(
-            event=job["event"],
-            is_new=is_new,
-            is_regression=is_regression,
-            is_new_group_environment=is_new_group_environment,
-            primary_hash=job["event"].get_primary_hash(),
-            received_timestamp=job["received_timestamp"],
-            # We are choosing to skip consuming the event back
-            # in the eventstream if it's flagged as raw.
-            # This means that we want to publish the event
-            # through the event stream, but we don't care
-            # about post processing and handling the commit.
-            skip_consume=job.get("raw", False),
+        inserts.append(
+            dict(
+                event=job["event"],
+                is_new=is_new,
+                is_regression=is_regression,
+                is_new_group_environment=is_new_group_environment,
+                primary_hash=job["event"].get_primary_hash(),
+                received_timestamp=job["received_timestamp"],
+                # We are choosing to skip consuming the event back
+                # in the eventstream if it's flagged as raw.
+                # This means that we want to publish the event
+                # through the event stream, but we don't care
+                # about post processing and handling the commit.
+                skip_consume=job.get("raw", False),
+            )
         )
 
+    errors = eventstream.insert_many(inserts)
+    failed = sum(1 for error in errors if error is not None)
+    if failed:
+        metrics.incr("eventstream.insert_many.failed", amount=failed, skip_internal=True)
+
 
 @metrics.wraps("save_event.track_outcome_accepted_many")
+@stageprofiler.stage("track_outcome_accepted_many")
 def _track_outcome_accepted_many(jobs):
     for job in jobs:
         event = job["event"]
@@ -1201,9 +1282,8 @@ def get_culprit(data):
 def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwargs) -> GroupInfo:
     project = event.project
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    grouphashes = _get_or_create_grouphashes(project, hashes.hashes, hashes.hierarchical_hashes)
+    flat_grouphashes = [grouphashes[hash] for hash in hashes.hashes]
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1212,13 +1292,15 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     # when groups are created and also relieves contention by locking a more
     # specific hash than `hierarchical_hashes[0]`.
     existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
-        project, flat_grouphashes, hashes.hierarchical_hashes
+        project, flat_grouphashes, hashes.hierarchical_hashes, hierarchical_grouphashes=grouphashes
     )
 
     if root_hierarchical_hash is not None:
-        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-            project=project, hash=root_hierarchical_hash
-        )[0]
+        root_hierarchical_grouphash = grouphashes.get(root_hierarchical_hash)
+        if root_hierarchical_grouphash is None:
+            root_hierarchical_grouphash = GroupHash.objects.get_or_create(
+                project=project, hash=root_hierarchical_hash
+            )[0]
 
         metadata.update(
             hashes.group_metadata_from_hash(
@@ -1359,10 +1441,42 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     return GroupInfo(group, is_new, is_regression)
 
 
+def _get_or_create_grouphashes(project, hashes, hierarchical_hashes=()):
+    """
+    Fetch the grouphashes of all flat and hierarchical hashes of an event in a
+    single query, and create the missing flat ones in bulk.
+
+    Returns a mapping of hash to `GroupHash`. Hierarchical hashes are only
+    contained if they already exist, as they are only created once chosen as
+    root hash.
+    """
+    grouphashes = {
+        h.hash: h
+        for h in GroupHash.objects.filter(
+            project=project, hash__in=set(hashes) | set(hierarchical_hashes)
+        )
+    }
+
+    missing_hashes = [hash for hash in dict.fromkeys(hashes) if hash not in grouphashes]
+    if missing_hashes:
+        # Concurrent saves may create the same rows, so ignore conflicts and
+        # fetch the rows again, as `bulk_create` cannot return their ids then.
+        GroupHash.objects.bulk_create(
+            [GroupHash(project=project, hash=hash) for hash in missing_hashes],
+            ignore_conflicts=True,
+        )
+        grouphashes.update(
+            (h.hash, h) for h in GroupHash.objects.filter(project=project, hash__in=missing_hashes)
+        )
+
+    return grouphashes
+
+
 def _find_existing_grouphash(
     project,
     flat_grouphashes,
     hierarchical_hashes,
+    hierarchical_grouphashes=None,
 ):
     all_grouphashes = []
     root_hierarchical_hash = None
@@ -1370,10 +1484,11 @@ def _find_existing_grouphash(
     found_split = False
 
     if hierarchical_hashes:
-        hierarchical_grouphashes = {
-            h.hash: h
-            for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
-        }
+        if hierarchical_grouphashes is None:
+            hierarchical_grouphashes = {
+                h.hash: h
+                for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
+            }
 
         # Look for splits:
         # 1. If we find a hash with SPLIT state at `n`, we want to use
@@ -1874,6 +1989,7 @@ def save_attachments(cache_key, attachments, job):
 
 
 @metrics.wraps("event_manager.save_transactions.materialize_event_metrics")
+@stageprofiler.stage("materialize_event_metrics")
 def _materialize_event_metrics(jobs):
     for job in jobs:
         # Ensure the _metrics key exists. This is usually created during
@@ -1939,6 +2055,7 @@ def _calculate_event_grouping(project, event, grouping_config) -> CalculatedHash
 
 
 @metrics.wraps("save_event.calculate_span_grouping")
+@stageprofiler.stage("calculate_span_grouping")
 def _calculate_span_grouping(jobs, projects):
     for job in jobs:
         # Make sure this snippet doesn't crash ingestion
@@ -1962,6 +2079,7 @@ def _calculate_span_grouping(jobs, projects):
 
 
 @metrics.wraps("save_event.detect_performance_problems")
+@stageprofiler.stage("detect_performance_problems")
 def _detect_performance_problems(jobs, projects):
     for job in jobs:
         job["performance_problems"] = detect_performance_problems(job["data"])
@@ -1972,6 +2090,7 @@ class Performance_Job(TypedDict, total=False):
 
 
 @metrics.wraps("save_event.save_aggregate_performance")
+@stageprofiler.stage("save_aggregate_performance")
 def _save_aggregate_performance(jobs: Sequence[Performance_Job], projects):
 
     MAX_GROUPS = (
@@ -18,6 +18,7 @@ class ForwarderNotRequired(NotImplementedError):
 class EventStream(Service):
     __all__ = (
         "insert",
+        "insert_many",
         "start_delete_groups",
         "end_delete_groups",
         "start_merge",
@@ -79,6 +80,22 @@ class EventStream(Service):
             skip_consume,
         )
 
+    def insert_many(self, inserts, asynchronous=True):
+        """
+        Insert many events at once.
+
+        :param inserts: A sequence with the keyword arguments of :meth:`insert`
+            for every event.
+        :param asynchronous: If set, return without waiting for the events to
+            be delivered.
+        :returns: A list with the error of every event that could not be
+            delivered in the order of ``inserts``, or ``None`` for events that
+            were delivered (or are still in flight if ``asynchronous`` is set).
+        """
+        for insert in inserts:
+            self.insert(**insert)
+        return [None] * len(inserts)
+
     def start_delete_groups(self, project_id, group_ids):
         pass
 
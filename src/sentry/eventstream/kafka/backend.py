@@ -109,7 +109,7 @@ class KafkaEventStream(SnubaProtocolEventStream):
                 ),
             }
 
-    def insert(
+    def _get_insert_message(
         self,
         event,
         is_new,
@@ -119,7 +119,7 @@ class KafkaEventStream(SnubaProtocolEventStream):
         received_timestamp: float,
         skip_consume=False,
         **kwargs,
-    ):
+    ) -> Mapping[str, Any]:
         message_type = "transaction" if self._is_transaction_event(event) else "error"
 
         if message_type == "transaction" and self.assign_transaction_partitions_randomly:
@@ -133,7 +133,7 @@ class KafkaEventStream(SnubaProtocolEventStream):
         if assign_partitions_randomly:
             kwargs[KW_SKIP_SEMANTIC_PARTITIONING] = True
 
-        return super().insert(
+        return super()._get_insert_message(
             event,
             is_new,
             is_regression,
@@ -144,26 +144,101 @@ class KafkaEventStream(SnubaProtocolEventStream):
             **kwargs,
         )
 
-    def _send(
+    def insert_many(self, inserts, asynchronous=True):
+        messages = [self._get_insert_message(**insert) for insert in inserts]
+        topics = [
+            self._get_topic(message["project_id"], message["is_transaction_event"])
+            for message in messages
+        ]
+        producers = {topic: self.get_producer(topic) for topic in set(topics)}
+
+        # See `_send`. A single poll is enough to serve the callbacks of
+        # earlier produce() calls for the whole batch.
+        for producer in producers.values():
+            producer.poll(0.0)
+
+        # Delivery callbacks fill in the errors of messages still in flight,
+        # which happens before returning only if `asynchronous` is not set.
+        errors = [None] * len(messages)
+
+        for i, (message, topic) in enumerate(zip(messages, topics)):
+
+            def on_delivery(error, kafka_message, i=i):
+                self.delivery_callback(error, kafka_message)
+                if error is not None:
+                    errors[i] = error
+
+            errors[i] = self._produce(
+                producers[topic],
+                topic,
+                message["project_id"],
+                message["_type"],
+                extra_data=message["extra_data"],
+                headers=message["headers"],
+                skip_semantic_partitioning=message["skip_semantic_partitioning"],
+                on_delivery=on_delivery,
+            )
+
+        if not asynchronous:
+            # A single delivery barrier for the whole batch.
+            for producer in producers.values():
+                producer.flush()
+
+        return errors
+
+    def _get_topic(self, project_id: int, is_transaction_event: bool) -> str:
+        if is_transaction_event:
+            return self.get_transactions_topic(project_id)
+        else:
+            return self.topic
+
+    def _produce(
         self,
+        producer: Producer,
+        topic: str,
         project_id: int,
         _type: str,
         extra_data: Tuple[Any, ...] = (),
-        asynchronous: bool = True,
         headers: Optional[MutableMapping[str, str]] = None,
         skip_semantic_partitioning: bool = False,
-        is_transaction_event: bool = False,
-    ) -> None:
+        on_delivery=None,
+    ) -> Optional[Exception]:
+        """
+        Produces a message without waiting for it to be delivered. Returns the
+        error if the message could not be handed to the producer.
+        """
         if headers is None:
             headers = {}
         headers["operation"] = _type
         headers["version"] = str(self.EVENT_PROTOCOL_VERSION)
 
-        if is_transaction_event:
-            topic = self.get_transactions_topic(project_id)
-        else:
-            topic = self.topic
+        assert isinstance(extra_data, tuple)
+
+        try:
+            producer.produce(
+                topic=topic,
+                key=str(project_id).encode("utf-8") if not skip_semantic_partitioning else None,
+                value=json.dumps((self.EVENT_PROTOCOL_VERSION, _type) + extra_data),
+                on_delivery=on_delivery or self.delivery_callback,
+                headers=[(k, v.encode("utf-8")) for k, v in headers.items()],
+            )
+        except Exception as error:
+            logger.error("Could not publish message: %s", error, exc_info=True)
+            return error
 
+        return None
+
+    def _send(
+        self,
+        project_id: int,
+        _type: str,
+        extra_data: Tuple[Any, ...] = (),
+        asynchronous: bool = True,
+        headers: Optional[MutableMapping[str, str]] = None,
+        skip_semantic_partitioning: bool = False,
+        is_transaction_event: bool = False,
+    ) -> None:
+        topic = self._get_topic(project_id, is_transaction_event)
         producer = self.get_producer(topic)
 
         # Polling the producer is required to ensure callbacks are fired. This
@@ -178,18 +253,16 @@ class KafkaEventStream(SnubaProtocolEventStream):
         # asynchronous produce() calls from the same process.
         producer.poll(0.0)
 
-        assert isinstance(extra_data, tuple)
-
-        try:
-            producer.produce(
-                topic=topic,
-                key=str(project_id).encode("utf-8") if not skip_semantic_partitioning else None,
-                value=json.dumps((self.EVENT_PROTOCOL_VERSION, _type) + extra_data),
-                on_delivery=self.delivery_callback,
-                headers=[(k, v.encode("utf-8")) for k, v in headers.items()],
-            )
-        except Exception as error:
-            logger.error("Could not publish message: %s", error, exc_info=True)
+        error = self._produce(
+            producer,
+            topic,
+            project_id,
+            _type,
+            extra_data=extra_data,
+            headers=headers,
+            skip_semantic_partitioning=skip_semantic_partitioning,
+        )
+        if error is not None:
             return
 
         if not asynchronous:
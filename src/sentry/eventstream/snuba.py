@@ -103,6 +103,33 @@ class SnubaProtocolEventStream(EventStream):
         skip_consume=False,
         **kwargs,
     ):
+        self._send(
+            **self._get_insert_message(
+                event,
+                is_new,
+                is_regression,
+                is_new_group_environment,
+                primary_hash,
+                received_timestamp,
+                skip_consume,
+                **kwargs,
+            )
+        )
+
+    def _get_insert_message(
+        self,
+        event,
+        is_new,
+        is_regression,
+        is_new_group_environment,
+        primary_hash,
+        received_timestamp,  # type: float
+        skip_consume=False,
+        **kwargs,
+    ) -> Mapping[str, Any]:
+        """
+        Builds the keyword arguments of :meth:`_send` for inserting an event.
+        """
         project = event.project
         set_current_event_project(project.id)
         retention_days = quotas.get_event_retention(organization=project.organization)
@@ -135,9 +162,9 @@ class SnubaProtocolEventStream(EventStream):
 
         is_transaction_event = self._is_transaction_event(event)
 
-        self._send(
-            project.id,
-            "insert",
+        return dict(
+            project_id=project.id,
+            _type="insert",
             extra_data=(
                 {
                     "group_id": event.group_id,
@@ -8,9 +8,11 @@ from parsimonious.grammar import Grammar, NodeVisitor
 
 from sentry import projectoptions
 from sentry.grouping.component import GroupingComponent
+from sentry.utils.lru import LRUCache
 from sentry.utils.strings import unescape_string
 
 from .actions import Action, FlagAction, VarAction
+from .compiled import CompiledRules
 from .exceptions import InvalidEnhancerConfig
 from .matchers import (
     CalleeMatch,
@@ -70,6 +72,11 @@ _        = space*
 VERSIONS = [1, 2]
 LATEST_VERSION = VERSIONS[-1]
 
+# Compiled modifier and updater rules by enhancements id or serialized config.
+# Project configs are deserialized for every event, the compiled rules are
+# shared between all instances with the same config.
+_compiled_rules_cache = LRUCache(maxsize=1000, metrics_key="grouping.enhancer.compiled_rules")
+
 
 class StacktraceState:
     def __init__(self):
@@ -116,6 +123,29 @@ class Enhancements:
         self._modifier_rules = [rule for rule in self.iter_rules() if rule.is_modifier]
         self._updater_rules = [rule for rule in self.iter_rules() if rule.is_updater]
 
+        # The serialized config, if known, see ``loads``.
+        self._cache_key = None
+        self._compiled = None
+
+    def _get_compiled_rules(self):
+        """Returns the compiled modifier and updater rules."""
+        if self._compiled is None:
+            if self.id is not None:
+                cache_key = ("id", self.id)
+            else:
+                cache_key = ("config", self._cache_key or self.dumps())
+
+            compiled = _compiled_rules_cache.get(cache_key)
+            if compiled is None:
+                compiled = (
+                    CompiledRules(self._modifier_rules, cache_key=(cache_key, "modifier")),
+                    CompiledRules(self._updater_rules, cache_key=(cache_key, "updater")),
+                )
+                _compiled_rules_cache.set(cache_key, compiled)
+            self._compiled = compiled
+
+        return self._compiled
+
     def apply_modifications_to_frame(self, frames, platform, exception_data):
         """This applies the frame modifications to the frames itself.  This
         does not affect grouping.
@@ -125,10 +155,11 @@ class Enhancements:
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
-        for rule in self._modifier_rules:
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
-            ):
+        modifier_rules, _ = self._get_compiled_rules()
+        for rule, matches in modifier_rules.iter_matching_frame_actions(
+            match_frames, platform, exception_data, cache
+        ):
+            for idx, action in matches:
                 action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
 
     def update_frame_components_contributions(self, components, frames, platform, exception_data):
@@ -139,11 +170,11 @@ class Enhancements:
 
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
-
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
-            ):
+        _, updater_rules = self._get_compiled_rules()
+        for rule, matches in updater_rules.iter_matching_frame_actions(
+            match_frames, platform, exception_data, cache
+        ):
+            for idx, action in matches:
                 action.update_frame_components_contributions(components, frames, idx, rule=rule)
                 action.modify_stacktrace_state(stacktrace_state, rule)
 
@@ -253,11 +284,13 @@ class Enhancements:
             data = data.encode("ascii", "ignore")
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
-            return cls._from_config_structure(
+            rv = cls._from_config_structure(
                 msgpack.loads(zlib.decompress(base64.urlsafe_b64decode(padded)), raw=False)
             )
         except (LookupError, AttributeError, TypeError, ValueError) as e:
             raise ValueError("invalid stack trace rule config: %s" % e)
+        rv._cache_key = data.rstrip(b"=").decode("ascii")
+        return rv
 
     @classmethod
     def from_config_string(self, s, bases=None, id=None):
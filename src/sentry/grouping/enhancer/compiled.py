@@ -0,0 +1,288 @@
+"""
+Compiled evaluation of enhancement rules.
+
+``Rule.get_matching_frame_actions`` evaluates the matchers of a single rule
+against every frame. With many rules the same patterns end up being matched
+against the same frames over and over again. ``CompiledRules`` instead
+collects the distinct matchers of all rules, evaluates each of them once per
+frame into a bitmask and then matches every rule against those bitmasks.
+
+Actions of modifier rules change the ``in_app`` and ``category`` fields of the
+match frames while rules are being applied, so the bits of matchers on these
+fields are computed separately and kept up to date between rules.
+
+Most events of a project share the same library frames, so the bitmasks of
+the remaining fields are additionally memoized across events.
+"""
+
+import re
+
+from sentry.utils.functional import cached
+from sentry.utils.glob import glob_match
+from sentry.utils.lru import LRUCache
+
+from .matchers import (
+    CalleeMatch,
+    CallerMatch,
+    CategoryMatch,
+    ExceptionFieldMatch,
+    FamilyMatch,
+    FunctionMatch,
+    InAppMatch,
+    ModuleMatch,
+    PathLikeMatch,
+    path_like_match,
+)
+
+# Patterns without any of these characters can only match the exact value.
+_glob_chars_re = re.compile(rb"[*?\[\]{}\\]")
+
+# Bitmasks of the frame fields that are not changed by modifier actions, by
+# compiled rules cache key and field values.
+_frame_masks_cache = LRUCache(maxsize=50000, metrics_key="grouping.enhancer.frame_masks")
+
+
+class _FieldMatchers:
+    """The glob matchers of a single match frame field."""
+
+    def __init__(self, field):
+        self.field = field
+        self.exact = {}
+        self.globs = []
+
+    def add(self, pattern, bit):
+        if _glob_chars_re.search(pattern) is None:
+            self.exact[pattern] = self.exact.get(pattern, 0) | bit
+        else:
+            self.globs.append((pattern, bit))
+
+    def __bool__(self):
+        return bool(self.exact or self.globs)
+
+    def get_mask(self, match_frame, cache):
+        value = match_frame[self.field]
+        if value is None:
+            return 0
+
+        mask = self.exact.get(value, 0)
+        for pattern, bit in self.globs:
+            if cached(cache, glob_match, value, pattern):
+                mask |= bit
+        return mask
+
+
+class _PathMatchers:
+    """The path-like matchers of a single match frame field."""
+
+    def __init__(self, field):
+        self.field = field
+        self.patterns = []
+
+    def add(self, pattern, bit):
+        self.patterns.append((pattern, bit))
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def get_mask(self, match_frame, cache):
+        value = match_frame[self.field]
+        if value is None:
+            return 0
+
+        mask = 0
+        for pattern, bit in self.patterns:
+            if cached(cache, path_like_match, pattern, value):
+                mask |= bit
+        return mask
+
+
+class CompiledRules:
+    """Evaluates a list of rules against a list of match frames.
+
+    If ``cache_key`` is given, it must uniquely identify ``rules``. Frame
+    bitmasks are then memoized across calls and instances.
+    """
+
+    def __init__(self, rules, cache_key=None):
+        self.cache_key = cache_key
+        self._bits = {}
+
+        self._family_all = 0
+        self._family_bits = {}
+        self._in_app_bits = {}
+        self._static_matchers = {
+            "function": _FieldMatchers("function"),
+            "module": _FieldMatchers("module"),
+            "path": _PathMatchers("path"),
+            "package": _PathMatchers("package"),
+        }
+        self._category_matchers = _FieldMatchers("category")
+        self._exception_matchers = []
+        # Bits of matchers whose result can change while modifier actions are
+        # being applied.
+        self._dynamic_bits = 0
+
+        self._rules = []
+        for rule in rules:
+            if rule.matchers:
+                self._rules.append(self._compile_rule(rule))
+
+        self._static_matchers = [x for x in self._static_matchers.values() if x]
+
+    def _compile_rule(self, rule):
+        event_pos = event_neg = 0
+        conditions = {0: [0, 0]}
+
+        for matcher in rule.matchers:
+            offset = 0
+            if isinstance(matcher, CallerMatch):
+                offset, matcher = -1, matcher.caller
+            elif isinstance(matcher, CalleeMatch):
+                offset, matcher = 1, matcher.caller
+
+            condition = conditions.setdefault(offset, [0, 0])
+            bit = self._get_bit(matcher)
+            if isinstance(matcher, ExceptionFieldMatch):
+                # Exception matchers do not depend on the frame, only the
+                # offset has to exist.
+                if matcher.negated:
+                    event_neg |= bit
+                else:
+                    event_pos |= bit
+            elif matcher.negated:
+                condition[1] |= bit
+            else:
+                condition[0] |= bit
+
+        conditions = tuple(
+            (offset, pos, neg)
+            for offset, (pos, neg) in sorted(conditions.items())
+            if offset != 0 or pos or neg
+        )
+        uses_dynamic = any((pos | neg) & self._dynamic_bits for _, pos, neg in conditions)
+        return rule, event_pos, event_neg, conditions, uses_dynamic
+
+    def _get_bit(self, matcher):
+        key = (type(matcher), matcher.pattern)
+        bit = self._bits.get(key)
+        if bit is not None:
+            return bit
+
+        bit = self._bits[key] = 1 << len(self._bits)
+        if isinstance(matcher, FamilyMatch):
+            if b"all" in matcher._flags:
+                self._family_all |= bit
+            for family in matcher._flags:
+                self._family_bits[family] = self._family_bits.get(family, 0) | bit
+        elif isinstance(matcher, InAppMatch):
+            if matcher._ref_val is not None:
+                self._in_app_bits[matcher._ref_val] = bit | self._in_app_bits.get(
+                    matcher._ref_val, 0
+                )
+            self._dynamic_bits |= bit
+        elif isinstance(matcher, CategoryMatch):
+            self._category_matchers.add(matcher._encoded_pattern, bit)
+            self._dynamic_bits |= bit
+        elif isinstance(matcher, FunctionMatch):
+            self._static_matchers["function"].add(matcher._encoded_pattern, bit)
+        elif isinstance(matcher, (ModuleMatch, PathLikeMatch)):
+            self._static_matchers[matcher.field].add(matcher._encoded_pattern, bit)
+        elif isinstance(matcher, ExceptionFieldMatch):
+            self._exception_matchers.append((matcher, bit))
+        else:
+            raise TypeError(f"Cannot compile matcher {matcher!r}")
+
+        return bit
+
+    def _get_static_mask(self, match_frame, cache):
+        mask = self._family_all | self._family_bits.get(match_frame["family"], 0)
+        for matchers in self._static_matchers:
+            mask |= matchers.get_mask(match_frame, cache)
+        return mask
+
+    def _get_static_masks(self, match_frames, cache):
+        if self.cache_key is None:
+            return [self._get_static_mask(frame, cache) for frame in match_frames]
+
+        keys = [
+            (
+                self.cache_key,
+                frame["family"],
+                frame["function"],
+                frame["module"],
+                frame["path"],
+                frame["package"],
+            )
+            for frame in match_frames
+        ]
+        memoized = _frame_masks_cache.get_many(keys)
+
+        rv = []
+        missing = {}
+        for key, frame in zip(keys, match_frames):
+            mask = memoized.get(key)
+            if mask is None:
+                mask = memoized[key] = missing[key] = self._get_static_mask(frame, cache)
+            rv.append(mask)
+
+        if missing:
+            _frame_masks_cache.set_many(missing)
+        return rv
+
+    def _get_dynamic_mask(self, match_frame, cache):
+        key = (self, match_frame["in_app"], match_frame["category"])
+        mask = cache.get(key)
+        if mask is None:
+            mask = self._in_app_bits.get(match_frame["in_app"], 0)
+            mask |= self._category_matchers.get_mask(match_frame, cache)
+            cache[key] = mask
+        return mask
+
+    def _get_event_mask(self, platform, exception_data, cache):
+        mask = 0
+        for matcher, bit in self._exception_matchers:
+            if matcher._positive_frame_match(None, platform, exception_data, cache):
+                mask |= bit
+        return mask
+
+    def iter_matching_frame_actions(self, match_frames, platform, exception_data, cache):
+        """Yields every rule together with its list of matching ``(idx, action)``
+        pairs, in the same order as ``Rule.get_matching_frame_actions``.
+
+        The matches of a rule are computed when it is yielded, so modifications
+        to the match frames made by earlier rules are taken into account.
+        """
+        if not self._rules:
+            return
+
+        event_mask = self._get_event_mask(platform, exception_data, cache)
+        static_masks = self._get_static_masks(match_frames, cache)
+        count = len(static_masks)
+
+        for rule, event_pos, event_neg, conditions, uses_dynamic in self._rules:
+            if event_mask & event_pos != event_pos or event_mask & event_neg:
+                continue
+
+            if uses_dynamic:
+                masks = [
+                    mask | self._get_dynamic_mask(frame, cache)
+                    for mask, frame in zip(static_masks, match_frames)
+                ]
+            else:
+                masks = static_masks
+
+            rv = []
+            for idx in range(count):
+                for offset, pos, neg in conditions:
+                    other = idx + offset
+                    if not 0 <= other < count:
+                        break
+                    mask = masks[other]
+                    if mask & pos != pos or mask & neg:
+                        break
+                else:
+                    for action in rule.actions:
+                        rv.append((idx, action))
+
+            if rv:
+                yield rule, rv
@@ -6,12 +6,14 @@ from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from typing import (
     Any,
     Callable,
+    Iterable,
     Mapping,
     MutableMapping,
     MutableSequence,
     NamedTuple,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TypeVar,
     Union,
@@ -76,83 +78,110 @@ class IngestConsumerWorker(AbstractBatchWorker):
             return self._flush_batch(batch)
 
     def _flush_batch(self, batch: Sequence[Message]):
-        attachment_chunks = []
-
-        # Processing functions may be either synchronous or asynchronous.
-        # Functions that return an ``AsyncResult`` may perform a combination of
-        # synchronous and asynchronous work, and need to be explicitly waited on
-        # to ensure they have completed and callbacks have been invoked before
-        # returning. Functions that return anything else are assumed to have
-        # completed successfully after they have returned.
-        other_messages: MutableSequence[
-            Tuple[
-                Callable[
-                    [Message, Mapping[int, Project]],
-                    Union[Any, AsyncResult],
-                ],
-                Message,
-            ]
-        ] = []
-
-        projects_to_fetch = set()
-
-        with metrics.timer("ingest_consumer.prepare_messages"):
-            for message in batch:
-                message_type = message["type"]
-                projects_to_fetch.add(message["project_id"])
-
-                if message_type == "event":
-                    other_messages.append((self.__process_event, message))
-                elif message_type == "attachment_chunk":
-                    attachment_chunks.append(message)
-                elif message_type == "attachment":
-                    other_messages.append((process_individual_attachment, message))
-                elif message_type == "user_report":
-                    other_messages.append((process_userreport, message))
-                else:
-                    raise ValueError(f"Unknown message type: {message_type}")
-                metrics.incr(
-                    "ingest_consumer.flush.messages_seen", tags={"message_type": message_type}
-                )
-
-        with metrics.timer("ingest_consumer.fetch_projects"):
-            projects = {p.id: p for p in Project.objects.get_many_from_cache(projects_to_fetch)}
-
-        if attachment_chunks:
-            # attachment_chunk messages need to be processed before attachment/event messages.
-            with metrics.timer("ingest_consumer.process_attachment_chunk_batch"):
-                for attachment_chunk in attachment_chunks:
-                    process_attachment_chunk(attachment_chunk, projects=projects)
-
-        if other_messages:
-            with metrics.timer("ingest_consumer.process_other_messages_batch"):
-                other_messages_flush_start = time.monotonic()
-
-                # Keep a mapping of futures to their metadata so that we can
-                # easily associate a future with its callback once completed.
-                results: MutableMapping["Future[Any]", "AsyncResult[Any]"] = {}
-
-                # Execute synchronous tasks and dispatch asynchronous tasks.
-                for processing_func, message in other_messages:
-                    result = processing_func(message, projects)
-                    if isinstance(result, AsyncResult):
-                        results[result.future] = result
-
-                # Wait for any asynchronous work to be completed, invoking
-                # callbacks (on the main thread) as results are ready.
-                for future in as_completed(results.keys()):
-                    results[future].callback(future)
-
-                metrics.timing(
-                    "ingest_consumer.process_other_messages_batch.normalized",
-                    (time.monotonic() - other_messages_flush_start) / len(other_messages),
-                )
+        attachment_chunks, other_messages, projects_to_fetch = prepare_messages(
+            batch, self.__process_event
+        )
+        projects = fetch_projects(projects_to_fetch)
+        process_attachment_chunks(attachment_chunks, projects)
+        process_other_messages(other_messages, projects)
 
     def shutdown(self):
         if self.__process_event_executor is not None:
             self.__process_event_executor.shutdown()
 
 
+ProcessingFunction = Callable[[Message, Mapping[int, Project]], Union[Any, AsyncResult]]
+
+
+def prepare_messages(
+    batch: Sequence[Message], process_event_func: ProcessingFunction
+) -> Tuple[MutableSequence[Message], MutableSequence[Tuple[ProcessingFunction, Message]], Set[int]]:
+    """
+    Split a batch of decoded messages into attachment chunks, which need to be
+    processed before anything else, and all other messages paired with the
+    function that processes them. Also returns the IDs of all projects
+    referenced by the batch.
+    """
+    attachment_chunks: MutableSequence[Message] = []
+
+    # Processing functions may be either synchronous or asynchronous.
+    # Functions that return an ``AsyncResult`` may perform a combination of
+    # synchronous and asynchronous work, and need to be explicitly waited on
+    # to ensure they have completed and callbacks have been invoked before
+    # returning. Functions that return anything else are assumed to have
+    # completed successfully after they have returned.
+    other_messages: MutableSequence[Tuple[ProcessingFunction, Message]] = []
+
+    projects_to_fetch = set()
+
+    with metrics.timer("ingest_consumer.prepare_messages"):
+        for message in batch:
+            message_type = message["type"]
+            projects_to_fetch.add(message["project_id"])
+
+            if message_type == "event":
+                other_messages.append((process_event_func, message))
+            elif message_type == "attachment_chunk":
+                attachment_chunks.append(message)
+            elif message_type == "attachment":
+                other_messages.append((process_individual_attachment, message))
+            elif message_type == "user_report":
+                other_messages.append((process_userreport, message))
+            else:
+                raise ValueError(f"Unknown message type: {message_type}")
+            metrics.incr("ingest_consumer.flush.messages_seen", tags={"message_type": message_type})
+
+    return attachment_chunks, other_messages, projects_to_fetch
+
+
+def fetch_projects(project_ids: Iterable[int]) -> Mapping[int, Project]:
+    with metrics.timer("ingest_consumer.fetch_projects"):
+        return {p.id: p for p in Project.objects.get_many_from_cache(project_ids)}
+
+
+def process_attachment_chunks(
+    attachment_chunks: Sequence[Message], projects: Mapping[int, Project]
+) -> None:
+    if not attachment_chunks:
+        return
+
+    # attachment_chunk messages need to be processed before attachment/event messages.
+    with metrics.timer("ingest_consumer.process_attachment_chunk_batch"):
+        for attachment_chunk in attachment_chunks:
+            process_attachment_chunk(attachment_chunk, projects=projects)
+
+
+def process_other_messages(
+    other_messages: Sequence[Tuple[ProcessingFunction, Message]],
+    projects: Mapping[int, Project],
+) -> None:
+    if not other_messages:
+        return
+
+    with metrics.timer("ingest_consumer.process_other_messages_batch"):
+        other_messages_flush_start = time.monotonic()
+
+        # Keep a mapping of futures to their metadata so that we can
+        # easily associate a future with its callback once completed.
+        results: MutableMapping["Future[Any]", "AsyncResult[Any]"] = {}
+
+        # Execute synchronous tasks and dispatch asynchronous tasks.
+        for processing_func, message in other_messages:
+            result = processing_func(message, projects)
+            if isinstance(result, AsyncResult):
+                results[result.future] = result
+
+        # Wait for any asynchronous work to be completed, invoking
+        # callbacks (on the calling thread) as results are ready.
+        for future in as_completed(results.keys()):
+            results[future].callback(future)
+
+        metrics.timing(
+            "ingest_consumer.process_other_messages_batch.normalized",
+            (time.monotonic() - other_messages_flush_start) / len(other_messages),
+        )
+
+
 def trace_func(**span_kwargs):
     def wrapper(f):
         @functools.wraps(f)
@@ -0,0 +1,379 @@
+"""
+Arroyo based ingest consumer.
+
+Unlike the legacy ``IngestConsumerWorker``, which decodes, resolves projects,
+stores attachment chunks and processes events for a whole batch strictly in
+sequence, this consumer splits the work for every batch into separate stages:
+
+1. decode: unpack the msgpack payloads and sort messages by type
+2. resolve: fetch the projects referenced by the batch
+3. chunks: write attachment chunks to the attachment cache
+4. events: process events, attachments and user reports
+
+Batches are built per partition. Every stage of every batch runs on a shared
+thread pool, so batches from different partitions are processed concurrently
+and a slow batch of minidump chunks only stalls its own partition. Within a
+partition the stages form a pipeline: a stage of batch N+1 may run while batch
+N is still in a later stage, but a stage never overtakes the same stage of the
+previous batch. This keeps the guarantee that attachment chunks are stored
+before the events referencing them, and offsets are committed in order once the
+last stage of a batch has completed.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    List,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import msgpack
+from arroyo import Topic
+from arroyo.backends.kafka.consumer import KafkaConsumer, KafkaPayload
+from arroyo.processing.processor import StreamProcessor
+from arroyo.processing.strategies import MessageRejected
+from arroyo.processing.strategies.abstract import ProcessingStrategy, ProcessingStrategyFactory
+from arroyo.types import Message, Partition, Position
+from django.conf import settings
+
+from sentry.ingest.ingest_consumer import (
+    ProcessingFunction,
+    fetch_projects,
+    prepare_messages,
+    process_attachment_chunks,
+    process_event,
+    process_event_async,
+    process_other_messages,
+)
+from sentry.ingest.types import ConsumerType
+from sentry.models import Project
+from sentry.utils import kafka_config, metrics
+from sentry.utils.batching_kafka_consumer import create_topics
+from sentry.utils.sdk import mark_scope_as_unsafe
+
+logger = logging.getLogger(__name__)
+
+# Number of batches per partition that may be in flight at the same time. Once
+# a partition reaches this limit, new messages for it are rejected until the
+# oldest batch has completed.
+DEFAULT_MAX_PENDING_BATCHES = 4
+
+STAGES = ("decode", "resolve", "chunks", "events")
+
+
+class DecodedBatch:
+    """
+    The intermediate result of a batch that is passed from one stage to the
+    next. Every stage fills in the fields the following stages depend on.
+    """
+
+    def __init__(self, payloads: Sequence[bytes]) -> None:
+        self.payloads = payloads
+        self.attachment_chunks: Sequence[Any] = ()
+        self.other_messages: Sequence[Tuple[ProcessingFunction, Any]] = ()
+        self.project_ids: Set[int] = set()
+        self.projects: Mapping[int, Project] = {}
+
+
+class PendingBatch:
+    """
+    A batch of messages from a single partition that has been handed to the
+    stage pipeline. ``stages`` holds one future per stage, in order.
+    """
+
+    def __init__(self, last_message: Message[KafkaPayload], size: int) -> None:
+        self.last_message = last_message
+        self.size = size
+        self.stages: List[Future[DecodedBatch]] = []
+
+    def done(self) -> bool:
+        return self.stages[-1].done()
+
+    def result(self) -> DecodedBatch:
+        return self.stages[-1].result()
+
+
+class PartitionBatchBuilder:
+    def __init__(self, max_batch_size: int, max_batch_time: float) -> None:
+        self.__max_batch_size = max_batch_size
+        self.__deadline = time.time() + max_batch_time
+        self.__offsets: Set[int] = set()
+        self.payloads: MutableSequence[bytes] = []
+        self.last_message: Optional[Message[KafkaPayload]] = None
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def append(self, message: Message[KafkaPayload]) -> None:
+        # The stream processor resubmits the same message after a
+        # ``MessageRejected``, make sure it is only added once.
+        if message.offset in self.__offsets:
+            return
+        self.__offsets.add(message.offset)
+        self.payloads.append(message.payload.value)
+        self.last_message = message
+
+    def ready(self) -> bool:
+        return len(self.payloads) >= self.__max_batch_size or time.time() >= self.__deadline
+
+
+def _run_stage(
+    stage: str,
+    func: Callable[[DecodedBatch], None],
+    dependencies: Sequence[Future[DecodedBatch]],
+    batch: DecodedBatch,
+) -> DecodedBatch:
+    # Dependencies are always submitted to the (FIFO) executor before the stage
+    # depending on them, so they are either running or done by the time this
+    # stage starts. Waiting on them can therefore never deadlock the pool.
+    for dependency in dependencies:
+        # Propagate failures of previous stages and batches.
+        dependency.result()
+
+    mark_scope_as_unsafe()
+    with metrics.timer("ingest_consumer.pipeline.stage", tags={"stage": stage}):
+        func(batch)
+    return batch
+
+
+class PipelinedIngestStrategy(ProcessingStrategy[KafkaPayload]):
+    def __init__(
+        self,
+        commit: Callable[[Mapping[Partition, Position]], None],
+        stage_executor: ThreadPoolExecutor,
+        process_event_func: ProcessingFunction,
+        max_batch_size: int,
+        max_batch_time: float,
+        max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+    ) -> None:
+        self.__commit = commit
+        self.__executor = stage_executor
+        self.__process_event = process_event_func
+        self.__max_batch_size = max_batch_size
+        self.__max_batch_time = max_batch_time
+        self.__max_pending_batches = max_pending_batches
+
+        self.__builders: MutableMapping[Partition, PartitionBatchBuilder] = {}
+        self.__pending: MutableMapping[Partition, Deque[PendingBatch]] = {}
+        self.__closed = False
+
+    def __decode(self, batch: DecodedBatch) -> None:
+        messages = [msgpack.unpackb(payload, use_list=False) for payload in batch.payloads]
+        batch.attachment_chunks, batch.other_messages, batch.project_ids = prepare_messages(
+            messages, self.__process_event
+        )
+
+    def __resolve(self, batch: DecodedBatch) -> None:
+        batch.projects = fetch_projects(batch.project_ids)
+
+    def __store_chunks(self, batch: DecodedBatch) -> None:
+        process_attachment_chunks(batch.attachment_chunks, batch.projects)
+
+    def __process_other(self, batch: DecodedBatch) -> None:
+        process_other_messages(batch.other_messages, batch.projects)
+
+    def __dispatch(self, partition: Partition, builder: PartitionBatchBuilder) -> None:
+        assert builder.last_message is not None
+
+        pending = self.__pending.setdefault(partition, deque())
+        previous = pending[-1] if pending else None
+
+        batch = DecodedBatch(builder.payloads)
+        pending_batch = PendingBatch(builder.last_message, len(builder))
+
+        funcs = (self.__decode, self.__resolve, self.__store_chunks, self.__process_other)
+        for index, (stage, func) in enumerate(zip(STAGES, funcs)):
+            dependencies = []
+            if index > 0:
+                dependencies.append(pending_batch.stages[index - 1])
+            if previous is not None:
+                dependencies.append(previous.stages[index])
+            pending_batch.stages.append(
+                self.__executor.submit(_run_stage, stage, func, dependencies, batch)
+            )
+
+        pending.append(pending_batch)
+        metrics.timing("ingest_consumer.pipeline.batch_size", len(builder))
+
+    def __flush_ready(self, force: bool = False) -> None:
+        for partition, builder in list(self.__builders.items()):
+            if not (force or builder.ready()):
+                continue
+            if len(self.__pending.get(partition, ())) >= self.__max_pending_batches:
+                continue
+            del self.__builders[partition]
+            self.__dispatch(partition, builder)
+
+    def __commit_done(self) -> None:
+        positions: MutableMapping[Partition, Position] = {}
+
+        for partition, pending in self.__pending.items():
+            while pending and pending[0].done():
+                pending_batch = pending.popleft()
+                # Raise any exception from the pipeline, crashing the consumer
+                # just like the legacy consumer does when a flush fails.
+                pending_batch.result()
+                message = pending_batch.last_message
+                positions[partition] = Position(message.next_offset, message.timestamp)
+
+        if positions:
+            self.__commit(positions)
+
+    def poll(self) -> None:
+        self.__commit_done()
+        self.__flush_ready()
+
+    def submit(self, message: Message[KafkaPayload]) -> None:
+        assert not self.__closed
+
+        builder = self.__builders.get(message.partition)
+        if builder is None:
+            builder = self.__builders[message.partition] = PartitionBatchBuilder(
+                self.__max_batch_size, self.__max_batch_time
+            )
+
+        if len(builder) >= self.__max_batch_size:
+            # The batch for this partition is full but cannot be dispatched
+            # because too many of its batches are still in flight.
+            self.__flush_ready()
+            if message.partition in self.__builders:
+                raise MessageRejected
+            builder = self.__builders[message.partition] = PartitionBatchBuilder(
+                self.__max_batch_size, self.__max_batch_time
+            )
+
+        builder.append(message)
+        if builder.ready():
+            self.__flush_ready()
+
+    def close(self) -> None:
+        self.__closed = True
+
+    def terminate(self) -> None:
+        self.__closed = True
+        self.__builders.clear()
+        self.__pending.clear()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while self.__builders or any(self.__pending.values()):
+            self.__flush_ready(force=True)
+            futures = [
+                pending_batch.stages[-1]
+                for pending in self.__pending.values()
+                for pending_batch in pending
+            ]
+            remaining = max(deadline - time.time(), 0) if deadline is not None else None
+            wait(futures, timeout=remaining)
+            self.__commit_done()
+            if deadline is not None and time.time() >= deadline:
+                break
+
+
+class PipelinedIngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    """
+    Builds the pipelined ingest consumer strategy. The thread pools are owned by
+    the factory so that they survive rebalances.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_batch_time: float,
+        stage_concurrency: int,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+    ) -> None:
+        self.__max_batch_size = max_batch_size
+        # This is in seconds
+        self.__max_batch_time = max_batch_time / 1000
+        self.__max_pending_batches = max_pending_batches
+        self.__stage_executor = ThreadPoolExecutor(stage_concurrency)
+
+        if executor is None:
+            self.__process_event: ProcessingFunction = process_event
+        else:
+            self.__process_event = functools.partial(process_event_async, executor)
+
+    def create_with_partitions(
+        self,
+        commit: Callable[[Mapping[Partition, Position]], None],
+        partitions: Mapping[Partition, int],
+    ) -> ProcessingStrategy[KafkaPayload]:
+        return PipelinedIngestStrategy(
+            commit,
+            self.__stage_executor,
+            self.__process_event,
+            max_batch_size=self.__max_batch_size,
+            max_batch_time=self.__max_batch_time,
+            max_pending_batches=self.__max_pending_batches,
+        )
+
+
+def get_config(
+    topic: str, group_id: str, auto_offset_reset: str, force_cluster: Optional[str]
+) -> MutableMapping[Any, Any]:
+    cluster_name: str = force_cluster or settings.KAFKA_TOPICS[topic]["cluster"]
+    create_topics(cluster_name, [topic])
+    consumer_config: MutableMapping[Any, Any] = kafka_config.get_kafka_consumer_cluster_options(
+        cluster_name,
+        override_params={
+            "auto.offset.reset": auto_offset_reset,
+            "enable.auto.commit": False,
+            "enable.auto.offset.store": False,
+            "group.id": group_id,
+        },
+    )
+    return consumer_config
+
+
+def get_pipelined_ingest_consumer(
+    consumer_types: Sequence[str],
+    group_id: str,
+    auto_offset_reset: str,
+    max_batch_size: int,
+    max_batch_time: int,
+    stage_concurrency: int,
+    executor: Optional[ThreadPoolExecutor] = None,
+    force_topic: Optional[str] = None,
+    force_cluster: Optional[str] = None,
+    **options: Any,
+) -> StreamProcessor[KafkaPayload]:
+    """
+    Handles events coming via a kafka queue, processing batches of different
+    partitions concurrently.
+
+    Arroyo consumers subscribe to a single topic, so exactly one consumer type
+    has to be given.
+    """
+    if len(consumer_types) != 1:
+        raise ValueError("The pipelined ingest consumer supports exactly one consumer type")
+
+    (consumer_type,) = consumer_types
+    topic = force_topic or ConsumerType.get_topic_name(consumer_type)
+
+    return StreamProcessor(
+        consumer=KafkaConsumer(get_config(topic, group_id, auto_offset_reset, force_cluster)),
+        topic=Topic(topic),
+        processor_factory=PipelinedIngestStrategyFactory(
+            max_batch_size=max_batch_size,
+            max_batch_time=max_batch_time,
+            stage_concurrency=stage_concurrency,
+            executor=executor,
+        ),
+    )
@@ -1,8 +1,14 @@
+import hashlib
+
+from django.conf import settings
 from symbolic import SourceView
 
+from sentry.utils.lru import LRUCache
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "get_or_parse_view"]
+
+_parsed_view_cache = None
 
 
 def is_utf8(codec):
@@ -10,6 +16,60 @@ def is_utf8(codec):
     return name in ("utf-8", "ascii")
 
 
+def make_source_view(source, encoding=None):
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    # If an encoding is provided and it's not utf-8 compatible
+    # we try to re-encoding the source and create a source view
+    # from it.
+    elif encoding is not None and not is_utf8(encoding):
+        try:
+            source = source.decode(encoding).encode("utf-8")
+        except UnicodeError:
+            pass
+    return SourceView.from_bytes(source)
+
+
+def _get_parsed_view_cache():
+    global _parsed_view_cache
+    size = settings.SENTRY_JS_PARSED_VIEW_CACHE_SIZE
+    if not size:
+        return None
+    if _parsed_view_cache is None or _parsed_view_cache.maxsize != size:
+        _parsed_view_cache = LRUCache(
+            size, metrics_key="sourcemaps.parsed_view_cache", weigher=lambda item: item[1]
+        )
+    return _parsed_view_cache
+
+
+def get_or_parse_view(kind, parse, body, url, release=None, dist=None):
+    """
+    Returns ``parse(body)``, reusing the result of earlier events processed by
+    this process for the same kind of view, release, dist, url and content.
+
+    Parsed views are immutable and can be shared. The cache is bounded by
+    ``SENTRY_JS_PARSED_VIEW_CACHE_SIZE``, weighing every view by the size of
+    the file it was parsed from, which is less than the memory taken up by
+    the parsed view.
+    """
+    cache = _get_parsed_view_cache()
+    if cache is None:
+        return parse(body)
+
+    key = (
+        kind,
+        release and release.id,
+        dist and dist.id,
+        url,
+        hashlib.sha1(body).digest(),
+    )
+    item = cache.get(key)
+    if item is None:
+        item = (parse(body), len(body))
+        cache.set(key, item)
+    return item[0]
+
+
 class SourceCache:
     def __init__(self):
         self._cache = {}
@@ -40,17 +100,7 @@ class SourceCache:
         url = self._get_canonical_url(url)
 
         if not isinstance(source, SourceView):
-            if isinstance(source, str):
-                source = source.encode("utf-8")
-            # If an encoding is provided and it's not utf-8 compatible
-            # we try to re-encoding the source and create a source view
-            # from it.
-            elif encoding is not None and not is_utf8(encoding):
-                try:
-                    source = source.decode(encoding).encode("utf-8")
-                except UnicodeError:
-                    pass
-            source = SourceView.from_bytes(source)
+            source = make_source_view(source, encoding)
         self._cache[url] = source
 
     def add_error(self, url, error):
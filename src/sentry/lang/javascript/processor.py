@@ -36,7 +36,7 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import SourceCache, SourceMapCache, get_or_parse_view, make_source_view
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -459,6 +459,8 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
     # it later
 
     cache_key = get_release_file_cache_key(release_id=release.id, releasefile_ident=archive_ident)
+    mapped_cache_key = f"{cache_key}:mapped"
+    mmap_archives = options.get("releasefile.mmap-archives")
 
     result = cache.get(cache_key)
 
@@ -467,6 +469,15 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
     elif result:
         return BytesIO(result)
     else:
+        if mmap_archives:
+            # Mapped archives are not in the cache, only their location is
+            location = cache.get(mapped_cache_key)
+            if location:
+                organization_id, file_id = location
+                file_ = ReleaseFile.cache.getfile_mapped_by_id(organization_id, file_id)
+                if file_ is not None:
+                    return file_
+
         try:
             with sentry_sdk.start_span(op="fetch_release_archive_for_url.get_releasefile_db_entry"):
                 qs = ReleaseFile.objects.filter(
@@ -482,7 +493,11 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
         else:
             try:
                 with sentry_sdk.start_span(op="fetch_release_archive_for_url.fetch_releasefile"):
-                    if releasefile.file.size <= options.get("releasefile.cache-max-archive-size"):
+                    if mmap_archives:
+                        # Archives are kept on local disk and only the pages
+                        # of the requested files are ever read.
+                        getfile = lambda: ReleaseFile.cache.getfile_mapped(releasefile)
+                    elif releasefile.file.size <= options.get("releasefile.cache-max-archive-size"):
                         getfile = lambda: ReleaseFile.cache.getfile(releasefile)
                     else:
                         # For very large ZIP archives, pulling the entire file into cache takes too long.
@@ -496,6 +511,12 @@ def fetch_release_archive_for_url(release, dist, url) -> Optional[IO]:
 
                 return None
 
+            if mmap_archives:
+                cache.set(
+                    mapped_cache_key, [releasefile.organization_id, releasefile.file.id], 3600
+                )
+                return file_
+
             # `cache.set` will only keep values up to a certain size,
             # so we should not read the entire file if it's too large for caching
             if CACHE_MAX_VALUE_SIZE is not None and file_.size > CACHE_MAX_VALUE_SIZE:
@@ -748,6 +769,8 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
             )
         except TypeError as e:
             raise UnparseableSourcemap({"url": "<base64>", "reason": str(e)})
+        # Inline sourcemaps are identified by their content alone
+        cache_url = "<base64>"
     else:
         # look in the database and, if not found, optionally try to scrape the web
         with sentry_sdk.start_span(
@@ -762,11 +785,19 @@ def fetch_sourcemap(url, project=None, release=None, dist=None, allow_scraping=T
                 allow_scraping=allow_scraping,
             )
         body = result.body
+        cache_url = url
     try:
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.fetch_sourcemap.SourceMapView.from_json_bytes"
         ):
-            return SourceMapView.from_json_bytes(body)
+            return get_or_parse_view(
+                "sourcemap",
+                SourceMapView.from_json_bytes,
+                body,
+                cache_url,
+                release=release,
+                dist=dist,
+            )
     except Exception as exc:
         # This is in debug because the product shows an error already.
         logger.debug(str(exc), exc_info=True)
@@ -1180,7 +1211,15 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # either way, there's no more for us to do here, since we don't have
             # a valid file to cache
             return
-        cache.add(filename, result.body, result.encoding)
+        source_view = get_or_parse_view(
+            ("source", result.encoding),
+            lambda body: make_source_view(body, result.encoding),
+            result.body,
+            filename,
+            release=self.release,
+            dist=self.dist,
+        )
+        cache.add(filename, source_view)
         cache.alias(result.url, filename)
 
         sourcemap_url = discover_sourcemap(result)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Sequence
 
 from django.db import models, transaction
 
@@ -71,6 +71,11 @@ class ProjectOptionManager(OptionManager["Project"]):
         values: Mapping[str, Value] = self._option_cache.get(cache_key, {})
         return values
 
+    def get_all_values_many(self, project_ids: Iterable[int]) -> Mapping[int, Mapping[str, Value]]:
+        """Like ``get_all_values`` for many projects, with a single cache lookup and
+        database query."""
+        return self._get_all_values_many(project_ids, "project")
+
     def reload_cache(self, project_id: int, update_reason: str) -> Mapping[str, Value]:
         if update_reason != "projectoption.get_all_values":
             # this hook may be called from model hooks during an
@@ -1,5 +1,7 @@
 import errno
+import io
 import logging
+import mmap
 import os
 import zipfile
 from contextlib import contextmanager
@@ -142,21 +144,60 @@ class ReleaseFile(Model):
         return urls
 
 
+class MappedFile(io.RawIOBase):
+    """Read-only file object backed by a memory map of a local file.
+
+    Reads are served from the page cache, so the file is shared between
+    processes and never copied into process memory as a whole.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.name = path
+        self.size = len(self._mmap)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._mmap.seek(offset, whence)
+        return self._mmap.tell()
+
+    def tell(self) -> int:
+        return self._mmap.tell()
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        return self._mmap.read(size)
+
+    def readinto(self, b) -> int:
+        data = self._mmap.read(len(b))
+        b[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._mmap.close()
+        super().close()
+
+
 class ReleaseFileCache:
     @property
     def cache_path(self):
         return options.get("releasefile.cache-path")
 
-    def getfile(self, releasefile):
-        cutoff = options.get("releasefile.cache-limit")
-        file_size = releasefile.file.size
-        if file_size < cutoff:
-            metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": True})
-            return releasefile.file.getfile()
+    def _get_path(self, organization_id: int, file_id: int) -> str:
+        return os.path.join(self.cache_path, str(organization_id), str(file_id))
+
+    def _save_to_disk(self, releasefile) -> Tuple[str, bool]:
+        """Stores the file in the local cache directory if it is not there yet.
 
-        file_id = str(releasefile.file.id)
-        organization_id = str(releasefile.organization_id)
-        file_path = os.path.join(self.cache_path, organization_id, file_id)
+        Returns the path of the cached file and whether it was already cached.
+        """
+        file_path = self._get_path(releasefile.organization_id, releasefile.file.id)
 
         hit = True
         try:
@@ -167,9 +208,49 @@ class ReleaseFileCache:
             releasefile.file.save_to(file_path)
             hit = False
 
+        return file_path, hit
+
+    def getfile(self, releasefile):
+        cutoff = options.get("releasefile.cache-limit")
+        file_size = releasefile.file.size
+        if file_size < cutoff:
+            metrics.timing("release_file.cache.get.size", file_size, tags={"cutoff": True})
+            return releasefile.file.getfile()
+
+        file_path, hit = self._save_to_disk(releasefile)
+
         metrics.timing("release_file.cache.get.size", file_size, tags={"hit": hit, "cutoff": False})
         return FileObj(open(file_path, "rb"))
 
+    def getfile_mapped(self, releasefile) -> MappedFile:
+        """Returns a memory map of the file, which is stored in the local cache
+        directory regardless of its size.
+
+        The caller is responsible for closing the returned file.
+        """
+        file_path, hit = self._save_to_disk(releasefile)
+        if hit:
+            # Cached files are cleared by modification time, bump it so that
+            # files in use stay on disk.
+            os.utime(file_path)
+
+        metrics.timing(
+            "release_file.cache.get_mapped.size", releasefile.file.size, tags={"hit": hit}
+        )
+        return MappedFile(file_path)
+
+    def getfile_mapped_by_id(self, organization_id: int, file_id: int) -> Optional[MappedFile]:
+        """Like :meth:`getfile_mapped`, but without loading the release file.
+
+        Returns ``None`` if the file is not in the local cache directory.
+        """
+        file_path = self._get_path(organization_id, file_id)
+        try:
+            os.utime(file_path)
+            return MappedFile(file_path)
+        except FileNotFoundError:
+            return None
+
     def clear_old_entries(self):
         clear_cached_files(self.cache_path)
 
@@ -1,8 +1,10 @@
 from threading import local
 
 import sentry_sdk
+from django.conf import settings
 from django.core.cache import InvalidCacheBackendError, caches
 
+from sentry.nodestore.codecs import NodePayloadCodec, is_encoded
 from sentry.utils import json
 from sentry.utils.cache import memoize
 from sentry.utils.services import Service
@@ -64,7 +66,9 @@ class NodeStorage(local, Service):
         "get",
         "get_multi",
         "set",
+        "set_multi",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -92,6 +96,9 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if is_encoded(value):
+            return self.payload_codec.decode(value, subkey=subkey)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -200,7 +207,13 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        If a payload codec is configured (see ``SENTRY_NODESTORE_CODEC``), the
+        data is written in the binary format of ``NodePayloadCodec`` instead.
         """
+        if self.payload_codec.enabled:
+            return self.payload_codec.encode(data)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             lines.append(key.encode("ascii"))
@@ -246,6 +259,55 @@ class NodeStorage(local, Service):
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
 
+    def _set_bytes_multi(self, items, ttl=None):
+        """
+        >>> nodestore._set_bytes_multi({
+        ...     'key1': b"{'foo': 'bar'}",
+        ...     'key2': b"{'foo': 'baz'}",
+        ... })
+        """
+        for id, data in items.items():
+            self._set_bytes(id, data, ttl=ttl)
+
+    def set_multi(self, items, ttl=None):
+        """
+        Set values for multiple ids at once. Like `set`, this deletes existing
+        subkeys for all ids.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        return self.set_subkeys_multi({id: {None: data} for id, data in items.items()}, ttl=ttl)
+
+    def set_subkeys_multi(self, items, ttl=None):
+        """
+        Set values and subkeys for multiple ids at once, see `set_subkeys`.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_subkeys_multi({
+        ...     'key1': {None: {'foo': 'bar'}, "reprocessing": {'foo': 'bam'}},
+        ...     'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        with sentry_sdk.start_span(op="nodestore.set_subkeys_multi") as span:
+            span.set_data("num_ids", len(items))
+            cache_items = {}
+            bytes_items = {}
+            for id, data in items.items():
+                cache_item = data.get(None)
+                if cache_item:
+                    cache_items[id] = cache_item
+                bytes_items[id] = self._encode(data)
+
+            self._set_bytes_multi(bytes_items, ttl=ttl)
+            # set cache only after encoding and write to nodestore has succeeded
+            if cache_items:
+                self._set_cache_items(cache_items)
+
     def cleanup(self, cutoff_timestamp):
         raise NotImplementedError
 
@@ -277,6 +339,10 @@ class NodeStorage(local, Service):
         if self.cache:
             self.cache.delete_many([id for id in id_list])
 
+    @memoize
+    def payload_codec(self):
+        return NodePayloadCodec(**(getattr(settings, "SENTRY_NODESTORE_CODEC", None) or {}))
+
     @memoize
     def cache(self):
         try:
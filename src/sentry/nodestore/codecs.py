@@ -0,0 +1,248 @@
+"""
+Binary payload format for nodestore values.
+
+Legacy nodestore payloads are newline separated JSON documents (see
+``NodeStorage._encode``). Payloads written by ``NodePayloadCodec`` instead
+start with a fixed size header that records how the payload was written::
+
+    +-------+---------+------------+-------------+---------------+
+    | magic | version | serializer | compression | dictionary id |
+    | 3B    | 1B      | 1B         | 1B          | 4B            |
+    +-------+---------+------------+-------------+---------------+
+
+The magic starts with a NUL byte, which can neither start a JSON document nor a
+pickle, so legacy and new payloads can coexist in the same store and are told
+apart on read. The (optionally compressed) body is a sequence of length
+prefixed ``(subkey, value)`` segments, the first one being the default subkey.
+Only the segment that was asked for is deserialized on read.
+
+Every payload can be decoded regardless of the currently configured codec, as
+long as the zstd dictionary it was compressed with is still configured.
+"""
+
+import struct
+from typing import Any, Callable, Mapping, MutableMapping, Optional, Tuple
+
+import msgpack
+import rapidjson
+import zstandard
+
+from sentry.utils import json
+
+MAGIC = b"\x00ns"
+FORMAT_VERSION = 1
+
+_header = struct.Struct(">3sBBBI")
+_key_length = struct.Struct(">H")
+_value_length = struct.Struct(">I")
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+
+COMPRESSIONS = {None: COMPRESSION_NONE, "zstd": COMPRESSION_ZSTD}
+
+
+class NodePayloadError(ValueError):
+    pass
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value).encode("utf8")
+
+
+def _json_loads(value: bytes) -> Any:
+    return rapidjson.loads(value)
+
+
+def _msgpack_dumps(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(value: bytes) -> Any:
+    return msgpack.unpackb(value, raw=False, strict_map_key=False)
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    import orjson
+
+    return orjson.dumps(value)
+
+
+def _orjson_loads(value: bytes) -> Any:
+    import orjson
+
+    return orjson.loads(value)
+
+
+# Serializer ids are persisted in payload headers and must never be reused.
+SERIALIZERS: Mapping[str, Tuple[int, Callable[[Any], bytes], Callable[[bytes], Any]]] = {
+    "json": (1, _json_dumps, _json_loads),
+    "msgpack": (2, _msgpack_dumps, _msgpack_loads),
+    "orjson": (3, _orjson_dumps, _orjson_loads),
+}
+
+_serializers_by_id = {id: (name, loads) for name, (id, _, loads) in SERIALIZERS.items()}
+
+# The fallback if a payload cannot be represented by the configured serializer,
+# e.g. integers that do not fit into 64 bits with msgpack.
+FALLBACK_SERIALIZER = "json"
+
+
+def is_encoded(value: bytes) -> bool:
+    return value[: len(MAGIC)] == MAGIC
+
+
+class NodePayloadCodec:
+    """
+    Encodes and decodes nodestore payloads.
+
+    :param serializer: One of ``json``, ``msgpack`` or ``orjson``. ``None``
+        keeps writing the legacy newline separated JSON format, while still
+        being able to read payloads written by this codec.
+    :param compression: ``None`` or ``zstd``. Make sure the backend does not
+        compress payloads a second time.
+    :param level: The zstd compression level.
+    :param dictionaries: A mapping of platform to the path of a trained zstd
+        dictionary. Events of platforms without a dictionary are compressed
+        without one. Dictionaries must stay configured as long as payloads
+        compressed with them are stored.
+
+    Compressor state is cached on the instance, which is why instances must not
+    be shared between threads.
+    """
+
+    def __init__(
+        self,
+        serializer: Optional[str] = None,
+        compression: Optional[str] = None,
+        level: int = 3,
+        dictionaries: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        if serializer is not None and serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown nodestore serializer: {serializer}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown nodestore compression: {compression}")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.level = level
+
+        self.__dictionaries_by_platform: MutableMapping[str, zstandard.ZstdCompressionDict] = {}
+        self.__dictionaries_by_id: MutableMapping[int, zstandard.ZstdCompressionDict] = {}
+        for platform, path in (dictionaries or {}).items():
+            with open(path, "rb") as f:
+                dictionary = zstandard.ZstdCompressionDict(f.read())
+            self.__dictionaries_by_platform[platform] = dictionary
+            self.__dictionaries_by_id[dictionary.dict_id()] = dictionary
+
+        self.__compressors: MutableMapping[int, zstandard.ZstdCompressor] = {}
+        self.__decompressors: MutableMapping[int, zstandard.ZstdDecompressor] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.serializer is not None
+
+    def __get_compressor(self, dictionary_id: int) -> zstandard.ZstdCompressor:
+        compressor = self.__compressors.get(dictionary_id)
+        if compressor is None:
+            dictionary = self.__dictionaries_by_id.get(dictionary_id)
+            if dictionary is not None:
+                compressor = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+            else:
+                compressor = zstandard.ZstdCompressor(level=self.level)
+            self.__compressors[dictionary_id] = compressor
+        return compressor
+
+    def __get_decompressor(self, dictionary_id: int) -> zstandard.ZstdDecompressor:
+        decompressor = self.__decompressors.get(dictionary_id)
+        if decompressor is None:
+            if dictionary_id:
+                try:
+                    dictionary = self.__dictionaries_by_id[dictionary_id]
+                except KeyError:
+                    raise NodePayloadError(f"Unknown zstd dictionary: {dictionary_id}")
+                decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            else:
+                decompressor = zstandard.ZstdDecompressor()
+            self.__decompressors[dictionary_id] = decompressor
+        return decompressor
+
+    def encode(self, data: Mapping[Optional[str], Any]) -> bytes:
+        """
+        Encode a mapping of subkeys to values, the default value being stored
+        under the ``None`` subkey.
+        """
+        assert self.serializer is not None
+
+        default = data[None]
+        try:
+            body, serializer = self.__serialize(data, self.serializer), self.serializer
+        except (TypeError, ValueError, OverflowError):
+            body, serializer = self.__serialize(data, FALLBACK_SERIALIZER), FALLBACK_SERIALIZER
+
+        compression = COMPRESSIONS[self.compression]
+        dictionary_id = 0
+        if compression == COMPRESSION_ZSTD:
+            platform = default.get("platform") if isinstance(default, dict) else None
+            dictionary = self.__dictionaries_by_platform.get(platform)
+            if dictionary is not None:
+                dictionary_id = dictionary.dict_id()
+            body = self.__get_compressor(dictionary_id).compress(body)
+
+        header = _header.pack(
+            MAGIC, FORMAT_VERSION, SERIALIZERS[serializer][0], compression, dictionary_id
+        )
+        return header + body
+
+    def __serialize(self, data: Mapping[Optional[str], Any], serializer: str) -> bytes:
+        dumps = SERIALIZERS[serializer][1]
+
+        segments = []
+        for key, value in sorted(data.items(), key=lambda item: item[0] is not None):
+            key_bytes = key.encode("ascii") if key is not None else b""
+            value_bytes = dumps(value)
+            segments.append(_key_length.pack(len(key_bytes)))
+            segments.append(key_bytes)
+            segments.append(_value_length.pack(len(value_bytes)))
+            segments.append(value_bytes)
+
+        return b"".join(segments)
+
+    def decode(self, value: bytes, subkey: Optional[str] = None) -> Any:
+        """
+        Decode the value stored under ``subkey`` from a payload written by
+        ``encode``. Returns ``None`` if the subkey does not exist.
+        """
+        try:
+            magic, version, serializer_id, compression, dictionary_id = _header.unpack_from(value)
+        except struct.error:
+            raise NodePayloadError("Truncated nodestore payload header")
+
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise NodePayloadError(f"Unsupported nodestore payload version: {version}")
+
+        try:
+            _, loads = _serializers_by_id[serializer_id]
+        except KeyError:
+            raise NodePayloadError(f"Unknown nodestore serializer: {serializer_id}")
+
+        body = memoryview(value)[_header.size :]
+        if compression == COMPRESSION_ZSTD:
+            body = memoryview(self.__get_decompressor(dictionary_id).decompress(body))
+        elif compression != COMPRESSION_NONE:
+            raise NodePayloadError(f"Unknown nodestore compression: {compression}")
+
+        wanted = subkey.encode("ascii") if subkey is not None else b""
+        offset = 0
+        while offset < len(body):
+            (key_length,) = _key_length.unpack_from(body, offset)
+            offset += _key_length.size
+            key = body[offset : offset + key_length]
+            offset += key_length
+            (value_length,) = _value_length.unpack_from(body, offset)
+            offset += _value_length.size
+            if key == wanted:
+                return loads(bytes(body[offset : offset + value_length]))
+            offset += value_length
+
+        return None
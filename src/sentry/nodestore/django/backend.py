@@ -2,10 +2,12 @@ import logging
 import math
 import pickle
 
+from django.db import IntegrityError, router, transaction
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.codecs import is_encoded
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -23,7 +25,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith(b"{") or is_encoded(value):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -51,6 +53,25 @@ class DjangoNodeStorage(NodeStorage):
     def _set_bytes(self, id, data, ttl=None):
         create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
 
+    def _set_bytes_multi(self, items, ttl=None):
+        if len(items) <= 1:
+            return NodeStorage._set_bytes_multi(self, items, ttl=ttl)
+
+        now = timezone.now()
+        nodes = [Node(id=id, data=compress(data), timestamp=now) for id, data in items.items()]
+
+        try:
+            with transaction.atomic(using=router.db_for_write(Node)):
+                existing = set(Node.objects.filter(id__in=list(items)).values_list("id", flat=True))
+                Node.objects.bulk_create([node for node in nodes if node.id not in existing])
+                Node.objects.bulk_update(
+                    [node for node in nodes if node.id in existing], ["data", "timestamp"]
+                )
+        except IntegrityError:
+            # Another writer inserted one of the nodes concurrently, fall back
+            # to writing them one by one.
+            NodeStorage._set_bytes_multi(self, items, ttl=ttl)
+
     def cleanup(self, cutoff_timestamp):
         from sentry.db.deletion import BulkDeleteQuery
 
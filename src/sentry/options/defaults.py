@@ -69,6 +69,9 @@ register(
     default=1024 * 1024 * 1024,
     flags=FLAG_PRIORITIZE_DISK,
 )
+# Serve release archives from memory maps of the local file cache instead of
+# reading them into memory and the shared cache.
+register("releasefile.mmap-archives", type=Bool, default=False, flags=FLAG_PRIORITIZE_DISK)
 
 
 # Mail
@@ -261,6 +264,22 @@ register("snuba.search.max-total-chunk-time-seconds", default=30.0)
 register("snuba.search.hits-sample-size", default=100)
 register("snuba.track-outcomes-sample-rate", default=0.0)
 
+# Cache completed buckets of discover timeseries queries, see
+# `sentry.snuba.timeseries_cache`.
+register("snuba.timeseries-cache.enabled", default=False)
+# How long after a bucket ended its values are assumed to be final.
+register("snuba.timeseries-cache.settle-seconds", default=5 * 60)
+register("snuba.timeseries-cache.ttl", default=60 * 60)
+
+# Cache resolved discover queries as plans that are reused for other time
+# ranges, see `QueryBuilder.get_plan_key`.
+register("discover.query-plan-cache.enabled", default=False)
+# Queries that resolve database state, like release filters, team key
+# transactions, transaction thresholds (apdex, user misery) and issue short ids,
+# are never cached. Project slugs and custom measurements are resolved when a
+# plan is built, so plans are only reused for a short time.
+register("discover.query-plan-cache.ttl", default=60)
+
 # The percentage of tagkeys that we want to cache. Set to 1.0 in order to cache everything, <=0.0 to stop caching
 register("snuba.tagstore.cache-tagkeys-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
 
@@ -389,6 +408,10 @@ register("store.background-grouping-sample-rate", default=0.0)
 # True if background grouping should run before secondary and primary grouping
 register("store.background-grouping-before", default=False)
 
+# Fraction of events for which the stages of `EventManager.save` are profiled,
+# see `sentry.utils.performance.stageprofiler`.
+register("store.save-event-stage-profiler.sample-rate", default=0.0)
+
 # Store release files bundled as zip files
 register("processing.save-release-archives", default=False)  # unused
 
@@ -496,6 +519,11 @@ register("sentry-metrics.writes-limiter.limits.releasehealth.per-org", default=[
 register("sentry-metrics.writes-limiter.limits.performance.global", default=[])
 register("sentry-metrics.writes-limiter.limits.releasehealth.global", default=[])
 
+# Check and consume the writes limits atomically in a single Redis script.
+# Note that switching this option effectively resets all limits, as the two
+# modes store their state under different keys.
+register("sentry-metrics.writes-limiter.atomic", default=False)
+
 # per-organization limits on the number of timeseries that can be observed in
 # each window.
 #
@@ -73,12 +73,21 @@ When using the quotas, the keys change as follows:
     sliding-window-rate-limit:123:3:902 = 1
     sliding-window-rate-limit:123:30:90 = 2
 
+Atomic check-and-use
+====================
+
+`RedisScriptSlidingWindowRateLimiter` runs `check_and_use_quotas` as a single
+Lua script, checking and consuming quotas of a whole batch of requests
+atomically in one round-trip. To make that possible all keys of the limiter
+are routed to the same Redis node via a hash tag, so unrelated limiters should
+be configured with different hash tags to spread the load.
+
 """
 
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from time import time
-from typing import Any, Iterator, MutableMapping, Optional, Sequence, Tuple
+from typing import Any, Iterator, List, MutableMapping, Optional, Sequence, Tuple
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.utils import redis
@@ -168,6 +177,8 @@ class GrantedQuota:
 
 Timestamp = int
 
+sliding_window_script = redis.load_script("ratelimits/sliding_windows.lua")
+
 
 class SlidingWindowRateLimiter(Service):
     def __init__(self, **options: Any) -> None:
@@ -270,6 +281,19 @@ class SlidingWindowRateLimiter(Service):
         self.use_quotas(requests, grants, timestamp)
         return grants
 
+    def refund_quotas(
+        self,
+        requests: Sequence[RequestedQuota],
+        grants: Sequence[GrantedQuota],
+        timestamp: Timestamp,
+    ) -> None:
+        """
+        Give back quota that has previously been consumed by `use_quotas` or
+        `check_and_use_quotas`, e.g. because the operation it was consumed for
+        failed. Takes the same parameters as `use_quotas`.
+        """
+        raise NotImplementedError()
+
 
 class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
     def __init__(self, **options: Any) -> None:
@@ -426,3 +450,72 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
                 pipeline.expire(key, keys_ttl[key])
 
             pipeline.execute()
+
+    def refund_quotas(
+        self,
+        requests: Sequence[RequestedQuota],
+        grants: Sequence[GrantedQuota],
+        timestamp: Timestamp,
+    ) -> None:
+        self.use_quotas(
+            requests,
+            [replace(grant, granted=-grant.granted) for grant in grants],
+            timestamp,
+        )
+
+
+class RedisScriptSlidingWindowRateLimiter(RedisSlidingWindowRateLimiter):
+    """
+    A Redis backend which checks and consumes quotas atomically in a Lua script.
+
+    Options:
+
+    * ``cluster``: The Redis cluster to use, as for `RedisSlidingWindowRateLimiter`.
+    * ``hash_tag``: All keys of this limiter are routed to a single Redis node
+      using this hash tag.
+    """
+
+    def __init__(self, **options: Any) -> None:
+        self.hash_tag = options.pop("hash_tag", "sliding-window-rate-limit")
+        super().__init__(**options)
+
+    def _build_redis_key_raw(self, prefix: str, window: int, granularity: int, granule: int) -> str:
+        key = super()._build_redis_key_raw(prefix, window, granularity, granule)
+        return f"{{{self.hash_tag}}}:{key}"
+
+    def check_and_use_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Optional[Timestamp] = None
+    ) -> Sequence[GrantedQuota]:
+        if timestamp is None:
+            timestamp = int(time())
+        else:
+            timestamp = int(timestamp)
+
+        if not requests:
+            return []
+
+        key_indexes: MutableMapping[str, int] = {}
+        args: List[int] = [len(requests)]
+
+        for request in requests:
+            assert request.quotas
+            args.extend((request.requested, len(request.quotas)))
+
+            for quota in request.quotas:
+                granules = list(quota.iter_window(timestamp))
+                args.extend((quota.limit, quota.window_seconds, len(granules)))
+                for granule in granules:
+                    key = self._build_redis_key(request=request, quota=quota, granule=granule)
+                    # Lua tables are 1-indexed
+                    args.append(key_indexes.setdefault(key, len(key_indexes) + 1))
+
+        results = sliding_window_script(self.client, list(key_indexes), args)
+
+        return [
+            GrantedQuota(
+                prefix=request.prefix,
+                granted=int(granted),
+                reached_quotas=[request.quotas[int(i)] for i in reached],
+            )
+            for request, (granted, reached) in zip(requests, results)
+        ]
@@ -2,7 +2,7 @@ from sentry.utils.services import Service
 
 
 class ProjectConfigCache(Service):
-    __all__ = ("set_many", "delete_many", "get")
+    __all__ = ("set_many", "delete_many", "get", "get_many")
 
     def __init__(self, **options):
         pass
@@ -15,3 +15,15 @@ class ProjectConfigCache(Service):
 
     def get(self, public_key):
         raise NotImplementedError()
+
+    def get_many(self, public_keys):
+        """
+        Returns a mapping of public keys to project configs, leaving out public
+        keys without a cached config.
+        """
+        rv = {}
+        for public_key in public_keys:
+            config = self.get(public_key)
+            if config is not None:
+                rv[public_key] = config
+        return rv
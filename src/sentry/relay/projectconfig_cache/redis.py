@@ -1,25 +1,83 @@
 import logging
+from hashlib import md5
 
 import zstandard
 
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
+from sentry.utils.lru import LRUCache
 from sentry.utils.redis import validate_dynamic_cluster
 
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+# The size of dictionaries built by ``train_compression_dictionary``.
+COMPRESSION_DICTIONARY_SIZE = 64 * 1024
+
 logger = logging.getLogger(__name__)
 
 
+def _get_revision(value):
+    return md5(value).hexdigest().encode()
+
+
+def train_compression_dictionary(configs, dict_size=COMPRESSION_DICTIONARY_SIZE):
+    """
+    Trains a zstd dictionary on a representative sample of project configs and
+    returns its raw content, which can be written to the file configured as
+    ``compression_dictionary``. A few thousand configs are usually enough.
+    """
+    samples = [json.dumps(config).encode() for config in configs]
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
-    def __init__(self, **options):
+    """
+    Stores zstd compressed project configs in Redis.
+
+    :param compression_dictionary: The path of a zstd dictionary trained on
+        project configs (see ``train_compression_dictionary``). The dictionary
+        must stay configured as long as configs compressed with it are cached,
+        so deploy it to all readers before enabling it.
+    :param compression_level: The zstd compression level.
+    :param local_cache_ttl: If positive, decoded configs are kept in an
+        in-process cache for this many seconds. Reads then only fetch the
+        revision of a cached config and skip fetching and decoding the config
+        unless it changed.
+    :param local_cache_size: The maximum number of configs kept in the
+        in-process cache.
+    """
+
+    def __init__(
+        self,
+        compression_dictionary=None,
+        compression_level=COMPRESSION_LEVEL,
+        local_cache_ttl=0,
+        local_cache_size=10000,
+        **options,
+    ):
         cluster_key = options.get("cluster", "default")
         self.cluster = redis.redis_clusters.get(cluster_key)
 
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get(read_cluster_key)
 
+        self.compression_level = compression_level
+        self.compression_dictionary = None
+        if compression_dictionary is not None:
+            with open(compression_dictionary, "rb") as f:
+                self.compression_dictionary = zstandard.ZstdCompressionDict(f.read())
+            self.compression_dictionary.precompute_compress(level=compression_level)
+
+        if local_cache_ttl > 0:
+            self.local_cache = LRUCache(
+                local_cache_size,
+                ttl=local_cache_ttl,
+                metrics_key="relay.projectconfig_cache.local_cache",
+            )
+        else:
+            self.local_cache = None
+
         super().__init__(**options)
 
     def validate(self):
@@ -28,18 +86,51 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_revision_key(self, public_key):
+        return f"relayconfig-revision:{public_key}"
+
+    def __get_compressor(self):
+        if self.compression_dictionary is not None:
+            return zstandard.ZstdCompressor(
+                level=self.compression_level, dict_data=self.compression_dictionary
+            )
+        return zstandard.ZstdCompressor(level=self.compression_level)
+
+    def __decompress(self, value):
+        try:
+            dict_id = zstandard.get_frame_parameters(value).dict_id
+        except (TypeError, zstandard.ZstdError):
+            # assume raw json
+            return value
+
+        if dict_id and self.compression_dictionary is not None:
+            if dict_id != self.compression_dictionary.dict_id():
+                raise ValueError(f"Unknown zstd dictionary: {dict_id}")
+            decompressor = zstandard.ZstdDecompressor(dict_data=self.compression_dictionary)
+        else:
+            decompressor = zstandard.ZstdDecompressor()
+
+        return decompressor.decompress(value)
+
     def set_many(self, configs):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        compressor = self.__get_compressor()
+
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
         for public_key, config in configs.items():
             serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            compressed = compressor.compress(serialized)
             metrics.timing("relay.projectconfig_cache.uncompressed_size", len(serialized))
             metrics.timing("relay.projectconfig_cache.size", len(compressed))
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
+            p.setex(
+                self.__get_revision_key(public_key),
+                REDIS_CACHE_TIMEOUT,
+                _get_revision(compressed),
+            )
 
         p.execute()
 
@@ -48,19 +139,74 @@ class RedisProjectConfigCache(ProjectConfigCache):
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
+                p.delete(self.__get_revision_key(public_key))
             return_values = p.execute()
 
+        if self.local_cache is not None:
+            self.local_cache.delete_many(public_keys)
+
         metrics.incr(
-            "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
+            "relay.projectconfig_cache.write",
+            amount=sum(return_values[::2]),
+            tags={"action": "delete"},
         )
 
     def get(self, public_key):
-        rv = self.cluster_read.get(self.__get_redis_key(public_key))
-        if rv is not None:
-            try:
-                rv = zstandard.decompress(rv).decode()
-            except (TypeError, zstandard.ZstdError):
-                # assume raw json
-                pass
-            return json.loads(rv)
-        return None
+        return self.get_many([public_key]).get(public_key)
+
+    def get_many(self, public_keys):
+        """
+        Returns a mapping of public keys to project configs, leaving out public
+        keys without a cached config.
+
+        With the in-process cache enabled, configs are shared between callers
+        and must not be mutated.
+        """
+        public_keys = list(public_keys)
+
+        local_configs = {}
+        if self.local_cache is not None:
+            local_configs = self.local_cache.get_many(public_keys)
+
+        # Only check the revisions of configs that are cached locally, and
+        # fetch all others right away.
+        with self.cluster_read.pipeline(transaction=False) as p:
+            for public_key in public_keys:
+                if public_key in local_configs:
+                    p.get(self.__get_revision_key(public_key))
+                else:
+                    p.get(self.__get_redis_key(public_key))
+            values = dict(zip(public_keys, p.execute()))
+
+        rv = {}
+        outdated = []
+        for public_key, value in values.items():
+            if public_key in local_configs:
+                revision, config = local_configs[public_key]
+                if value is not None and value == revision:
+                    rv[public_key] = config
+                else:
+                    outdated.append(public_key)
+            elif value is not None:
+                rv[public_key] = self.__decode(public_key, value)
+
+        if outdated:
+            with self.cluster_read.pipeline(transaction=False) as p:
+                for public_key in outdated:
+                    p.get(self.__get_redis_key(public_key))
+                for public_key, value in zip(outdated, p.execute()):
+                    if value is not None:
+                        rv[public_key] = self.__decode(public_key, value)
+                    else:
+                        self.local_cache.delete(public_key)
+
+        return rv
+
+    def __decode(self, public_key, value):
+        decompressed = self.__decompress(value)
+        if isinstance(decompressed, bytes):
+            decompressed = decompressed.decode()
+        config = json.loads(decompressed)
+        if self.local_cache is not None:
+            self.local_cache.set(public_key, (_get_revision(value), config))
+        return config
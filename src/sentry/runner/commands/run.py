@@ -510,6 +510,18 @@ def batching_kafka_options(group):
     default=None,
     help="Thread pool size (only utilitized for message types that support concurrent processing)",
 )
+@click.option(
+    "--pipelined",
+    default=False,
+    is_flag=True,
+    help="Use the arroyo based consumer that processes batches of different partitions concurrently.",
+)
+@click.option(
+    "--stage-concurrency",
+    type=int,
+    default=4,
+    help="Thread pool size for the processing stages of the pipelined consumer.",
+)
 @configuration
 def ingest_consumer(consumer_types, all_consumer_types, **options):
     """
@@ -538,10 +550,30 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
     else:
         executor = None
 
+    pipelined = options.pop("pipelined")
+    stage_concurrency = options.pop("stage_concurrency")
+
     with metrics.global_tags(
         ingest_consumer_types=",".join(sorted(consumer_types)), _all_threads=True
     ):
-        get_ingest_consumer(consumer_types=consumer_types, executor=executor, **options).run()
+        if pipelined:
+            from sentry.ingest.pipeline import get_pipelined_ingest_consumer
+
+            consumer = get_pipelined_ingest_consumer(
+                consumer_types=sorted(consumer_types),
+                executor=executor,
+                stage_concurrency=stage_concurrency,
+                **options,
+            )
+
+            def handler(signum, frame):
+                consumer.signal_shutdown()
+
+            signal.signal(signal.SIGINT, handler)
+            signal.signal(signal.SIGTERM, handler)
+            consumer.run()
+        else:
+            get_ingest_consumer(consumer_types=consumer_types, executor=executor, **options).run()
 
 
 @run.command("ingest-metrics-consumer-2")
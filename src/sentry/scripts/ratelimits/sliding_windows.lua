@@ -0,0 +1,76 @@
+-- Check and consume a batch of sliding window quotas atomically. Values
+-- provided as ``KEYS`` are all granule counters involved in the batch, values
+-- provided as ``ARGV`` describe the requests and index into ``KEYS``:
+--
+--   ARGV = {<number of requests>, <request>, <request>, ...}
+--
+-- where every request is encoded as:
+--
+--   <requested>, <number of quotas>, <quota>, <quota>, ...
+--
+-- and every quota as:
+--
+--   <limit>, <window seconds>, <number of granules>, <granule key index>, ...
+--
+-- The first granule of every quota is the current one, which is incremented
+-- by the granted amount and expires after the quota's window. Requests are
+-- processed in order, so quotas shared between requests see the quota that
+-- was granted to previous requests of the same batch.
+--
+-- The result is a Lua table/array (Redis multi bulk reply) containing
+-- ``{granted, {reached quota indexes}}`` for every request, where quota
+-- indexes are zero-based.
+
+local values = {}
+
+local function get_value(index)
+    local value = values[index]
+    if value == nil then
+        value = tonumber(redis.call('GET', KEYS[index]) or 0)
+        values[index] = value
+    end
+    return value
+end
+
+local results = {}
+local pos = 2
+for r = 1, tonumber(ARGV[1]) do
+    local granted = tonumber(ARGV[pos])
+    local num_quotas = tonumber(ARGV[pos + 1])
+    pos = pos + 2
+
+    local reached = {}
+    local current = {}
+    for q = 1, num_quotas do
+        local limit = tonumber(ARGV[pos])
+        local ttl = tonumber(ARGV[pos + 1])
+        local num_granules = tonumber(ARGV[pos + 2])
+        pos = pos + 3
+
+        local used = 0
+        for g = 0, num_granules - 1 do
+            used = used + get_value(tonumber(ARGV[pos + g]))
+        end
+        current[q] = {tonumber(ARGV[pos]), ttl}
+        pos = pos + num_granules
+
+        -- Quotas may have been overused, truncate negative grants to zero.
+        local remaining = math.max(0, limit - used)
+        if remaining < granted then
+            granted = remaining
+            table.insert(reached, q - 1)
+        end
+    end
+
+    if granted > 0 then
+        for q = 1, num_quotas do
+            local index = current[q][1]
+            values[index] = redis.call('INCRBY', KEYS[index], granted)
+            redis.call('EXPIRE', KEYS[index], current[q][2])
+        end
+    end
+
+    results[r] = {granted, reached}
+end
+
+return results
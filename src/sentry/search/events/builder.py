@@ -72,6 +72,7 @@ from sentry.search.events.datasets.base import DatasetConfig
 from sentry.search.events.fields import (
     ColumnArg,
     FunctionDetails,
+    IntervalDefault,
     MetricsFunction,
     NormalizedArg,
     NumericColumn,
@@ -95,6 +96,7 @@ from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.snuba.metrics.fields import histogram as metrics_histogram
 from sentry.snuba.metrics.utils import MetricMeta
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.lru import LRUCache
 from sentry.utils.snuba import (
     DATASETS,
     Dataset,
@@ -109,10 +111,68 @@ from sentry.utils.snuba import (
 )
 from sentry.utils.validators import INVALID_ID_DETAILS, INVALID_SPAN_ID, WILDCARD_NOT_ALLOWED
 
+# Datasets whose resolved queries can be cached as plans
+PLAN_CACHE_DATASETS = {Dataset.Discover, Dataset.Transactions, Dataset.Events}
+# The attributes of a builder that are set by `resolve_query` and make up a plan
+PLAN_ATTRIBUTES = (
+    "where",
+    "having",
+    "columns",
+    "aggregates",
+    "orderby",
+    "groupby",
+    "function_alias_map",
+    "equation_alias_map",
+    "projects_to_filter",
+    "has_or_condition",
+    "tips",
+    "depends_on_time_range",
+)
+
+_plan_cache: LRUCache[Tuple[Any, ...], Dict[str, Any]] = LRUCache(
+    maxsize=1000, metrics_key="search.events.builder.plan_cache"
+)
+
+
+def _freeze_plan_value(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze_plan_value(val)) for key, val in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze_plan_value(val) for val in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_plan_value(val) for val in value)
+    hash(value)
+    return value
+
+
+def _copy_plan_value(value: Any) -> Any:
+    # Builders append to their where clause, columns etc. after resolving
+    # them, so a plan can't share containers with a builder. The snql
+    # expressions in them are immutable.
+    if isinstance(value, dict):
+        return {key: _copy_plan_value(val) for key, val in value.items()}
+    if isinstance(value, (list, set)):
+        return type(value)(value)
+    return value
+
+
+def _has_date_value(terms: Sequence[ParsedTerm]) -> bool:
+    for term in terms:
+        if isinstance(term, ParenExpression):
+            if _has_date_value(term.children):
+                return True
+        elif isinstance(term, (SearchFilter, AggregateFilter)):
+            if isinstance(term.value.raw_value, datetime):
+                return True
+    return False
+
 
 class QueryBuilder:
     """Builds a snql query"""
 
+    # Whether resolved queries can be reused from the plan cache, see `get_plan_key`
+    supports_plan_cache = True
+
     def __init__(
         self,
         dataset: Dataset,
@@ -183,7 +243,13 @@ class QueryBuilder:
 
         self.start: Optional[datetime] = None
         self.end: Optional[datetime] = None
-        self.resolve_query(
+        # Whether the resolved query only depends on the plan key, see `get_plan_key`
+        self.plan_cacheable = True
+        # Whether the result depends on the time range beyond the time conditions,
+        # like relative date filters or epm() without an interval
+        self.depends_on_time_range = False
+
+        plan_key = self.get_plan_key(
             query=query,
             use_aggregate_conditions=use_aggregate_conditions,
             selected_columns=selected_columns,
@@ -191,10 +257,101 @@ class QueryBuilder:
             equations=equations,
             orderby=orderby,
         )
+        if plan_key is None or not self.bind_plan(plan_key):
+            self.resolve_query(
+                query=query,
+                use_aggregate_conditions=use_aggregate_conditions,
+                selected_columns=selected_columns,
+                groupby_columns=groupby_columns,
+                equations=equations,
+                orderby=orderby,
+            )
+            if plan_key is not None and self.plan_cacheable:
+                self.store_plan(plan_key)
 
     def get_default_converter(self) -> Callable[[SearchFilter], Optional[WhereType]]:
         return self._default_filter_converter
 
+    def get_plan_key(self, **resolve_kwargs: Any) -> Optional[Tuple[Any, ...]]:
+        """Returns the key under which the resolved query is cached, or None if it
+        shouldn't be cached.
+
+        The resolved columns, conditions and orderby depend on all params besides
+        the time range, which is bound to a cached plan per query. Functions like
+        epm() depend on the length of the time range, so it's part of the key.
+        """
+        if not self.supports_plan_cache or self.dataset not in PLAN_CACHE_DATASETS:
+            return None
+        if not options.get("discover.query-plan-cache.enabled"):
+            return None
+
+        start, end = self.params.get("start"), self.params.get("end")
+        duration = None
+        if isinstance(start, datetime) and isinstance(end, datetime):
+            duration = (end - start).total_seconds()
+
+        try:
+            plan_key = _freeze_plan_value(
+                (
+                    type(self).__name__,
+                    self.dataset.value,
+                    resolve_kwargs,
+                    {key: val for key, val in self.params.items() if key not in ("start", "end")},
+                    duration,
+                    self.skip_time_conditions,
+                    self.auto_fields,
+                    self.auto_aggregations,
+                    self.functions_acl,
+                    self.equation_config,
+                    self.parser_config_overrides,
+                    self.array_join,
+                )
+            )
+        except TypeError:
+            return None
+        return cast(Tuple[Any, ...], plan_key)
+
+    def bind_plan(self, plan_key: Tuple[Any, ...]) -> bool:
+        """Loads the resolved query from a cached plan and binds it to the time
+        range of this query. Returns False if there's no cached plan."""
+        plan = _plan_cache.get(plan_key)
+        if plan is None:
+            return False
+
+        with sentry_sdk.start_span(op="QueryBuilder", description="bind_plan"):
+            self.resolve_time_conditions()
+            self.resolve_retention()
+
+            for name, value in plan["attributes"].items():
+                setattr(self, name, _copy_plan_value(value))
+
+            for index, attribute in plan["time_conditions"]:
+                condition = self.where[index]
+                self.where[index] = Condition(condition.lhs, condition.op, getattr(self, attribute))
+
+        return True
+
+    def store_plan(self, plan_key: Tuple[Any, ...]) -> None:
+        # The time conditions are the ones added by `resolve_params`, user
+        # provided time conditions make a query uncacheable.
+        time_conditions = [
+            (index, attribute)
+            for index, condition in enumerate(self.where)
+            for attribute in ("start", "end")
+            if isinstance(condition, Condition)
+            and getattr(self, attribute) is not None
+            and condition.rhs is getattr(self, attribute)
+        ]
+        plan = {
+            "attributes": {
+                name: _copy_plan_value(getattr(self, name))
+                for name in PLAN_ATTRIBUTES
+                if hasattr(self, name)
+            },
+            "time_conditions": time_conditions,
+        }
+        _plan_cache.set(plan_key, plan, ttl=options.get("discover.query-plan-cache.ttl"))
+
     def resolve_time_conditions(self) -> None:
         if self.skip_time_conditions:
             return
@@ -446,21 +603,12 @@ class QueryBuilder:
         """
         conditions = []
 
-        # Update start to be within retention
-        expired = False
-        if self.start and self.end:
-            expired, self.start = outside_retention_with_modified_start(
-                self.start, self.end, Organization(self.params.get("organization_id"))
-            )
-
         project_id: List[int] = self.params.get("project_id", [])  # type: ignore
         assert all(
             isinstance(project_id, int) for project_id in project_id
         ), "All project id params must be ints"
-        if expired:
-            raise QueryOutsideRetentionError(
-                "Invalid date range. Please try a more recent date range."
-            )
+
+        self.resolve_retention()
 
         if self.start:
             conditions.append(Condition(self.column("timestamp"), Op.GTE, self.start))
@@ -486,6 +634,17 @@ class QueryBuilder:
 
         return conditions
 
+    def resolve_retention(self) -> None:
+        """Update start to be within retention"""
+        if self.start and self.end:
+            expired, self.start = outside_retention_with_modified_start(
+                self.start, self.end, Organization(self.params.get("organization_id"))
+            )
+            if expired:
+                raise QueryOutsideRetentionError(
+                    "Invalid date range. Please try a more recent date range."
+                )
+
     def resolve_select(
         self, selected_columns: Optional[List[str]], equations: Optional[List[str]]
     ) -> List[SelectType]:
@@ -607,6 +766,10 @@ class QueryBuilder:
         arguments = snql_function.format_as_arguments(
             name, parsed_arguments, self.params, combinator
         )
+        if any(
+            isinstance(arg, IntervalDefault) for arg in snql_function.args[len(parsed_arguments) :]
+        ):
+            self.depends_on_time_range = True
 
         self.function_alias_map[alias] = FunctionDetails(function, snql_function, arguments.copy())
 
@@ -1015,6 +1178,12 @@ class QueryBuilder:
         if not parsed_terms:
             return []
 
+        # Dates in the query, like timestamp:-24h, can be relative to now or
+        # validated against the time range, so they can't be part of a plan
+        if _has_date_value(parsed_terms):
+            self.plan_cacheable = False
+            self.depends_on_time_range = True
+
         return parsed_terms
 
     def format_search_filter(self, term: SearchFilter) -> Optional[WhereType]:
@@ -1303,6 +1472,8 @@ class QueryBuilder:
 
 
 class UnresolvedQuery(QueryBuilder):
+    supports_plan_cache = False
+
     def __init__(
         self,
         dataset: Dataset,
@@ -1353,6 +1524,7 @@ class UnresolvedQuery(QueryBuilder):
 
 class TimeseriesQueryBuilder(UnresolvedQuery):
     time_column = Column("time")
+    supports_plan_cache = True
 
     def __init__(
         self,
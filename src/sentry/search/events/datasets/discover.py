@@ -1007,6 +1007,8 @@ class DiscoverDatasetConfig(DatasetConfig, SemverAndStageFilterConverterMixin):
     def _resolve_project_threshold_config(self) -> SelectType:
         org_id = self.builder.params.get("organization_id")
         project_ids = self.builder.params.get("project_id")
+        # Thresholds can change at any time, don't reuse them from a plan
+        self.builder.plan_cacheable = False
 
         project_threshold_configs = (
             ProjectTransactionThreshold.objects.filter(
@@ -1435,6 +1437,8 @@ class DiscoverDatasetConfig(DatasetConfig, SemverAndStageFilterConverterMixin):
         filter_values = ["" for v in value if not v or v == "unknown"]
 
         if group_short_ids and self.builder.params and "organization_id" in self.builder.params:
+            # Short ids can be reassigned when issues are merged or moved
+            self.builder.plan_cacheable = False
             try:
                 groups = Group.objects.by_qualified_short_id_bulk(
                     self.builder.params["organization_id"],
@@ -30,6 +30,9 @@ def resolve_team_key_transaction_alias(
     if org_id is None or team_ids is None or project_ids is None:
         raise TypeError("Team key transactions parameters cannot be None")
 
+    # Key transactions can change at any time, don't reuse them from a plan
+    builder.plan_cacheable = False
+
     team_key_transactions = list(
         TeamKeyTransaction.objects.filter(
             organization_id=org_id,
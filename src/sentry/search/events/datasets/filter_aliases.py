@@ -37,6 +37,8 @@ def release_filter_converter(builder: QueryBuilder, search_filter: SearchFilter)
         operator = search_filter.operator
         value = search_filter.value
     else:
+        # Aliases like `latest` resolve to different releases over time
+        builder.plan_cacheable = False
         operator_conversions = {"=": "IN", "!=": "NOT IN"}
         operator = operator_conversions.get(search_filter.operator, search_filter.operator)
         value = SearchValue(
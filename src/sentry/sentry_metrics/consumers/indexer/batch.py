@@ -53,84 +53,54 @@ def invalid_metric_tags(tags: Mapping[str, str]) -> Sequence[str]:
     return invalid_strs
 
 
+def _valid_metric_tags(tags: Mapping[str, str]) -> bool:
+    """
+    Fast check whether ``invalid_metric_tags`` would not return anything.
+    """
+    try:
+        return (
+            max(map(len, tags.keys()), default=0) <= MAX_TAG_KEY_LENGTH
+            and max(map(len, tags.values()), default=0) <= MAX_TAG_VALUE_LENGTH
+        )
+    except TypeError:
+        # ``None`` keys or values
+        return False
+
+
 class IndexerBatch:
+    """
+    Extracts the strings to index from a batch of metrics messages and
+    rewrites the messages with the resolved ids.
+
+    Payloads are decoded and validated in a single pass. The parsed payloads
+    of valid messages are kept in a flat list aligned with the messages of
+    the batch, with ``None`` for skipped messages.
+    """
+
     def __init__(self, use_case_id: UseCaseKey, outer_message: Message[MessageBatch]) -> None:
         self.use_case_id = use_case_id
         self.outer_message = outer_message
 
     @metrics.wraps("process_messages.parse_outer_message")
     def extract_strings(self) -> Mapping[int, Set[str]]:
-        org_strings = defaultdict(set)
+        org_strings: MutableMapping[int, Set[str]] = defaultdict(set)
 
         self.skipped_offsets: Set[PartitionIdxOffset] = set()
-        self.parsed_payloads_by_offset: MutableMapping[PartitionIdxOffset, json.JSONData] = {}
+        self.parsed_payloads: List[Optional[json.JSONData]] = []
 
         for msg in self.outer_message.payload:
-            partition_offset = PartitionIdxOffset(msg.partition.index, msg.offset)
-            try:
-                parsed_payload = json.loads(msg.payload.value.decode("utf-8"), use_rapid_json=True)
-                self.parsed_payloads_by_offset[partition_offset] = parsed_payload
-            except rapidjson.JSONDecodeError:
-                self.skipped_offsets.add(partition_offset)
-                logger.error(
-                    "process_messages.invalid_json",
-                    extra={"payload_value": str(msg.payload.value)},
-                    exc_info=True,
-                )
+            message = self._parse_message(msg)
+            self.parsed_payloads.append(message)
+            if message is None:
+                self.skipped_offsets.add(PartitionIdxOffset(msg.partition.index, msg.offset))
                 continue
 
-        for partition_offset, message in self.parsed_payloads_by_offset.items():
-            partition_idx, offset = partition_offset
-            metric_name = message["name"]
-            metric_type = message["type"]
-            org_id = message["org_id"]
-            tags = message.get("tags", {})
-
-            if not valid_metric_name(metric_name):
-                logger.error(
-                    "process_messages.invalid_metric_name",
-                    extra={
-                        "org_id": org_id,
-                        "metric_name": metric_name,
-                        "partition": partition_idx,
-                        "offset": offset,
-                    },
-                )
-                self.skipped_offsets.add(partition_offset)
-                continue
-
-            if metric_type not in ACCEPTED_METRIC_TYPES:
-                logger.error(
-                    "process_messages.invalid_metric_type",
-                    extra={"org_id": org_id, "metric_type": metric_type, "offset": offset},
-                )
-                self.skipped_offsets.add(partition_offset)
-                continue
-
-            invalid_strs = invalid_metric_tags(tags)
-
-            if invalid_strs:
-                # sentry doesn't seem to actually capture nested logger.error extra args
-                sentry_sdk.set_extra("all_metric_tags", tags)
-                logger.error(
-                    "process_messages.invalid_tags",
-                    extra={
-                        "org_id": org_id,
-                        "metric_name": metric_name,
-                        "invalid_tags": invalid_strs,
-                        "partition": partition_idx,
-                        "offset": offset,
-                    },
-                )
-                self.skipped_offsets.add(partition_offset)
-                continue
-
-            parsed_strings = {
-                metric_name,
-                *tags.keys(),
-                *tags.values(),
-            }
-            org_strings[org_id].update(parsed_strings)
+            strings = org_strings[message["org_id"]]
+            strings.add(message["name"])
+            tags = message.get("tags")
+            if tags:
+                strings.update(tags.keys())
+                strings.update(tags.values())
 
         string_count = 0
         for org_set in org_strings:
@@ -139,6 +109,64 @@ class IndexerBatch:
 
         return org_strings
 
+    def _parse_message(self, msg: Message[KafkaPayload]) -> Optional[json.JSONData]:
+        """
+        Returns the parsed payload of a message, or ``None`` if it is invalid.
+        """
+        partition_idx = msg.partition.index
+        offset = msg.offset
+        try:
+            message = json.loads(msg.payload.value.decode("utf-8"), use_rapid_json=True)
+        except rapidjson.JSONDecodeError:
+            logger.error(
+                "process_messages.invalid_json",
+                extra={"payload_value": str(msg.payload.value)},
+                exc_info=True,
+            )
+            return None
+
+        metric_name = message["name"]
+        metric_type = message["type"]
+        org_id = message["org_id"]
+        tags = message.get("tags", {})
+
+        if not valid_metric_name(metric_name):
+            logger.error(
+                "process_messages.invalid_metric_name",
+                extra={
+                    "org_id": org_id,
+                    "metric_name": metric_name,
+                    "partition": partition_idx,
+                    "offset": offset,
+                },
+            )
+            return None
+
+        if metric_type not in ACCEPTED_METRIC_TYPES:
+            logger.error(
+                "process_messages.invalid_metric_type",
+                extra={"org_id": org_id, "metric_type": metric_type, "offset": offset},
+            )
+            return None
+
+        if not _valid_metric_tags(tags):
+            invalid_strs = invalid_metric_tags(tags)
+            # sentry doesn't seem to actually capture nested logger.error extra args
+            sentry_sdk.set_extra("all_metric_tags", tags)
+            logger.error(
+                "process_messages.invalid_tags",
+                extra={
+                    "org_id": org_id,
+                    "metric_name": metric_name,
+                    "invalid_tags": invalid_strs,
+                    "partition": partition_idx,
+                    "offset": offset,
+                },
+            )
+            return None
+
+        return message
+
     @metrics.wraps("process_messages.reconstruct_messages")
     def reconstruct_messages(
         self,
@@ -147,35 +175,40 @@ class IndexerBatch:
     ) -> List[Message[KafkaPayload]]:
         new_messages: List[Message[KafkaPayload]] = []
 
-        for message in self.outer_message.payload:
-            used_tags: Set[str] = set()
-            output_message_meta: Mapping[str, MutableMapping[str, str]] = defaultdict(dict)
-            partition_offset = PartitionIdxOffset(message.partition.index, message.offset)
-            if partition_offset in self.skipped_offsets:
+        parsed_payloads = self.parsed_payloads
+        # Release the parsed payloads as they are rewritten
+        self.parsed_payloads = []
+
+        for message, new_payload_value in zip(self.outer_message.payload, parsed_payloads):
+            if new_payload_value is None:
                 logger.info(
                     "process_message.offset_skipped",
                     extra={"offset": message.offset, "partition": message.partition.index},
                 )
                 continue
-            new_payload_value = self.parsed_payloads_by_offset.pop(partition_offset)
+
+            output_message_meta: Mapping[str, MutableMapping[str, str]] = defaultdict(dict)
 
             metric_name = new_payload_value["name"]
             org_id = new_payload_value["org_id"]
             sentry_sdk.set_tag("sentry_metrics.organization_id", org_id)
             tags = new_payload_value.get("tags", {})
-            used_tags.add(metric_name)
+            used_tags: Set[str] = {metric_name}
 
             new_tags: MutableMapping[str, int] = {}
             exceeded_global_quotas = 0
             exceeded_org_quotas = 0
+            org_meta = bulk_record_meta[org_id]
 
             try:
+                org_mapping = mapping[org_id]
+                used_tags.update(tags.keys())
+                used_tags.update(tags.values())
                 for k, v in tags.items():
-                    used_tags.update({k, v})
-                    new_k = mapping[org_id][k]
-                    new_v = mapping[org_id][v]
+                    new_k = org_mapping[k]
+                    new_v = org_mapping[v]
                     if new_k is None:
-                        metadata = bulk_record_meta[org_id].get(k)
+                        metadata = org_meta.get(k)
                         if (
                             metadata
                             and metadata.fetch_type_ext
@@ -187,7 +220,7 @@ class IndexerBatch:
                         continue
 
                     if new_v is None:
-                        metadata = bulk_record_meta[org_id].get(v)
+                        metadata = org_meta.get(v)
                         if (
                             metadata
                             and metadata.fetch_type_ext
@@ -224,8 +257,8 @@ class IndexerBatch:
 
             fetch_types_encountered = set()
             for tag in used_tags:
-                if tag in bulk_record_meta[org_id]:
-                    metadata = bulk_record_meta[org_id][tag]
+                metadata = org_meta.get(tag)
+                if metadata is not None:
                     fetch_types_encountered.add(metadata.fetch_type)
                     output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
 
@@ -233,9 +266,9 @@ class IndexerBatch:
                 "".join(sorted(t.value for t in fetch_types_encountered)), "utf-8"
             )
             new_payload_value["tags"] = new_tags
-            new_payload_value["metric_id"] = numeric_metric_id = mapping[org_id][metric_name]
+            new_payload_value["metric_id"] = numeric_metric_id = org_mapping[metric_name]
             if numeric_metric_id is None:
-                metadata = bulk_record_meta[org_id].get(metric_name)
+                metadata = org_meta.get(metric_name)
                 metrics.incr(
                     "sentry_metrics.indexer.process_messages.dropped_message",
                     tags={
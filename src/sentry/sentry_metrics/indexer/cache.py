@@ -1,6 +1,6 @@
 import logging
 import random
-from typing import Mapping, MutableMapping, Optional, Sequence, Set
+from typing import Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -15,6 +15,7 @@ from sentry.sentry_metrics.indexer.base import (
 )
 from sentry.utils import metrics
 from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
@@ -23,19 +24,59 @@ _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
 
+def _randomize_ttl(ttl: float) -> int:
+    # introduce jitter in the cache_ttl so that when we have large
+    # amount of new keys written into the cache, they don't expire all at once
+    jitter = random.uniform(0, 0.25) * ttl
+    return int(ttl + jitter)
+
+
 class StringIndexerCache:
-    def __init__(self, cache_name: str, partition_key: str):
+    """
+    Caches string to id mappings in the shared cache ``cache_name``.
+
+    If ``local_cache_size`` is set, up to that many mappings are additionally
+    kept in process for ``local_cache_ttl`` seconds, and strings that could
+    not be resolved are remembered for ``negative_cache_ttl`` seconds. Both
+    TTLs get the same jitter as the shared cache TTL.
+    """
+
+    def __init__(
+        self,
+        cache_name: str,
+        partition_key: str,
+        local_cache_size: int = 0,
+        local_cache_ttl: int = 300,
+        negative_cache_ttl: int = 10,
+    ):
         self.version = 1
         self.cache = caches[cache_name]
         self.partition_key = partition_key
 
+        self.local_cache_ttl = local_cache_ttl
+        self.negative_cache_ttl = negative_cache_ttl
+        self.local_cache: Optional[LRUCache[Tuple[str, str], int]] = None
+        self.negative_cache: Optional[LRUCache[Tuple[str, str], bool]] = None
+        if local_cache_size > 0:
+            self.local_cache = LRUCache(
+                local_cache_size, metrics_key="sentry_metrics.indexer.local_cache"
+            )
+            self.negative_cache = LRUCache(
+                local_cache_size, metrics_key="sentry_metrics.indexer.negative_cache"
+            )
+
     @property
     def randomized_ttl(self) -> int:
-        # introduce jitter in the cache_ttl so that when we have large
-        # amount of new keys written into the cache, they don't expire all at once
-        cache_ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
-        jitter = random.uniform(0, 0.25) * cache_ttl
-        return int(cache_ttl + jitter)
+        return _randomize_ttl(settings.SENTRY_METRICS_INDEXER_CACHE_TTL)
+
+    def _set_local(self, key_values: Mapping[str, int], cache_namespace: str) -> None:
+        if self.local_cache is None or not key_values:
+            return
+
+        self.local_cache.set_many(
+            {(cache_namespace, k): v for k, v in key_values.items()},
+            ttl=_randomize_ttl(self.local_cache_ttl),
+        )
 
     def make_cache_key(self, key: str, cache_namespace: str) -> str:
         hashed = md5_text(key).hexdigest()
@@ -60,9 +101,16 @@ class StringIndexerCache:
         return formatted
 
     def get(self, key: str, cache_namespace: str) -> int:
+        if self.local_cache is not None:
+            local_result: Optional[int] = self.local_cache.get((cache_namespace, key))
+            if local_result is not None:
+                return local_result
+
         result: int = self.cache.get(
             self.make_cache_key(key, cache_namespace), version=self.version
         )
+        if isinstance(result, int):
+            self._set_local({key: result}, cache_namespace)
         return result
 
     def set(self, key: str, value: int, cache_namespace: str) -> None:
@@ -72,29 +120,71 @@ class StringIndexerCache:
             timeout=self.randomized_ttl,
             version=self.version,
         )
+        self._set_local({key: value}, cache_namespace)
+        if self.negative_cache is not None:
+            self.negative_cache.delete((cache_namespace, key))
 
     def get_many(
         self, keys: Sequence[str], cache_namespace: str
     ) -> MutableMapping[str, Optional[int]]:
-        cache_keys = {self.make_cache_key(key, cache_namespace): key for key in keys}
+        local_results: Mapping[Tuple[str, str], int] = {}
+        if self.local_cache is not None:
+            local_results = self.local_cache.get_many((cache_namespace, key) for key in keys)
+            if len(local_results) == len(keys):
+                return {key: local_results[(cache_namespace, key)] for key in keys}
+
+        cache_keys = {
+            self.make_cache_key(key, cache_namespace): key
+            for key in keys
+            if (cache_namespace, key) not in local_results
+        }
         results: Mapping[str, Optional[int]] = self.cache.get_many(
             cache_keys.keys(), version=self.version
         )
-        return self._format_results(keys, results, cache_namespace)
+        self._set_local(
+            {cache_keys[k]: v for k, v in results.items() if isinstance(v, int)}, cache_namespace
+        )
+
+        formatted = self._format_results(list(cache_keys.values()), results, cache_namespace)
+        for (_, key), value in local_results.items():
+            formatted[key] = value
+        return {key: formatted[key] for key in keys}
 
     def set_many(self, key_values: Mapping[str, int], cache_namespace: str) -> None:
         cache_key_values = {
             self.make_cache_key(k, cache_namespace): v for k, v in key_values.items()
         }
         self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
+        self._set_local(key_values, cache_namespace)
+        if self.negative_cache is not None:
+            self.negative_cache.delete_many((cache_namespace, k) for k in key_values)
 
     def delete(self, key: str, cache_namespace: str) -> None:
         cache_key = self.make_cache_key(key, cache_namespace)
         self.cache.delete(cache_key, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.delete((cache_namespace, key))
 
     def delete_many(self, keys: Sequence[str], cache_namespace: str) -> None:
         cache_keys = [self.make_cache_key(key, cache_namespace) for key in keys]
         self.cache.delete_many(cache_keys, version=self.version)
+        if self.local_cache is not None:
+            self.local_cache.delete_many((cache_namespace, key) for key in keys)
+
+    def is_missing(self, key: str, cache_namespace: str) -> bool:
+        """
+        Whether ``key`` was recently found not to be indexed by this process.
+        """
+        if self.negative_cache is None:
+            return False
+        # ``get`` reports hits and misses, unlike ``in``
+        return self.negative_cache.get((cache_namespace, key)) is not None
+
+    def set_missing(self, key: str, cache_namespace: str) -> None:
+        if self.negative_cache is not None:
+            self.negative_cache.set(
+                (cache_namespace, key), True, ttl=_randomize_ttl(self.negative_cache_ttl)
+            )
 
 
 class CachingIndexer(StringIndexer):
@@ -151,6 +241,9 @@ class CachingIndexer(StringIndexer):
 
     def resolve(self, use_case_id: UseCaseKey, org_id: int, string: str) -> Optional[int]:
         key = f"{org_id}:{string}"
+        if self.cache.is_missing(key, use_case_id.value):
+            return None
+
         result = self.cache.get(key, use_case_id.value)
 
         if result and isinstance(result, int):
@@ -162,6 +255,8 @@ class CachingIndexer(StringIndexer):
 
         if id is not None:
             self.cache.set(key, id, use_case_id.value)
+        else:
+            self.cache.set_missing(key, use_case_id.value)
 
         return id
 
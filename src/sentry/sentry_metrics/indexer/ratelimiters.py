@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import dataclasses
+from time import time
 from typing import Any, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from sentry import options
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
     Quota,
+    RedisScriptSlidingWindowRateLimiter,
     RedisSlidingWindowRateLimiter,
     RequestedQuota,
     Timestamp,
@@ -90,6 +92,8 @@ class RateLimitState:
     _requests: Sequence[RequestedQuota]
     _grants: Sequence[GrantedQuota]
     _timestamp: Timestamp
+    # Whether the grants have already been consumed while checking them.
+    _consumed: bool
 
     accepted_keys: KeyCollection
     dropped_strings: Sequence[DroppedString]
@@ -100,10 +104,16 @@ class RateLimitState:
     @metrics.wraps("sentry_metrics.indexer.writes_limiter.exit")
     def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> None:
         """
-        Consumes the rate limits returned by `check_write_limits`.
+        Consumes the rate limits returned by `check_write_limits`, or gives
+        them back if they have already been consumed and writing failed.
         """
-        if exc_type is None:
-            self._writes_limiter.rate_limiter.use_quotas(
+        if not self._consumed:
+            if exc_type is None:
+                self._writes_limiter.rate_limiter.use_quotas(
+                    self._requests, self._grants, self._timestamp
+                )
+        elif exc_type is not None:
+            self._writes_limiter.atomic_rate_limiter.refund_quotas(
                 self._requests, self._grants, self._timestamp
             )
 
@@ -112,6 +122,9 @@ class WritesLimiter:
     def __init__(self, namespace: str, **options: Mapping[str, str]) -> None:
         self.namespace = namespace
         self.rate_limiter: RedisSlidingWindowRateLimiter = RedisSlidingWindowRateLimiter(**options)
+        self.atomic_rate_limiter: RedisScriptSlidingWindowRateLimiter = (
+            RedisScriptSlidingWindowRateLimiter(hash_tag=_build_quota_key(namespace), **options)
+        )
 
     @metrics.wraps("sentry_metrics.indexer.check_write_limits")
     def check_write_limits(
@@ -129,10 +142,18 @@ class WritesLimiter:
 
         2. All unmapped keys that did not pass through the rate limiter.
 
-        Upon (successful) exit, rate limits are consumed.
+        Upon (successful) exit, rate limits are consumed. If the
+        `sentry-metrics.writes-limiter.atomic` option is set, rate limits are
+        instead consumed right away and given back if the block fails, which
+        prevents concurrent consumers from over-spending them.
         """
         org_ids, requests = _construct_quota_requests(use_case_id, self.namespace, keys)
-        timestamp, grants = self.rate_limiter.check_within_quotas(requests)
+        consumed = options.get("sentry-metrics.writes-limiter.atomic")
+        if consumed:
+            timestamp = int(time())
+            grants = self.atomic_rate_limiter.check_and_use_quotas(requests, timestamp)
+        else:
+            timestamp, grants = self.rate_limiter.check_within_quotas(requests)
 
         granted_key_collection = dict(keys.mapping)
         dropped_strings = []
@@ -167,6 +188,7 @@ class WritesLimiter:
             _requests=requests,
             _grants=grants,
             _timestamp=timestamp,
+            _consumed=consumed,
             accepted_keys=KeyCollection(granted_key_collection),
             dropped_strings=dropped_strings,
         )
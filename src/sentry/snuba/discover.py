@@ -1,3 +1,4 @@
+import functools
 import logging
 import math
 import random
@@ -29,13 +30,13 @@ from sentry.search.events.fields import (
     is_function,
 )
 from sentry.search.events.types import HistogramParams, ParamsType
+from sentry.snuba.timeseries_cache import TimeseriesQuery, bulk_timeseries_query
 from sentry.tagstore.base import TOP_VALUES_DEFAULT_LIMIT
 from sentry.utils.dates import to_timestamp
 from sentry.utils.math import nice_int
 from sentry.utils.snuba import (
     Dataset,
     SnubaTSResult,
-    bulk_snql_query,
     get_array_column_alias,
     get_array_column_field,
     get_measurement_name,
@@ -331,33 +332,38 @@ def timeseries_query(
     """
     with sentry_sdk.start_span(op="discover.discover", description="timeseries.filter_transform"):
         equations, columns = categorize_columns(selected_columns)
-        base_builder = TimeseriesQueryBuilder(
-            Dataset.Discover,
-            params,
-            rollup,
-            query=query,
-            selected_columns=columns,
-            equations=equations,
-            functions_acl=functions_acl,
-        )
-        query_list = [base_builder]
+
+        def build(query_params, functions_acl=functions_acl):
+            return TimeseriesQueryBuilder(
+                Dataset.Discover,
+                query_params,
+                rollup,
+                query=query,
+                selected_columns=columns,
+                equations=equations,
+                functions_acl=functions_acl,
+            )
+
+        cache_key = {
+            "type": "discover.timeseries",
+            "query": query,
+            "columns": columns,
+            "equations": equations,
+        }
+        base_builder = build(params)
+        query_list = [TimeseriesQuery(base_builder, build, cache_key)]
         if comparison_delta:
             if len(base_builder.aggregates) != 1:
                 raise InvalidSearchQuery("Only one column can be selected for comparison queries")
             comp_query_params = deepcopy(params)
             comp_query_params["start"] -= comparison_delta
             comp_query_params["end"] -= comparison_delta
-            comparison_builder = TimeseriesQueryBuilder(
-                Dataset.Discover,
-                comp_query_params,
-                rollup,
-                query=query,
-                selected_columns=columns,
-                equations=equations,
+            build_comparison = functools.partial(build, functions_acl=None)
+            query_list.append(
+                TimeseriesQuery(build_comparison(comp_query_params), build_comparison, cache_key)
             )
-            query_list.append(comparison_builder)
 
-        query_results = bulk_snql_query([query.get_snql_query() for query in query_list], referrer)
+        query_results = bulk_timeseries_query(query_list, rollup, referrer)
 
     with sentry_sdk.start_span(op="discover.discover", description="timeseries.transform_results"):
         results = []
@@ -366,8 +372,8 @@ def timeseries_query(
                 {
                     "data": zerofill(
                         result["data"],
-                        snql_query.params["start"],
-                        snql_query.params["end"],
+                        snql_query.builder.params["start"],
+                        snql_query.builder.params["end"],
                         rollup,
                         "time",
                     )
@@ -481,36 +487,43 @@ def top_events_timeseries(
                 include_equation_fields=True,
             )
 
-    top_events_builder = TopEventsQueryBuilder(
-        Dataset.Discover,
-        params,
-        rollup,
-        top_events["data"],
-        other=False,
-        query=user_query,
-        selected_columns=selected_columns,
-        timeseries_columns=timeseries_columns,
-        equations=equations,
-        functions_acl=functions_acl,
-    )
-    if len(top_events["data"]) == limit and include_other:
-        other_events_builder = TopEventsQueryBuilder(
+    def build(query_params, other=False, functions_acl=functions_acl):
+        return TopEventsQueryBuilder(
             Dataset.Discover,
-            params,
+            query_params,
             rollup,
             top_events["data"],
-            other=True,
+            other=other,
             query=user_query,
             selected_columns=selected_columns,
             timeseries_columns=timeseries_columns,
             equations=equations,
+            functions_acl=functions_acl,
         )
-        result, other_result = bulk_snql_query(
-            [top_events_builder.get_snql_query(), other_events_builder.get_snql_query()],
+
+    cache_key = {
+        "type": "discover.top_events_timeseries",
+        "query": user_query,
+        "columns": selected_columns,
+        "timeseries_columns": timeseries_columns,
+        "equations": equations,
+        "top_events": top_events["data"],
+    }
+    top_events_builder = build(params)
+    if len(top_events["data"]) == limit and include_other:
+        build_other = functools.partial(build, other=True, functions_acl=None)
+        result, other_result = bulk_timeseries_query(
+            [
+                TimeseriesQuery(top_events_builder, build, cache_key),
+                TimeseriesQuery(build_other(params), build_other, dict(cache_key, other=True)),
+            ],
+            rollup,
             referrer=referrer,
         )
     else:
-        result = top_events_builder.run_query(referrer)
+        (result,) = bulk_timeseries_query(
+            [TimeseriesQuery(top_events_builder, build, cache_key)], rollup, referrer=referrer
+        )
         other_result = {"data": []}
     if (
         not allow_empty
@@ -232,6 +232,9 @@ class Referrer(Enum):
     SERIALIZERS_GROUPSERIALIZERSNUBA__EXECUTE_PERF_SEEN_STATS_QUERY = (
         "serializers.groupserializersnuba._execute_perf_seen_stats_query"
     )
+    SERIALIZERS_STREAMGROUPSERIALIZERSNUBA_SEEN_STATS = (
+        "serializers.streamgroupserializersnuba.seen_stats"
+    )
     SESSIONS_CRASH_FREE_BREAKDOWN = "sessions.crash-free-breakdown"
     SESSIONS_GET_PROJECT_SESSIONS_COUNT = "sessions.get_project_sessions_count"
     SESSIONS_GET_ADOPTION = "sessions.get-adoption"
@@ -0,0 +1,240 @@
+"""
+A cache of completed buckets of timeseries queries.
+
+Once a bucket of a timeseries ended more than
+``snuba.timeseries-cache.settle-seconds`` ago, its values are assumed to no
+longer change. Auto-refreshing charts ask for the same window over and over
+again, so instead of querying the full window every time, completed buckets are
+cached per query and rollup, and only the buckets following the last cached
+one are queried from Snuba. Cached and fresh rows are spliced back together
+before they are zerofilled by the caller, like the result of a single query.
+
+Events that are ingested later than the settle delay are not reflected in
+cached buckets until they expire after ``snuba.timeseries-cache.ttl``.
+
+Queries whose result depends on their time range, like queries with relative
+date filters or ``epm()`` without an explicit interval, are never cached.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import md5
+from typing import Any, Callable, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+import pytz
+from dateutil.parser import parse as parse_datetime
+from django.core.cache import cache
+
+from sentry import options
+from sentry.search.events.builder import QueryBuilder
+from sentry.search.events.types import ParamsType
+from sentry.utils import json, metrics
+from sentry.utils.dates import to_timestamp
+from sentry.utils.snuba import bulk_snql_query, naiveify_datetime, to_naive_timestamp
+
+# Bump to invalidate all cached buckets, e.g. if the format of results changes.
+CACHE_VERSION = 1
+
+
+@dataclass
+class TimeseriesQuery:
+    # The query over its full time range.
+    builder: QueryBuilder
+    # Builds the same query for different ``start`` and ``end`` params.
+    build: Callable[[ParamsType], QueryBuilder]
+    # A JSON serializable description of everything besides the params that
+    # the result of the query depends on, such as its columns and conditions.
+    key: Any
+
+
+@dataclass
+class _Plan:
+    query: TimeseriesQuery
+    cache_key: Optional[str] = None
+    # The first bucket that is completely within the time range of the query.
+    first_bucket: int = 0
+    # Buckets before this timestamp are settled and can be cached.
+    settled_end: int = 0
+    # Rows are read from the cache until, and queried from this timestamp.
+    fetch_from: int = 0
+    cached_rows: Sequence[Mapping[str, Any]] = ()
+    cached_meta: Optional[Sequence[Mapping[str, Any]]] = None
+    # Indexes of the partial leading bucket, the remaining time range, and the
+    # full time range within the batch of queries sent to Snuba.
+    head_index: Optional[int] = None
+    tail_index: Optional[int] = None
+    full_index: Optional[int] = None
+
+
+def _timestamp(value: datetime) -> int:
+    return int(to_naive_timestamp(naiveify_datetime(value)))
+
+
+def _datetime(timestamp: int) -> datetime:
+    return datetime.utcfromtimestamp(timestamp).replace(tzinfo=pytz.utc)
+
+
+def _row_time(row: Mapping[str, Any]) -> int:
+    value = row["time"]
+    if isinstance(value, str):
+        return int(to_timestamp(parse_datetime(value)))
+    return int(value)
+
+
+def _normalize_params(params: ParamsType) -> Dict[str, Any]:
+    normalized: Dict[str, Any] = {}
+    for key, value in params.items():
+        if key in ("start", "end"):
+            continue
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(str(item) for item in value)
+        elif value is not None and not isinstance(value, (str, int, float, bool)):
+            value = str(value)
+        normalized[key] = value
+    return normalized
+
+
+def _get_cache_key(query: TimeseriesQuery, rollup: int) -> str:
+    hashable = json.dumps(
+        [CACHE_VERSION, query.key, _normalize_params(query.builder.params), rollup],
+        sort_keys=True,
+    )
+    return f"tsc:{md5(hashable.encode('utf-8')).hexdigest()}:{rollup}"
+
+
+def _plan(query: TimeseriesQuery, rollup: int, now: float) -> _Plan:
+    # Splitting the time range would change the result of these queries
+    if query.builder.depends_on_time_range:
+        return _Plan(query)
+
+    start = _timestamp(query.builder.params["start"])
+    end = _timestamp(query.builder.params["end"])
+
+    first_bucket = -(-start // rollup) * rollup
+    settle = options.get("snuba.timeseries-cache.settle-seconds")
+    settled_end = min(
+        int(now - settle) // rollup * rollup,
+        end // rollup * rollup,
+    )
+    if settled_end <= first_bucket:
+        return _Plan(query)
+
+    cache_key = _get_cache_key(query, rollup)
+    buckets = range(first_bucket, settled_end, rollup)
+    meta_key = f"{cache_key}:meta"
+    cached = cache.get_many([meta_key] + [f"{cache_key}:{bucket}" for bucket in buckets])
+
+    plan = _Plan(
+        query,
+        cache_key=cache_key,
+        first_bucket=first_bucket,
+        settled_end=settled_end,
+        fetch_from=first_bucket,
+        cached_meta=cached.get(meta_key),
+    )
+    if plan.cached_meta is None:
+        return plan
+
+    cached_rows: List[Mapping[str, Any]] = []
+    for bucket in buckets:
+        rows = cached.get(f"{cache_key}:{bucket}")
+        if rows is None:
+            break
+        cached_rows.extend(rows)
+        plan.fetch_from = bucket + rollup
+
+    plan.cached_rows = cached_rows
+    return plan
+
+
+def _store(plan: _Plan, rows: Sequence[Mapping[str, Any]], meta: Any, rollup: int) -> None:
+    rows_by_bucket: MutableMapping[int, List[Mapping[str, Any]]] = {
+        bucket: [] for bucket in range(plan.fetch_from, plan.settled_end, rollup)
+    }
+    for row in rows:
+        bucket = _row_time(row)
+        if bucket in rows_by_bucket:
+            rows_by_bucket[bucket].append(row)
+
+    if not rows_by_bucket:
+        return
+
+    values: Dict[str, Any] = {
+        f"{plan.cache_key}:{bucket}": bucket_rows for bucket, bucket_rows in rows_by_bucket.items()
+    }
+    values[f"{plan.cache_key}:meta"] = meta
+    cache.set_many(values, options.get("snuba.timeseries-cache.ttl"))
+
+
+def bulk_timeseries_query(
+    queries: Sequence[TimeseriesQuery], rollup: int, referrer: Optional[str] = None
+) -> List[Mapping[str, Any]]:
+    """
+    Runs a batch of timeseries queries like ``bulk_snql_query``, reusing
+    completed buckets from previous runs of the same queries. The rows of
+    every result are ordered by time but not zerofilled.
+    """
+    if not options.get("snuba.timeseries-cache.enabled"):
+        return bulk_snql_query([query.builder.get_snql_query() for query in queries], referrer)
+
+    now = time.time()
+    plans = [_plan(query, rollup, now) for query in queries]
+
+    requests = []
+    for plan in plans:
+        params = plan.query.builder.params
+        start = _timestamp(params["start"])
+        end = _timestamp(params["end"])
+
+        if plan.fetch_from == plan.first_bucket:
+            plan.full_index = len(requests)
+            requests.append(plan.query.builder.get_snql_query())
+            continue
+
+        if start < plan.first_bucket:
+            plan.head_index = len(requests)
+            head_params = dict(params, end=_datetime(plan.first_bucket))
+            requests.append(plan.query.build(head_params).get_snql_query())
+
+        if plan.fetch_from < end:
+            plan.tail_index = len(requests)
+            tail_params = dict(params, start=_datetime(plan.fetch_from))
+            requests.append(plan.query.build(tail_params).get_snql_query())
+
+    results = bulk_snql_query(requests, referrer) if requests else []
+
+    rv = []
+    for plan in plans:
+        tags = {"referrer": referrer or "unknown"}
+        if plan.full_index is not None:
+            result = results[plan.full_index]
+            if plan.cache_key is not None:
+                metrics.incr("snuba.timeseries_cache.miss", tags=tags)
+                _store(plan, result["data"], result["meta"], rollup)
+            rv.append(result)
+            continue
+
+        metrics.incr("snuba.timeseries_cache.hit", tags=tags)
+        metrics.incr(
+            "snuba.timeseries_cache.cached_buckets",
+            amount=(plan.fetch_from - plan.first_bucket) // rollup,
+            tags=tags,
+        )
+
+        head: Mapping[str, Any] = {"data": []}
+        if plan.head_index is not None:
+            head = results[plan.head_index]
+
+        tail: Mapping[str, Any] = {"data": [], "meta": plan.cached_meta}
+        if plan.tail_index is not None:
+            tail = results[plan.tail_index]
+            _store(plan, tail["data"], tail["meta"], rollup)
+
+        data: List[Tuple[int, Mapping[str, Any]]] = [
+            (_row_time(row), row) for row in (*head["data"], *plan.cached_rows, *tail["data"])
+        ]
+        data.sort(key=lambda item: item[0])
+        rv.append({"data": [row for _, row in data], "meta": tail["meta"]})
+
+    return rv
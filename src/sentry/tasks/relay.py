@@ -2,6 +2,7 @@ import logging
 import time
 
 import sentry_sdk
+from celery.exceptions import SoftTimeLimitExceeded
 
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
@@ -87,6 +88,76 @@ def schedule_build_project_config(public_key):
     )
 
 
+#: The maximum number of public keys computed by a single :func:`build_project_configs` task.
+#: The batch has to fit into the same time limits as a single :func:`build_project_config`
+#: task, which cannot be raised because they match the debounce TTL.  Batches share the
+#: database queries, but each config is still built separately.
+BUILD_PROJECT_CONFIGS_BATCH_SIZE = 10
+
+
+# The time_limit here should match the `debounce_ttl` of the projectconfig_debounce_cache
+# service.
+@instrumented_task(
+    name="sentry.tasks.relay.build_project_configs",
+    queue="relay_config",
+    soft_time_limit=5,
+    time_limit=10,  # Extra 5 seconds to remove the debounce keys.
+    expires=30,  # Relay stops waiting for this anyway.
+)
+def build_project_configs(public_keys=None, **kwargs):
+    """Build the project configs of several public keys and put them in the Redis cache.
+
+    This is the batched version of :func:`build_project_config`: all keys are computed
+    with a single pass over the database and written with a single cache write.  It is
+    deduplicated the same way and thus should only be invoked using
+    :func:`schedule_build_project_configs`.
+    """
+    public_keys = list(public_keys or ())
+    try:
+        projectconfig_cache.set_many(compute_projectkey_configs(public_keys))
+    finally:
+        # See `build_project_config` for why this happens in a `finally` block.
+        for public_key in public_keys:
+            projectconfig_debounce_cache.mark_task_done(
+                organization_id=None, project_id=None, public_key=public_key
+            )
+
+
+def schedule_build_project_configs(public_keys):
+    """Schedule the `build_project_configs` task with debouncing applied.
+
+    Keys which already have a task in the queue are skipped, the remaining keys are
+    split into batches of at most :data:`BUILD_PROJECT_CONFIGS_BATCH_SIZE` keys.
+    """
+    tmp_scheduled = time.time()
+    pending = []
+    for public_key in public_keys:
+        if projectconfig_debounce_cache.is_debounced(
+            public_key=public_key, project_id=None, organization_id=None
+        ):
+            metrics.incr(
+                "relay.projectconfig_cache.skipped",
+                tags={"reason": "debounce", "task": "build"},
+            )
+        else:
+            pending.append(public_key)
+
+    for i in range(0, len(pending), BUILD_PROJECT_CONFIGS_BATCH_SIZE):
+        batch = pending[i : i + BUILD_PROJECT_CONFIGS_BATCH_SIZE]
+        metrics.incr(
+            "relay.projectconfig_cache.scheduled",
+            amount=len(batch),
+            tags={"task": "build"},
+        )
+        build_project_configs.delay(public_keys=batch, tmp_scheduled=tmp_scheduled)
+
+        # Only debounce after scheduling, see `schedule_build_project_config`.
+        for public_key in batch:
+            projectconfig_debounce_cache.debounce(
+                public_key=public_key, project_id=None, organization_id=None
+            )
+
+
 def validate_args(organization_id=None, project_id=None, public_key=None):
     """Validates arguments for the tasks and sets sentry scope.
 
@@ -187,6 +258,61 @@ def compute_projectkey_config(key):
         return get_project_config(key.project, project_keys=[key], full_config=True).to_dict()
 
 
+def compute_projectkey_configs(public_keys):
+    """Computes the configs of many public keys at once.
+
+    Keys are fetched with a single query, projects and organizations with a single cache
+    lookup each, and the options of all projects and organizations, which the quotas are
+    derived from as well, with a single cache lookup and query each.
+
+    :returns: A dict mapping every given public key to its config, keys which do not exist
+       are mapped to a disabled config.  Keys whose config fails to compute are left out,
+       so that they are computed again on the next request.
+    """
+    from sentry.models import OrganizationOption, Project, ProjectKey, ProjectOption
+
+    configs = {public_key: {"disabled": True} for public_key in public_keys}
+    if not configs:
+        return configs
+
+    keys = list(ProjectKey.objects.filter(public_key__in=configs))
+    projects = {
+        project.id: project
+        for project in Project.objects.get_many_from_cache({key.project_id for key in keys})
+    }
+    organizations = {
+        organization.id: organization
+        for organization in Organization.objects.get_many_from_cache(
+            {project.organization_id for project in projects.values()}
+        )
+    }
+
+    OrganizationOption.objects.get_all_values_many(organizations)
+    ProjectOption.objects.get_all_values_many(projects)
+
+    for project in projects.values():
+        organization = organizations.get(project.organization_id)
+        if organization is not None:
+            project.set_cached_field_value("organization", organization)
+
+    for key in keys:
+        project = projects.get(key.project_id)
+        if project is None:
+            continue
+        key.set_cached_field_value("project", project)
+        try:
+            configs[key.public_key] = compute_projectkey_config(key)
+        except SoftTimeLimitExceeded:
+            raise
+        except Exception:
+            logger.exception(
+                "Failed to compute project config", extra={"public_key": key.public_key}
+            )
+            del configs[key.public_key]
+
+    return configs
+
+
 @instrumented_task(
     name="sentry.tasks.relay.invalidate_project_config",
     queue="relay_config_bulk",
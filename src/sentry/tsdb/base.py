@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 from collections.abc import Callable
 from datetime import timedelta
 from enum import Enum
@@ -126,6 +126,7 @@ class BaseTSDB(Service):
             "record_frequency_multi",
             "merge_frequencies",
             "delete_frequencies",
+            "write_batch",
             "flush",
         ]
     )
@@ -486,6 +487,42 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def write_batch(self, incrs=(), records=(), frequencies=()):
+        """
+        Apply the counter, distinct counter and frequency table writes of many
+        events at once. Every write carries its own timestamp and environment:
+
+        >>> write_batch(
+        ...     incrs=[(TimeSeriesModel.project, 1, timestamp, environment_id)],
+        ...     records=[(TimeSeriesModel.users_affected_by_project, 1, values,
+        ...               timestamp, environment_id)],
+        ...     frequencies=[(TimeSeriesModel.frequent_environments_by_group,
+        ...                   {5: {environment_id: 1}}, timestamp, None)],
+        ... )
+
+        Every counter increment counts one. Backends may coalesce writes to
+        the same keys and send them in fewer roundtrips.
+        """
+        incr_batches = defaultdict(list)
+        for model, key, timestamp, environment_id in incrs:
+            incr_batches[(timestamp, environment_id)].append((model, key))
+        for (timestamp, environment_id), items in incr_batches.items():
+            self.incr_multi(items, timestamp=timestamp, environment_id=environment_id)
+
+        record_batches = defaultdict(list)
+        for model, key, values, timestamp, environment_id in records:
+            record_batches[(timestamp, environment_id)].append((model, key, values))
+        for (timestamp, environment_id), items in record_batches.items():
+            self.record_multi(items, timestamp=timestamp, environment_id=environment_id)
+
+        frequency_batches = defaultdict(list)
+        for model, request, timestamp, environment_id in frequencies:
+            frequency_batches[(timestamp, environment_id)].append((model, request))
+        for (timestamp, environment_id), requests in frequency_batches.items():
+            self.record_frequency_multi(
+                requests, timestamp=timestamp, environment_id=environment_id
+            )
+
     def get_most_frequent(
         self, model, keys, start, end=None, rollup=None, limit=None, environment_id=None
     ):
@@ -679,40 +679,11 @@ class RedisTSDB(BaseTSDB):
         if timestamp is None:
             timestamp = timezone.now()
 
-        ts = int(to_timestamp(timestamp))  # ``timestamp`` is not actually a timestamp :(
-
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
             commands = {}
 
             for model, request in requests:
-                for key, items in request.items():
-                    keys = []
-                    expirations = {}
-
-                    # Figure out all of the keys we need to be incrementing, as
-                    # well as their expiration policies.
-                    for rollup, max_values in self.rollups.items():
-                        chunk = []
-                        for environment_id in environment_ids:
-                            chunk = self.make_frequency_table_keys(
-                                model, rollup, ts, key, environment_id
-                            )
-                            keys.extend(chunk)
-
-                        expiry = self.calculate_expiry(rollup, max_values, timestamp)
-                        for k in chunk:
-                            expirations[k] = expiry
-
-                    arguments = ["INCR"] + list(self.DEFAULT_SKETCH_PARAMETERS)
-                    for member, score in items.items():
-                        arguments.extend((score, member))
-
-                    # Since we're essentially merging dictionaries, we need to
-                    # append this to any value that already exists at the key.
-                    cmds = commands.setdefault(key, [])
-                    cmds.append((CountMinScript, keys, arguments))
-                    for k, t in expirations.items():
-                        cmds.append(("EXPIREAT", k, t))
+                self._add_frequency_commands(commands, model, request, timestamp, environment_ids)
 
             try:
                 cluster.execute_commands(commands)
@@ -720,6 +691,116 @@ class RedisTSDB(BaseTSDB):
                 if durable:
                     raise
 
+    def _add_frequency_commands(self, commands, model, request, timestamp, environment_ids):
+        ts = int(to_timestamp(timestamp))  # ``timestamp`` is not actually a timestamp :(
+
+        for key, items in request.items():
+            keys = []
+            expirations = {}
+
+            # Figure out all of the keys we need to be incrementing, as
+            # well as their expiration policies.
+            for rollup, max_values in self.rollups.items():
+                chunk = []
+                for environment_id in environment_ids:
+                    chunk = self.make_frequency_table_keys(model, rollup, ts, key, environment_id)
+                    keys.extend(chunk)
+
+                expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                for k in chunk:
+                    expirations[k] = expiry
+
+            arguments = ["INCR"] + list(self.DEFAULT_SKETCH_PARAMETERS)
+            for member, score in items.items():
+                arguments.extend((score, member))
+
+            # Since we're essentially merging dictionaries, we need to
+            # append this to any value that already exists at the key.
+            cmds = commands.setdefault(key, [])
+            cmds.append((CountMinScript, keys, arguments))
+            for k, t in expirations.items():
+                cmds.append(("EXPIREAT", k, t))
+
+    def write_batch(self, incrs=(), records=(), frequencies=()):
+        """
+        Apply the counter, distinct counter and frequency table writes of many
+        events at once.
+
+        Counter increments and distinct counter values that end up in the same
+        Redis key are merged. All counter and distinct counter commands are
+        sent in a single pipeline per host, followed by a single batch of
+        frequency table scripts if frequency sketches are enabled.
+        """
+        for item in itertools.chain(incrs, records, frequencies):
+            self.validate_arguments([item[0]], [item[-1]])
+
+        environment_ids = {None}
+        environment_ids.update(item[-1] for item in itertools.chain(incrs, records, frequencies))
+        for (cluster, durable), cluster_environment_ids in self.get_cluster_groups(environment_ids):
+            cluster_environment_ids = set(cluster_environment_ids)
+
+            # (hash_key, hash_field) -> count
+            counter_operations = defaultdict(int)
+            # hash_key -> max expiration encountered
+            counter_expiries = defaultdict(float)
+            for model, key, timestamp, environment_id in incrs:
+                for rollup, max_values in self.rollups.items():
+                    expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                    for env_id in {None, environment_id} & cluster_environment_ids:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, timestamp, key, env_id
+                        )
+                        counter_expiries[hash_key] = max(counter_expiries[hash_key], expiry)
+                        counter_operations[(hash_key, hash_field)] += 1
+
+            # Distinct counters are placed on the host of their model key, see
+            # ``record_multi``.
+            # model key -> key -> values
+            distinct_values = defaultdict(lambda: defaultdict(set))
+            # key -> max expiration encountered
+            distinct_expiries = defaultdict(float)
+            for model, key, values, timestamp, environment_id in records:
+                ts = int(to_timestamp(timestamp))
+                for rollup, max_values in self.rollups.items():
+                    expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                    for env_id in {None, environment_id} & cluster_environment_ids:
+                        k = self.make_key(model, rollup, ts, key, env_id)
+                        distinct_values[key][k].update(values)
+                        distinct_expiries[k] = max(distinct_expiries[k], expiry)
+
+            manager = cluster.fanout()
+            if not durable:
+                manager = SuppressionWrapper(manager)
+
+            with manager as client:
+                for (hash_key, hash_field), count in counter_operations.items():
+                    c = client.target_key(hash_key)
+                    c.hincrby(hash_key, hash_field, count)
+                    if hash_key in counter_expiries:
+                        c.expireat(hash_key, counter_expiries.pop(hash_key))
+
+                for key, values_by_key in distinct_values.items():
+                    c = client.target_key(key)
+                    for k, values in values_by_key.items():
+                        c.pfadd(k, *values)
+                        c.expireat(k, distinct_expiries[k])
+
+            if not self.enable_frequency_sketches:
+                continue
+
+            commands = {}
+            for model, request, timestamp, environment_id in frequencies:
+                env_ids = {None, environment_id} & cluster_environment_ids
+                if env_ids:
+                    self._add_frequency_commands(commands, model, request, timestamp, env_ids)
+
+            if commands:
+                try:
+                    cluster.execute_commands(commands)
+                except Exception:
+                    if durable:
+                        raise
+
     def get_most_frequent(
         self, model, keys, start, end=None, rollup=None, limit=None, environment_id=None
     ):
@@ -29,3 +29,28 @@ class LockBackend:
         Check if a lock has been taken.
         """
         raise NotImplementedError
+
+    def acquire_many(self, keys, duration):
+        """
+        Acquire the locks for all of the given keys for the given duration (in
+        seconds), attempting each lock once. Backends may override this to
+        acquire the locks in fewer round trips than calling ``acquire`` for
+        every key.
+
+        Returns a mapping from key to ``True`` if the lock was acquired or
+        ``False`` if it is held by someone else. Keys whose lock could not be
+        acquired because of an error are left out.
+        """
+        results = {}
+        for key in keys:
+            try:
+                self.acquire(key, duration)
+            except Exception:
+                try:
+                    if self.locked(key):
+                        results[key] = False
+                except Exception:
+                    pass
+            else:
+                results[key] = True
+        return results
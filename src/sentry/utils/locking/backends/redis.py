@@ -1,6 +1,8 @@
-from typing import Optional
+from typing import Dict, Optional, Sequence
 from uuid import uuid4
 
+import rb
+
 from sentry.utils import redis
 from sentry.utils.locking.backends import LockBackend
 
@@ -51,6 +53,21 @@ class RedisLockBackend(LockBackend):
         if client.set(full_key, self.uuid, ex=duration, nx=True) is not True:
             raise Exception(f"Could not set key: {full_key!r}")
 
+    def acquire_many(self, keys: Sequence[str], duration: int) -> Dict[str, bool]:
+        if not isinstance(self.cluster, rb.Cluster):
+            return super().acquire_many(keys, duration)
+
+        # One round trip per host instead of one per key
+        with self.cluster.map() as client:
+            promises = {
+                key: client.set(self.prefix_key(key), self.uuid, ex=duration, nx=True)
+                for key in keys
+            }
+
+        return {
+            key: promise.value is True for key, promise in promises.items() if promise.is_resolved
+        }
+
     def release(self, key, routing_key=None):
         client = self.get_client(key, routing_key)
         delete_lock(client, (self.prefix_key(key),), (self.uuid,))
@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Callable,
+    Generic,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from sentry.utils import metrics
+
+K = TypeVar("K")
+V = TypeVar("V")
+T = TypeVar("T")
+
+_missing = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe, size bounded in-process cache with least recently used
+    eviction and an optional time to live per entry.
+
+    This is meant as a small local tier in front of a shared cache (Redis,
+    memcached) for values that are read far more often than they change. Values
+    are stored by reference, callers must not mutate them.
+
+    If ``metrics_key`` is given, hits, misses and evictions are reported as
+    ``{metrics_key}.hit``, ``{metrics_key}.miss`` and ``{metrics_key}.evict``.
+
+    If ``weigher`` is given, ``maxsize`` bounds the sum of ``weigher(value)``
+    over all entries instead of the number of entries. This allows to put a
+    memory budget on caches of differently sized values. A single value that
+    weighs more than ``maxsize`` is not stored at all.
+
+    >>> cache = LRUCache(maxsize=1000, ttl=5)
+    >>> cache.set("key", "value")
+    >>> cache.get("key")
+    'value'
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        metrics_key: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic,
+        weigher: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        assert maxsize > 0
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.metrics_key = metrics_key
+        self.__clock = clock
+        self.__weigher = weigher
+        self.__data: "OrderedDict[K, Tuple[Optional[float], V, int]]" = OrderedDict()
+        self.__weight = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__data)
+
+    @property
+    def weight(self) -> int:
+        """
+        The total weight of all entries, or their number without ``weigher``.
+        """
+        return self.__weight
+
+    def __contains__(self, key: K) -> bool:
+        return self.__lookup(key, self.__clock()) is not _missing
+
+    def __lookup(self, key: K, now: float) -> Union[V, object]:
+        # Must be called with the lock held or as a read-only check.
+        item = self.__data.get(key)
+        if item is None:
+            return _missing
+
+        expires_at, value, _ = item
+        if expires_at is not None and expires_at <= now:
+            return _missing
+        return value
+
+    def __record(self, name: str, amount: int = 1) -> None:
+        if self.metrics_key is not None and amount:
+            metrics.incr(f"{self.metrics_key}.{name}", amount=amount)
+
+    def get(self, key: K, default: Optional[T] = None) -> Union[V, Optional[T]]:
+        now = self.__clock()
+        with self.__lock:
+            value = self.__lookup(key, now)
+            if value is _missing:
+                self.__pop(key)
+            else:
+                self.__data.move_to_end(key)
+
+        if value is _missing:
+            self.__record("miss")
+            return default
+
+        self.__record("hit")
+        return value  # type: ignore[return-value]
+
+    def get_many(self, keys: Iterable[K]) -> MutableMapping[K, V]:
+        """
+        Returns a mapping of all keys that are present in the cache.
+        """
+        now = self.__clock()
+        rv: MutableMapping[K, V] = {}
+        misses = 0
+        with self.__lock:
+            for key in keys:
+                value = self.__lookup(key, now)
+                if value is _missing:
+                    self.__pop(key)
+                    misses += 1
+                else:
+                    self.__data.move_to_end(key)
+                    rv[key] = value  # type: ignore[assignment]
+
+        self.__record("hit", len(rv))
+        self.__record("miss", misses)
+        return rv
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        self.set_many({key: value}, ttl=ttl)
+
+    def set_many(self, items: Mapping[K, V], ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = self.__clock() + ttl if ttl is not None else None
+
+        evicted = 0
+        with self.__lock:
+            for key, value in items.items():
+                weight = self.__weigher(value) if self.__weigher is not None else 1
+                self.__pop(key)
+                if weight > self.maxsize:
+                    evicted += 1
+                    continue
+                self.__data[key] = (expires_at, value, weight)
+                self.__weight += weight
+
+            while self.__weight > self.maxsize:
+                _, (_, _, weight) = self.__data.popitem(last=False)
+                self.__weight -= weight
+                evicted += 1
+
+        self.__record("evict", evicted)
+
+    def __pop(self, key: K) -> None:
+        # Must be called with the lock held.
+        item = self.__data.pop(key, None)
+        if item is not None:
+            self.__weight -= item[2]
+
+    def delete(self, key: K) -> None:
+        with self.__lock:
+            self.__pop(key)
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__pop(key)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__data.clear()
+            self.__weight = 0
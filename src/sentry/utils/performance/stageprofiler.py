@@ -0,0 +1,206 @@
+"""
+A sampled profiler that breaks an operation made of several stages down into
+the wall time, the number of database queries and the number of Redis
+commands spent in every stage.
+
+A profile is started with :func:`profile` and is bound to the current thread
+until it ends. Code that is part of the operation marks its stages with
+:func:`stage`, either as a decorator or as a context manager::
+
+    @stageprofiler.stage("pull_out_data")
+    def _pull_out_data(jobs, projects):
+        ...
+
+    with stageprofiler.profile("event_manager.save", sample_rate=0.01):
+        _pull_out_data(jobs, projects)
+
+Stages that run while no profile is active (because the operation was not
+sampled) only pay for a thread-local lookup. When a profile ends, every stage
+is emitted as a set of metrics tagged with the stage name and the profile's
+tags and, if a directory is given, the full breakdown is written there as a
+JSON file.
+"""
+
+import functools
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from sentry.debug.utils.patch_context import PatchContext
+from sentry.utils import json, metrics
+
+logger = logging.getLogger(__name__)
+
+_state = threading.local()
+
+_redis_patch_lock = threading.Lock()
+_redis_patch = None
+
+
+class StageProfile:
+    def __init__(self, name, tags=None, extra=None):
+        self.name = name
+        self.tags = dict(tags or {})
+        self.extra = dict(extra or {})
+        self.stages = []
+        self.db_queries = 0
+        self.redis_commands = 0
+        self.start_time = time.time()
+        self.duration = None
+
+    def record_db_query(self, execute, sql, params, many, context):
+        self.db_queries += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def stage(self, name):
+        db_queries = self.db_queries
+        redis_commands = self.redis_commands
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append(
+                {
+                    "stage": name,
+                    "duration": time.perf_counter() - start,
+                    "db_queries": self.db_queries - db_queries,
+                    "redis_commands": self.redis_commands - redis_commands,
+                }
+            )
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "tags": self.tags,
+            "extra": self.extra,
+            "timestamp": self.start_time,
+            "duration": self.duration,
+            "db_queries": self.db_queries,
+            "redis_commands": self.redis_commands,
+            "stages": self.stages,
+        }
+
+    def record_metrics(self):
+        for stage in self.stages:
+            tags = dict(self.tags, stage=stage["stage"])
+            metrics.timing(f"{self.name}.stage.duration", stage["duration"], tags=tags)
+            metrics.timing(f"{self.name}.stage.db_queries", stage["db_queries"], tags=tags)
+            metrics.timing(f"{self.name}.stage.redis_commands", stage["redis_commands"], tags=tags)
+
+    def dump(self, directory):
+        path = os.path.join(directory, f"{self.name}-{uuid.uuid4().hex}.json")
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f)
+        return path
+
+
+def get_active_profile():
+    return getattr(_state, "profile", None)
+
+
+def _count_redis_command(func, *args, **kwargs):
+    profile = get_active_profile()
+    if profile is not None:
+        profile.redis_commands += 1
+    return func(*args, **kwargs)
+
+
+def _install_redis_hook():
+    """
+    Counts Redis commands by hooking into how redis-py serializes them, which
+    covers single commands as well as pipelines and every client built on top
+    of redis-py (rb, redis-py-cluster).
+
+    The hook stays installed once a profile has been sampled, threads without
+    an active profile only pay for the lookup of the thread-local.
+    """
+    global _redis_patch
+
+    if _redis_patch is not None:
+        return
+
+    with _redis_patch_lock:
+        if _redis_patch is None:
+            patch = PatchContext("redis.connection.Connection.pack_command", _count_redis_command)
+            patch.patch()
+            _redis_patch = patch
+
+
+@contextmanager
+def profile(name, sample_rate, tags=None, extra=None, dump_dir=None):
+    """
+    Starts a profile for the current thread with a probability of
+    ``sample_rate`` and yields it, or yields ``None`` if the operation was not
+    sampled or a profile is already active.
+
+    ``tags`` are attached to the emitted metrics, ``extra`` is only written
+    to the JSON dump in ``dump_dir``.
+    """
+    if get_active_profile() is not None or not sample_rate or random.random() >= sample_rate:
+        yield None
+        return
+
+    try:
+        _install_redis_hook()
+    except Exception:
+        logger.exception("stageprofiler.redis_hook.failed")
+
+    current = StageProfile(name, tags=tags, extra=extra)
+    start = time.perf_counter()
+
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(current.record_db_query))
+
+            _state.profile = current
+            try:
+                yield current
+            finally:
+                _state.profile = None
+                current.duration = time.perf_counter() - start
+    finally:
+        current.record_metrics()
+
+        if dump_dir:
+            try:
+                current.dump(dump_dir)
+            except OSError:
+                logger.exception("stageprofiler.dump.failed", extra={"dump_dir": dump_dir})
+
+
+class stage:
+    """
+    Marks a stage of the active profile, usable as a context manager and as
+    a decorator. Does nothing if no profile is active.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._context = None
+
+    def __enter__(self):
+        current = get_active_profile()
+        if current is not None:
+            self._context = current.stage(self.name)
+            self._context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        context, self._context = self._context, None
+        if context is not None:
+            context.__exit__(exc_type, exc_value, tb)
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        def inner(*args, **kwargs):
+            with stage(self.name):
+                return func(*args, **kwargs)
+
+        return inner
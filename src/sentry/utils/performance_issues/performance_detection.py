@@ -176,7 +176,7 @@ def _detect_performance_problems(data: Event, sdk_span: Any) -> List[Performance
     # Create performance issues for N+1 DB queries first
     used_perf_issue_detectors = {DetectorType.N_PLUS_ONE_DB_QUERIES}
 
-    for span in spans:
+    for span in build_span_table(spans):
         for _, detector in detectors.items():
             detector.visit_span(span)
     for _, detector in detectors.items():
@@ -269,6 +269,59 @@ def get_span_duration(span: Span):
     )
 
 
+_MISSING = object()
+
+
+class IndexedSpan:
+    """
+    A span of the transaction with the values needed by the detectors extracted,
+    so that they are computed once per span rather than once per detector
+    visiting it. Derived values are computed on first use. The original span is
+    available as `data`.
+    """
+
+    __slots__ = (
+        "data",
+        "span_id",
+        "parent_span_id",
+        "op",
+        "hash",
+        "start_timestamp",
+        "timestamp",
+        "_duration",
+        "_fingerprint",
+    )
+
+    def __init__(self, data: Span):
+        self.data = data
+        self.span_id = data.get("span_id", None)
+        self.parent_span_id = data.get("parent_span_id", None)
+        self.op = data.get("op", None)
+        self.hash = data.get("hash", None)
+        self.start_timestamp = data.get("start_timestamp", 0)
+        self.timestamp = data.get("timestamp", 0)
+        self._duration = None
+        self._fingerprint = _MISSING
+
+    @property
+    def duration(self) -> timedelta:
+        if self._duration is None:
+            self._duration = get_span_duration(self.data)
+        return self._duration
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        # Hashing the description is comparatively expensive and only needed
+        # for spans matching some detector's settings, so do it lazily.
+        if self._fingerprint is _MISSING:
+            self._fingerprint = fingerprint_span(self.data)
+        return self._fingerprint
+
+
+def build_span_table(spans: TransactionSpans) -> List[IndexedSpan]:
+    return [IndexedSpan(span) for span in spans]
+
+
 class PerformanceDetector(ABC):
     """
     Classes of this type have their visit functions called as the event is walked once and will store a performance issue if one is detected.
@@ -277,6 +330,7 @@ class PerformanceDetector(ABC):
     def __init__(self, settings: Dict[str, Any], event: Event):
         self.settings = settings[self.settings_key]
         self._event = event
+        self._settings_by_op = {}
         self.init()
 
     @abstractmethod
@@ -289,18 +343,27 @@ class PerformanceDetector(ABC):
             return True
         return next((op for op in allowed_span_ops if span_op.startswith(op)), False)
 
-    def settings_for_span(self, span: Span):
-        op = span.get("op", None)
-        span_id = span.get("span_id", None)
+    def settings_for_span(self, span: IndexedSpan):
+        op = span.op
+        span_id = span.span_id
         if not op or not span_id:
             return None
 
-        span_duration = get_span_duration(span)
-        for setting in self.settings:
-            op_prefix = self.find_span_prefix(setting, op)
-            if op_prefix:
-                return op, span_id, op_prefix, span_duration, setting
-        return None
+        # Transactions usually only contain a handful of distinct span ops, so
+        # remember which setting applies to each of them.
+        if op not in self._settings_by_op:
+            self._settings_by_op[op] = None
+            for setting in self.settings:
+                op_prefix = self.find_span_prefix(setting, op)
+                if op_prefix:
+                    self._settings_by_op[op] = op_prefix, setting
+                    break
+
+        op_settings = self._settings_by_op[op]
+        if op_settings is None:
+            return None
+        op_prefix, setting = op_settings
+        return op, span_id, op_prefix, span.duration, setting
 
     def event(self) -> Event:
         return self._event
@@ -311,7 +374,7 @@ class PerformanceDetector(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def visit_span(self, span: Span) -> None:
+    def visit_span(self, span: IndexedSpan) -> None:
         raise NotImplementedError
 
     def on_complete(self) -> None:
@@ -337,7 +400,7 @@ class DuplicateSpanDetector(PerformanceDetector):
         self.duplicate_spans_involved = {}
         self.stored_problems = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
@@ -345,7 +408,7 @@ class DuplicateSpanDetector(PerformanceDetector):
         duplicate_count_threshold = settings.get("count")
         duplicate_duration_threshold = settings.get("cumulative_duration")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = span.fingerprint
         if not fingerprint:
             return
 
@@ -384,7 +447,7 @@ class DuplicateSpanHashDetector(PerformanceDetector):
         self.duplicate_spans_involved = {}
         self.stored_problems = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
@@ -392,7 +455,7 @@ class DuplicateSpanHashDetector(PerformanceDetector):
         duplicate_count_threshold = settings.get("count")
         duplicate_duration_threshold = settings.get("cumulative_duration")
 
-        hash = span.get("hash", None)
+        hash = span.hash
         if not hash:
             return
 
@@ -428,14 +491,14 @@ class SlowSpanDetector(PerformanceDetector):
     def init(self):
         self.stored_problems = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("duration_threshold")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = span.fingerprint
 
         if not fingerprint:
             return
@@ -465,7 +528,7 @@ class SequentialSlowSpanDetector(PerformanceDetector):
         self.spans_involved = {}
         self.last_span_seen = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
@@ -473,11 +536,11 @@ class SequentialSlowSpanDetector(PerformanceDetector):
         duration_threshold = settings.get("cumulative_duration")
         count_threshold = settings.get("count")
 
-        fingerprint = fingerprint_span_op(span)
+        fingerprint = fingerprint_span_op(span.data)
         if not fingerprint:
             return
 
-        span_end = timedelta(seconds=span.get("timestamp", 0))
+        span_end = timedelta(seconds=span.timestamp)
 
         if fingerprint not in self.spans_involved:
             self.spans_involved[fingerprint] = []
@@ -490,7 +553,7 @@ class SequentialSlowSpanDetector(PerformanceDetector):
             return
 
         last_span_end = self.last_span_seen[fingerprint]
-        current_span_start = timedelta(seconds=span.get("start_timestamp", 0))
+        current_span_start = timedelta(seconds=span.start_timestamp)
 
         are_spans_overlapping = current_span_start <= last_span_end
         if are_spans_overlapping:
@@ -528,18 +591,17 @@ class LongTaskSpanDetector(PerformanceDetector):
         self.spans_involved = []
         self.stored_problems = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
         op, span_id, op_prefix, span_duration, settings = settings_for_span
         duration_threshold = settings.get("cumulative_duration")
 
-        fingerprint = fingerprint_span(span)
+        fingerprint = span.fingerprint
         if not fingerprint:
             return
 
-        span_duration = get_span_duration(span)
         self.cumulative_duration += span_duration
         self.spans_involved.append(span_id)
 
@@ -574,36 +636,36 @@ class RenderBlockingAssetSpanDetector(PerformanceDetector):
             if fcp >= fcp_minimum_threshold and fcp < fcp_maximum_threshold:
                 self.fcp = fcp
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         if not self.fcp:
             return
 
-        op = span.get("op", None)
+        op = span.op
         allowed_span_ops = self.settings.get("allowed_span_ops")
         if op not in allowed_span_ops:
             return False
 
         if self._is_blocking_render(span):
-            span_id = span.get("span_id", None)
-            fingerprint = fingerprint_span(span)
+            span_id = span.span_id
+            fingerprint = span.fingerprint
             if span_id and fingerprint:
                 self.stored_problems[fingerprint] = PerformanceSpanProblem(span_id, op, [span_id])
 
         # If we visit a span that starts after FCP, then we know we've already
         # seen all possible render-blocking resource spans.
-        span_start_timestamp = timedelta(seconds=span.get("start_timestamp", 0))
+        span_start_timestamp = timedelta(seconds=span.start_timestamp)
         fcp_timestamp = self.transaction_start + self.fcp
         if span_start_timestamp >= fcp_timestamp:
             # Early return for all future span visits.
             self.fcp = None
 
-    def _is_blocking_render(self, span):
-        span_end_timestamp = timedelta(seconds=span.get("timestamp", 0))
+    def _is_blocking_render(self, span: IndexedSpan):
+        span_end_timestamp = timedelta(seconds=span.timestamp)
         fcp_timestamp = self.transaction_start + self.fcp
         if span_end_timestamp >= fcp_timestamp:
             return False
 
-        span_duration = get_span_duration(span)
+        span_duration = span.duration
         fcp_ratio_threshold = self.settings.get("fcp_ratio_threshold")
         return span_duration / self.fcp > fcp_ratio_threshold
 
@@ -627,7 +689,7 @@ class NPlusOneSpanDetector(PerformanceDetector):
         self.most_recent_hash = {}
         self.stored_problems = {}
 
-    def visit_span(self, span: Span):
+    def visit_span(self, span: IndexedSpan):
         settings_for_span = self.settings_for_span(span)
         if not settings_for_span:
             return
@@ -637,11 +699,11 @@ class NPlusOneSpanDetector(PerformanceDetector):
         start_time_threshold = timedelta(milliseconds=settings.get("start_time_threshold", 0))
         count = settings.get("count", 10)
 
-        fingerprint = fingerprint_span_op(span)
+        fingerprint = fingerprint_span_op(span.data)
         if not fingerprint:
             return
 
-        hash = span.get("hash", None)
+        hash = span.hash
         if not hash:
             return
 
@@ -651,17 +713,17 @@ class NPlusOneSpanDetector(PerformanceDetector):
             self.most_recent_hash[fingerprint] = ""
 
         delta_to_previous_span_start_time = timedelta(
-            seconds=(span["start_timestamp"] - self.most_recent_start_time[fingerprint])
+            seconds=(span.data["start_timestamp"] - self.most_recent_start_time[fingerprint])
         )
 
         is_concurrent_with_previous_span = delta_to_previous_span_start_time < start_time_threshold
-        has_same_hash_as_previous_span = span["hash"] == self.most_recent_hash[fingerprint]
+        has_same_hash_as_previous_span = hash == self.most_recent_hash[fingerprint]
 
-        self.most_recent_start_time[fingerprint] = span["start_timestamp"]
+        self.most_recent_start_time[fingerprint] = span.data["start_timestamp"]
         self.most_recent_hash[fingerprint] = hash
 
         if is_concurrent_with_previous_span and has_same_hash_as_previous_span:
-            self.spans_involved[fingerprint].append(span)
+            self.spans_involved[fingerprint].append(span.data)
         else:
             self.spans_involved[fingerprint] = [span_id]
             return
@@ -715,9 +777,9 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         self.n_spans = []
         self.source_span = None
 
-    def visit_span(self, span: Span) -> None:
-        span_id = span.get("span_id", None)
-        op = span.get("op", None)
+    def visit_span(self, span: IndexedSpan) -> None:
+        span_id = span.span_id
+        op = span.op
         if not span_id or not op:
             return
 
@@ -726,7 +788,7 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
             self._maybe_store_problem()
             self._reset_detection()
             # Treat it as a potential parent as long as it isn't the root span.
-            if span.get("parent_span_id", None):
+            if span.parent_span_id:
                 self.potential_parents[span_id] = span
             return
 
@@ -748,39 +810,39 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
     def on_complete(self) -> None:
         self._maybe_store_problem()
 
-    def _contains_complete_query(self, span: Span) -> bool:
+    def _contains_complete_query(self, span: IndexedSpan) -> bool:
         # When SDKs truncate span description, they add a "..." suffix (three
         # full stops, not an ellipsis).
-        query = span.get("description", None)
+        query = span.data.get("description", None)
         return query and not query.endswith("...")
 
-    def _maybe_use_as_source(self, span: Span):
+    def _maybe_use_as_source(self, span: IndexedSpan):
         if not self._contains_complete_query(span):
             return
 
-        parent_span_id = span.get("parent_span_id", None)
+        parent_span_id = span.parent_span_id
         if not parent_span_id or parent_span_id not in self.potential_parents:
             return
 
         self.source_span = span
 
-    def _continues_n_plus_1(self, span: Span):
+    def _continues_n_plus_1(self, span: IndexedSpan):
         if not self._contains_complete_query(span):
             return False
 
         if self._overlaps_last_span(span):
             return False
 
-        expected_parent_id = self.source_span.get("parent_span_id", None)
-        parent_id = span.get("parent_span_id", None)
+        expected_parent_id = self.source_span.parent_span_id
+        parent_id = span.parent_span_id
         if not parent_id or parent_id != expected_parent_id:
             return False
 
-        span_hash = span.get("hash", None)
+        span_hash = span.hash
         if not span_hash:
             return False
 
-        if span_hash == self.source_span.get("hash", None):
+        if span_hash == self.source_span.hash:
             # The source span and n repeating spans must have different queries.
             return False
 
@@ -790,13 +852,13 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
 
         return span_hash == self.n_hash
 
-    def _overlaps_last_span(self, span: Span) -> bool:
+    def _overlaps_last_span(self, span: IndexedSpan) -> bool:
         last_span = self.source_span
         if self.n_spans:
             last_span = self.n_spans[-1]
 
-        last_span_ends = timedelta(seconds=last_span.get("timestamp", 0))
-        current_span_begins = timedelta(seconds=span.get("start_timestamp", 0))
+        last_span_ends = timedelta(seconds=last_span.timestamp)
+        current_span_begins = timedelta(seconds=span.start_timestamp)
         return last_span_ends > current_span_begins
 
     def _maybe_store_problem(self):
@@ -813,12 +875,12 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
         # Do the spans take enough total time?
         total_duration = timedelta()
         for span in self.n_spans:
-            total_duration += get_span_duration(span)
+            total_duration += span.duration
         if total_duration < duration_threshold:
             return
 
         # We require a parent span in order to improve our fingerprint accuracy.
-        parent_span_id = self.source_span.get("parent_span_id", None)
+        parent_span_id = self.source_span.parent_span_id
         if not parent_span_id:
             return
         parent_span = self.potential_parents[parent_span_id]
@@ -826,20 +888,20 @@ class NPlusOneDBSpanDetector(PerformanceDetector):
             return
 
         fingerprint = self._fingerprint(
-            parent_span.get("op", None),
-            parent_span.get("hash", None),
-            self.source_span.get("hash", None),
-            self.n_spans[0].get("hash", None),
+            parent_span.op,
+            parent_span.hash,
+            self.source_span.hash,
+            self.n_spans[0].hash,
         )
         if fingerprint not in self.stored_problems:
             self.stored_problems[fingerprint] = PerformanceProblem(
                 fingerprint=fingerprint,
                 op="db",
-                desc=self.n_spans[0].get("description", ""),
+                desc=self.n_spans[0].data.get("description", ""),
                 type=GroupType.PERFORMANCE_N_PLUS_ONE_DB_QUERIES,
                 parent_span_ids=[parent_span_id],
-                cause_span_ids=[self.source_span.get("span_id", None)],
-                offender_span_ids=[span.get("span_id", None) for span in self.n_spans],
+                cause_span_ids=[self.source_span.span_id],
+                offender_span_ids=[span.span_id for span in self.n_spans],
             )
 
     def _reset_detection(self):
@@ -104,6 +104,7 @@ SAMPLED_TASKS = {
     "sentry.tasks.reprocessing2.reprocess_group": settings.SENTRY_REPROCESSING_APM_SAMPLING,
     "sentry.tasks.reprocessing2.finish_reprocessing": settings.SENTRY_REPROCESSING_APM_SAMPLING,
     "sentry.tasks.relay.build_project_config": settings.SENTRY_RELAY_TASK_APM_SAMPLING,
+    "sentry.tasks.relay.build_project_configs": settings.SENTRY_RELAY_TASK_APM_SAMPLING,
     "sentry.tasks.relay.invalidate_project_config": settings.SENTRY_RELAY_TASK_APM_SAMPLING,
     # This is the parent task of the next two tasks.
     "sentry.tasks.reports.prepare_reports": settings.SAMPLED_DEFAULT_RATE,
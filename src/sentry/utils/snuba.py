@@ -3,6 +3,7 @@ import logging
 import os
 import random
 import re
+import struct
 import time
 from collections import OrderedDict, namedtuple
 from concurrent.futures import ThreadPoolExecutor
@@ -10,12 +11,25 @@ from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime, timedelta
 from hashlib import sha1
-from typing import Any, Callable, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urlparse
 
 import pytz
 import sentry_sdk
 import urllib3
+import zstandard
 from dateutil.parser import parse as parse_datetime
 from django.conf import settings
 from django.core.cache import cache
@@ -23,6 +37,7 @@ from sentry_sdk import Hub
 from snuba_sdk import Request
 from snuba_sdk.legacy import json_to_snql
 
+from sentry.locks import locks
 from sentry.models import (
     Environment,
     Group,
@@ -39,6 +54,7 @@ from sentry.snuba.events import Columns
 from sentry.snuba.referrer import validate_referrer
 from sentry.utils import json, metrics
 from sentry.utils.dates import outside_retention_with_modified_start, to_timestamp
+from sentry.utils.locking.lock import Lock
 
 logger = logging.getLogger(__name__)
 
@@ -720,6 +736,14 @@ def bulk_snql_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+# Snuba query cache entries start with a header that holds the time until which
+# the result is fresh, followed by the zstd compressed JSON result.
+QUERY_CACHE_MAGIC = b"sqc1"
+QUERY_CACHE_COMPRESSION_LEVEL = 1
+QUERY_CACHE_POLL_INTERVAL = 0.05
+_query_cache_header = struct.Struct(">4sd")
+
+
 def get_cache_key(query: SnubaQuery) -> str:
     if isinstance(query, Request):
         hashable = str(query)
@@ -739,11 +763,84 @@ def bulk_raw_query(
     return _apply_cache_and_build_results(params, referrer=referrer, use_cache=use_cache)
 
 
+def _encode_cached_result(result: Mapping[str, Any], fresh_until: float) -> bytes:
+    body = zstandard.compress(
+        json.dumps(result).encode("utf-8"), level=QUERY_CACHE_COMPRESSION_LEVEL
+    )
+    return _query_cache_header.pack(QUERY_CACHE_MAGIC, fresh_until) + body
+
+
+def _decode_cached_result(value: Union[str, bytes]) -> Tuple[float, Mapping[str, Any]]:
+    """
+    Returns the time until which a cached result is fresh and the result.
+    """
+    if isinstance(value, str):
+        # Legacy JSON entries have no freshness, they are valid until they
+        # expire from the cache.
+        return float("inf"), json.loads(value)
+
+    magic, fresh_until = _query_cache_header.unpack_from(value)
+    if magic != QUERY_CACHE_MAGIC:
+        raise ValueError("Invalid Snuba query cache entry")
+    body = zstandard.decompress(value[_query_cache_header.size :])
+    return fresh_until, json.loads(body.decode("utf-8"))
+
+
+def _acquire_query_cache_leases(cache_keys: Sequence[str]) -> Tuple[Dict[str, Lock], Set[str]]:
+    """
+    Acquires the leases to compute the results of ``cache_keys``. Returns the
+    acquired leases and the keys whose lease another worker holds. Keys whose
+    lease could not be acquired because of an error are in neither, so that
+    their queries run right away instead of waiting for a result that might
+    never be written.
+    """
+    leases = {
+        cache_key: locks.get(
+            f"{cache_key}:lease",
+            duration=settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS,
+            name="snuba_query_cache",
+        )
+        for cache_key in cache_keys
+    }
+    acquired: Dict[str, Lock] = {}
+    contended: Set[str] = set()
+
+    try:
+        results = locks.backend.acquire_many(
+            [lease.key for lease in leases.values()],
+            duration=settings.SENTRY_SNUBA_CACHE_LEASE_SECONDS,
+        )
+    except Exception:
+        logger.warning("snuba.query_cache.lease_failed", exc_info=True)
+        return acquired, contended
+
+    for cache_key, lease in leases.items():
+        result = results.get(lease.key)
+        if result is None:
+            logger.warning("snuba.query_cache.lease_failed", extra={"cache_key": cache_key})
+        elif result:
+            acquired[cache_key] = lease
+        else:
+            contended.add(cache_key)
+    return acquired, contended
+
+
 def _apply_cache_and_build_results(
     snuba_param_list: Sequence[SnubaQueryBody],
     referrer: Optional[str] = None,
     use_cache: Optional[bool] = False,
 ) -> ResultSet:
+    """
+    Runs a batch of queries, optionally reading and writing results from the
+    query cache.
+
+    Cached results are fresh for ``SENTRY_SNUBA_CACHE_TTL_SECONDS``. To keep
+    workers from sending the same query to Snuba at the same time, only the
+    worker holding a short lease on a cache key runs the query. Other workers
+    wait for the holder to write the result or, if the cache still holds a
+    result that is stale for at most ``SENTRY_SNUBA_CACHE_STALE_SECONDS``,
+    return that one right away.
+    """
     headers = {}
     validate_referrer(referrer)
     if referrer:
@@ -753,36 +850,125 @@ def _apply_cache_and_build_results(
     query_param_list = list(enumerate(snuba_param_list))
 
     results = []
+    leases: List[Lock] = []
+    to_wait: List[Tuple[int, SnubaQueryBody, str]] = []
+    metric_tags = {"referrer": referrer} if referrer else None
 
     if use_cache:
         cache_keys = [get_cache_key(query_params[0]) for _, query_params in query_param_list]
         cache_data = cache.get_many(cache_keys)
+        now = time.time()
+
+        cached_results = {}
+        for cache_key in cache_keys:
+            if cache_data.get(cache_key) is not None:
+                try:
+                    cached_results[cache_key] = _decode_cached_result(cache_data[cache_key])
+                except Exception:
+                    logger.warning("snuba.query_cache.decode_failed", exc_info=True)
+
+        acquired, contended = _acquire_query_cache_leases(
+            [
+                cache_key
+                for cache_key in cache_keys
+                if cache_key not in cached_results or cached_results[cache_key][0] <= now
+            ]
+        )
+
         to_query: List[Tuple[int, SnubaQueryBody, Optional[str]]] = []
         for (query_pos, query_params), cache_key in zip(query_param_list, cache_keys):
-            cached_result = cache_data.get(cache_key)
-            metric_tags = {"referrer": referrer} if referrer else None
-            if cached_result is None:
+            cached = cached_results.get(cache_key)
+            if cached is not None and cached[0] > now:
+                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
+                results.append((query_pos, cached[1]))
+            elif cache_key in contended and cached is not None:
+                metrics.incr("snuba.query_cache.stale", tags=metric_tags)
+                results.append((query_pos, cached[1]))
+            elif cache_key in contended:
+                to_wait.append((query_pos, query_params, cache_key))
+            else:
                 metrics.incr("snuba.query_cache.miss", tags=metric_tags)
+                if cache_key in acquired:
+                    leases.append(acquired.pop(cache_key))
                 to_query.append((query_pos, query_params, cache_key))
-            else:
-                metrics.incr("snuba.query_cache.hit", tags=metric_tags)
-                results.append((query_pos, json.loads(cached_result)))
     else:
         to_query = [(query_pos, query_params, None) for query_pos, query_params in query_param_list]
 
-    if to_query:
-        query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
-        for result, (query_pos, _, cache_key) in zip(query_results, to_query):
-            if cache_key:
-                cache.set(cache_key, json.dumps(result), settings.SENTRY_SNUBA_CACHE_TTL_SECONDS)
-            results.append((query_pos, result))
+    try:
+        if to_query:
+            results.extend(_query_and_cache_results(to_query, headers))
+    finally:
+        for lease in leases:
+            lease.release()
+
+    if to_wait:
+        results.extend(_wait_for_cached_results(to_wait, headers, metric_tags))
 
     # Sort so that we get the results back in the original param list order
-    results.sort()
+    results.sort(key=lambda result: result[0])
     # Drop the sort order val
     return [result[1] for result in results]
 
 
+def _query_and_cache_results(
+    to_query: Sequence[Tuple[int, SnubaQueryBody, Optional[str]]],
+    headers: Mapping[str, str],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    results = []
+    query_results = _bulk_snuba_query([item[1] for item in to_query], headers)
+    to_cache = {}
+    fresh_until = time.time() + settings.SENTRY_SNUBA_CACHE_TTL_SECONDS
+    for result, (query_pos, _, cache_key) in zip(query_results, to_query):
+        if cache_key:
+            to_cache[cache_key] = _encode_cached_result(result, fresh_until)
+        results.append((query_pos, result))
+
+    if to_cache:
+        cache.set_many(
+            to_cache,
+            settings.SENTRY_SNUBA_CACHE_TTL_SECONDS + settings.SENTRY_SNUBA_CACHE_STALE_SECONDS,
+        )
+    return results
+
+
+def _wait_for_cached_results(
+    to_wait: Sequence[Tuple[int, SnubaQueryBody, str]],
+    headers: Mapping[str, str],
+    metric_tags: Optional[Mapping[str, str]],
+) -> List[Tuple[int, Mapping[str, Any]]]:
+    """
+    Polls the cache for results that other workers are computing, and runs
+    the queries whose result did not show up in time.
+    """
+    results = []
+    pending = list(to_wait)
+    deadline = time.monotonic() + settings.SENTRY_SNUBA_CACHE_LEASE_WAIT_SECONDS
+    while pending and time.monotonic() < deadline:
+        time.sleep(QUERY_CACHE_POLL_INTERVAL)
+        cache_data = cache.get_many([cache_key for _, _, cache_key in pending])
+        still_pending = []
+        for query_pos, query_params, cache_key in pending:
+            value = cache_data.get(cache_key)
+            if value is None:
+                still_pending.append((query_pos, query_params, cache_key))
+                continue
+            try:
+                _, result = _decode_cached_result(value)
+            except Exception:
+                logger.warning("snuba.query_cache.decode_failed", exc_info=True)
+                still_pending.append((query_pos, query_params, cache_key))
+                continue
+            metrics.incr("snuba.query_cache.coalesced", tags=metric_tags)
+            results.append((query_pos, result))
+        pending = still_pending
+
+    if pending:
+        metrics.incr("snuba.query_cache.coalesce_timeout", amount=len(pending), tags=metric_tags)
+        results.extend(_query_and_cache_results(pending, headers))
+
+    return results
+
+
 def _bulk_snuba_query(
     snuba_param_list: Sequence[SnubaQueryBody],
     headers: Mapping[str, str],
@@ -1127,7 +1313,21 @@ def aliased_query(**kwargs):
         return _aliased_query_impl(**kwargs)
 
 
-def _aliased_query_impl(
+def aliased_query_params(**kwargs) -> SnubaQueryParams:
+    """
+    Resolves column aliases like `aliased_query`, but returns the params of the
+    query instead of running it, so that several queries can be sent at once
+    with `bulk_raw_query`. The referrer of the batch is passed to
+    `bulk_raw_query`.
+    """
+    return SnubaQueryParams(**_resolve_aliased_query(**kwargs))
+
+
+def _aliased_query_impl(**kwargs):
+    return raw_query(**_resolve_aliased_query(**kwargs))
+
+
+def _resolve_aliased_query(
     start=None,
     end=None,
     groupby=None,
@@ -1180,7 +1380,7 @@ def _aliased_query_impl(
             updated_order.append("{}{}".format("-" if order.startswith("-") else "", order_field))
         orderby = updated_order
 
-    return raw_query(
+    return dict(
         start=start,
         end=end,
         groupby=groupby,
@@ -69,6 +69,10 @@ def projectconfig_cache_get_mock_config(monkeypatch):
     monkeypatch.setattr(
         "sentry.relay.projectconfig_cache.get", lambda *args, **kwargs: {"is_mock_config": True}
     )
+    monkeypatch.setattr(
+        "sentry.relay.projectconfig_cache.get_many",
+        lambda public_keys: {key: {"is_mock_config": True} for key in public_keys},
+    )
 
 
 @pytest.fixture
@@ -78,7 +82,11 @@ def single_mock_proj_cached(monkeypatch):
             return {"is_mock_config": True}
         return None
 
+    def cache_get_many(public_keys):
+        return {key: {"is_mock_config": True} for key in public_keys if key == "must_exist"}
+
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache_get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", cache_get_many)
 
 
 @pytest.fixture
@@ -143,7 +151,7 @@ def test_proj_in_cache_and_another_pending(
     }
 
 
-@patch("sentry.tasks.relay.build_project_config.delay")
+@patch("sentry.tasks.relay.build_project_configs.delay")
 @pytest.mark.django_db
 def test_enqueue_task_if_config_not_cached_not_queued(
     schedule_mock,
@@ -156,7 +164,7 @@ def test_enqueue_task_if_config_not_cached_not_queued(
     assert schedule_mock.call_count == 1
 
 
-@patch("sentry.tasks.relay.build_project_config.delay")
+@patch("sentry.tasks.relay.build_project_configs.delay")
 @pytest.mark.django_db
 def test_debounce_task_if_proj_config_not_cached_already_enqueued(
     task_mock,
@@ -1,6 +1,7 @@
 import datetime
 import os
 from datetime import timedelta
+from unittest import mock
 
 import pytest
 from django.test import SimpleTestCase
@@ -511,6 +512,51 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         # the slash should be removed in the final value
         assert search_filter.value.value == 'a"b'
 
+    def test_cached_result(self):
+        config = SearchConfig(allowed_keys={"title"})
+        query = "title:foo (title:bar OR title:baz)"
+
+        result = parse_search_query(query, config=config)
+        cached = parse_search_query(query, config=config)
+        assert cached == result
+        assert cached is not result
+        assert all(a is b for a, b in zip(cached, result))
+
+        # Overrides are part of the cache key
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query(query, config=config, config_overrides={"allowed_keys": {"x"}})
+        assert parse_search_query(query, config=config) == result
+
+        # Configs are compared by identity
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query(query, config=SearchConfig(allowed_keys={"x"}))
+
+    def test_relative_dates_not_cached(self):
+        now = timezone.now()
+        with freeze_time(now):
+            parse_search_query("time:-2w")
+        with freeze_time(now + timedelta(days=1)):
+            assert parse_search_query("time:-2w") == [
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now - timedelta(days=13)),
+                )
+            ]
+
+    def test_builder_results_not_cached(self):
+        query = "p95(transaction.duration):>5s"
+        builder = mock.Mock()
+        builder.get_function_result_type.return_value = "duration"
+
+        assert parse_search_query(query, builder=builder)[0].value.raw_value == 5000
+        assert parse_search_query(query, builder=builder)[0].value.raw_value == 5000
+        assert builder.get_function_result_type.call_count == 2
+
+        builder.get_function_result_type.return_value = "integer"
+        with pytest.raises(InvalidSearchQuery):
+            parse_search_query(query, builder=builder)
+
 
 @pytest.mark.parametrize(
     "raw,result",
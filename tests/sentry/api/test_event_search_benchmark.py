@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from sentry.api import event_search
+from sentry.api.event_search import parse_search_query
+from sentry.api.issue_search import parse_search_query as parse_issue_search_query
+from sentry.exceptions import InvalidSearchQuery
+from sentry.utils import json
+from tests.sentry.api.test_event_search import abs_fixtures_path
+
+# Queries as they are sent by Discover, the issue stream and alert rules.
+DISCOVER_QUERIES = [
+    "",
+    "event.type:transaction",
+    "event.type:error !transaction:/health",
+    "event.type:transaction transaction.op:http.server transaction.duration:>300ms",
+    "event.type:transaction has:measurements.lcp measurements.lcp:>2.5s",
+    'transaction:"/api/0/organizations/{organization_slug}/events/" http.method:GET',
+    "project:backend environment:production release:backend@1.2.3",
+    "user.email:*@example.com browser.name:Chrome os.name:[Windows, Mac OS X]",
+    "!has:user.id error.handled:0 level:[error, fatal]",
+    "p95(transaction.duration):>1s count():>100",
+    "failure_rate():>0.05 epm():>10",
+    "(transaction:/checkout OR transaction:/cart) AND http.status_code:[500, 502, 503]",
+    "tags[customer_tier]:enterprise title:*TimeoutError*",
+    "stack.filename:*/sentry/api/* stack.function:get stack.in_app:true",
+    'message:"Connection refused" sdk.name:sentry.python sdk.version:>1.5.0',
+]
+
+ISSUE_QUERIES = [
+    "is:unresolved",
+    "is:unresolved is:for_review assigned_or_suggested:[me, none]",
+    "is:unresolved assigned:#backend times_seen:>100",
+    "is:unresolved !has:assigned level:error",
+    "is:ignored bookmarks:me",
+    "is:unresolved error.type:ValueError error.unhandled:true",
+    "is:unresolved firstRelease:latest",
+    "is:unresolved issue.category:performance",
+]
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def fixture_queries():
+    queries = []
+    for file in sorted(os.listdir(abs_fixtures_path)):
+        with open(os.path.join(abs_fixtures_path, file)) as fp:
+            queries.extend(case["query"] for case in json.load(fp))
+    return queries
+
+
+CORPUS = {
+    "discover": (parse_search_query, DISCOVER_QUERIES + fixture_queries()),
+    "issues": (parse_issue_search_query, ISSUE_QUERIES),
+}
+
+
+def clear_caches():
+    event_search._parse_tree_cache.clear()
+    event_search._parse_result_cache.clear()
+
+
+def parse_all(parse, queries):
+    for query in queries:
+        try:
+            parse(query)
+        except InvalidSearchQuery:
+            pass
+
+
+with_benchmark = pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+with_corpus = pytest.mark.parametrize("corpus", sorted(CORPUS))
+
+
+@with_benchmark
+@with_corpus
+def test_benchmark_parse_uncached(corpus, benchmark):
+    parse, queries = CORPUS[corpus]
+    benchmark.extra_info["queries"] = len(queries)
+
+    def setup():
+        clear_caches()
+        return (parse, queries), {}
+
+    benchmark.pedantic(parse_all, setup=setup, rounds=20)
+
+
+@with_benchmark
+@with_corpus
+def test_benchmark_parse_cached(corpus, benchmark):
+    parse, queries = CORPUS[corpus]
+    benchmark.extra_info["queries"] = len(queries)
+    clear_caches()
+    parse_all(parse, queries)
+    benchmark(parse_all, parse, queries)
@@ -69,3 +69,75 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_batch(self, buffer_incr_complete):
+        groups = [Group.objects.create(project=self.project) for _ in range(3)]
+        the_date = timezone.now() + timedelta(days=5)
+
+        self.buf.process_batch(
+            [
+                (Group, {"times_seen": 2}, {"id": groups[0].id}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 3}, {"id": groups[1].id}, {"last_seen": the_date}, None),
+                # Deleted groups are not recreated
+                (Group, {"times_seen": 1}, {"id": 0}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 4}, {"id": groups[2].id}, {}, None),
+            ]
+        )
+
+        for group, times_seen in zip(groups, (2, 3, 4)):
+            updated = Group.objects.get(id=group.id)
+            assert updated.times_seen == group.times_seen + times_seen
+        assert Group.objects.get(id=groups[0].id).last_seen == the_date
+        assert Group.objects.get(id=groups[0].id).score > groups[0].score
+        assert not Group.objects.filter(id=0).exists()
+        assert buffer_incr_complete.send_robust.call_count == 4
+        buffer_incr_complete.send_robust.assert_any_call(
+            model=Group,
+            columns={"times_seen": 1},
+            filters={"id": 0},
+            extra={"last_seen": the_date},
+            created=False,
+            sender=Group,
+        )
+
+    def test_process_batch_merges_duplicates(self):
+        groups = [Group.objects.create(project=self.project) for _ in range(2)]
+        the_date = timezone.now() + timedelta(days=5)
+
+        self.buf.process_batch(
+            [
+                (Group, {"times_seen": 2}, {"id": groups[0].id}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 3}, {"id": groups[0].id}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 4}, {"id": groups[1].id}, {"last_seen": the_date}, None),
+            ]
+        )
+
+        for group, times_seen in zip(groups, (5, 4)):
+            updated = Group.objects.get(id=group.id)
+            assert updated.times_seen == group.times_seen + times_seen
+            assert updated.last_seen == the_date
+
+    def test_process_batch_creates_missing_rows(self):
+        release_project, _ = ReleaseProject.objects.get_or_create(
+            project=self.project, release=self.release
+        )
+        other_release = Release.objects.create(organization=self.organization, version="abcdefg")
+
+        self.buf.process_batch(
+            [
+                (
+                    ReleaseProject,
+                    {"new_groups": 1},
+                    {"project_id": self.project.id, "release_id": release.id},
+                    None,
+                    None,
+                )
+                for release in (self.release, other_release)
+            ]
+        )
+
+        assert ReleaseProject.objects.get(id=release_project.id).new_groups == 1
+        assert (
+            ReleaseProject.objects.get(project=self.project, release=other_release).new_groups == 1
+        )
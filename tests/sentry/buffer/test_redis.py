@@ -103,6 +103,32 @@ class RedisBufferTest(TestCase):
         group = Group.objects.get_from_cache(id=self.group.id)
         assert group.times_seen == orig_times_seen + times_seen_incr
 
+    @freeze_time()
+    def test_bulk_process(self):
+        buf = RedisBuffer(bulk_process=True)
+        groups = [self.group, self.create_group()]
+        for group in groups:
+            for times_seen in (1, 2):
+                buf.incr(
+                    Group,
+                    {"times_seen": times_seen},
+                    {"pk": group.id},
+                    {"last_seen": timezone.now()},
+                )
+
+        keys = [buf._make_key(Group, {"pk": group.id}) for group in groups]
+        with mock.patch.object(buf, "process_batch", wraps=buf.process_batch) as process_batch:
+            buf.process(batch_keys=keys)
+        assert process_batch.call_count == 1
+
+        for group in groups:
+            assert Group.objects.get(id=group.id).times_seen == group.times_seen + 3
+
+        # Keys are drained, processing them again is a no-op
+        buf.process(batch_keys=keys)
+        for group in groups:
+            assert Group.objects.get(id=group.id).times_seen == group.times_seen + 3
+
     def test_get(self):
         model = mock.Mock()
         model.__name__ = "Mock"
@@ -115,6 +141,29 @@ class RedisBufferTest(TestCase):
         self.buf.incr(model, {"times_seen": 5}, filters)
         assert self.buf.get(model, columns, filters=filters) == {"times_seen": 6}
 
+    def test_get_local_cache(self):
+        buf = RedisBuffer(local_cache_ttl=60)
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        columns = ["times_seen"]
+        filters = {"pk": 1}
+        buf.incr(model, {"times_seen": 1}, filters)
+        assert buf.get(model, columns, filters=filters) == {"times_seen": 1}
+
+        # Increments from other processes are not visible until the entry expires
+        self.buf.incr(model, {"times_seen": 5}, filters)
+        assert buf.get(model, columns, filters=filters) == {"times_seen": 1}
+
+        # Increments from the same process invalidate the local cache
+        buf.incr(model, {"times_seen": 2}, filters)
+        assert buf.get(model, columns, filters=filters) == {"times_seen": 8}
+
+        buf.local_cache.clear()
+        with mock.patch.object(buf.cluster, "get_local_client_for_key") as get_client:
+            buf.get(model, columns, filters=filters)
+            buf.get(model, columns, filters=filters)
+        assert get_client.call_count == 1
+
     def test_incr_saves_to_redis(self):
         now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
         client = self.buf.cluster.get_routing_client()
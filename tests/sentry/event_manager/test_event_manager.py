@@ -1,4 +1,6 @@
 import logging
+import os
+import tempfile
 import uuid
 from datetime import datetime, timedelta
 from time import time
@@ -109,8 +111,38 @@ class EventManagerTest(TestCase, EventManagerTestMixin):
         assert group.platform == "python"
         assert event.platform == "python"
 
-    @mock.patch("sentry.event_manager.eventstream.insert")
-    def test_dupe_message_id(self, eventstream_insert):
+    def test_stage_profile(self):
+        with tempfile.TemporaryDirectory() as dump_dir, self.options(
+            {"store.save-event-stage-profiler.sample-rate": 1.0}
+        ), override_settings(SENTRY_SAVE_EVENT_STAGE_PROFILE_DIR=dump_dir):
+            manager = EventManager(make_event(platform="python"))
+            manager.normalize()
+            event = manager.save(self.project.id)
+
+            (filename,) = os.listdir(dump_dir)
+            with open(os.path.join(dump_dir, filename)) as f:
+                profile = json.load(f)
+
+        assert profile["name"] == "event_manager.save"
+        assert profile["tags"] == {"platform": "python", "event_type": "default"}
+        assert profile["extra"] == {"project_id": self.project.id, "event_id": event.event_id}
+
+        names = [stage["stage"] for stage in profile["stages"]]
+        assert len(names) == len(set(names))
+        assert {
+            "pull_out_data",
+            "calculate_event_grouping",
+            "save_aggregate",
+            "nodestore_save_many",
+            "eventstream_insert_many",
+        } <= set(names)
+        assert "calculate_secondary_grouping" not in names
+        (save_aggregate,) = (s for s in profile["stages"] if s["stage"] == "save_aggregate")
+        assert save_aggregate["db_queries"] > 0
+        assert profile["db_queries"] >= sum(s["db_queries"] for s in profile["stages"])
+
+    @mock.patch("sentry.event_manager.eventstream.insert_many")
+    def test_dupe_message_id(self, eventstream_insert_many):
         # Saves the latest event to nodestore and eventstream
         project_id = 1
         event_id = "a" * 32
@@ -126,7 +158,7 @@ class EventManagerTest(TestCase, EventManagerTestMixin):
         manager.save(project_id)
         assert nodestore.get(node_id)["logentry"]["formatted"] == "second"
 
-        assert eventstream_insert.call_count == 2
+        assert eventstream_insert_many.call_count == 2
 
     def test_updates_group(self):
         timestamp = time() - 300
@@ -1267,8 +1299,8 @@ class EventManagerTest(TestCase, EventManagerTestMixin):
         assert 42 not in event.tags
         assert None not in event.tags
 
-    @mock.patch("sentry.event_manager.eventstream.insert")
-    def test_group_environment(self, eventstream_insert):
+    @mock.patch("sentry.event_manager.eventstream.insert_many")
+    def test_group_environment(self, eventstream_insert_many):
         release_version = "1.0"
 
         def save_event():
@@ -1299,28 +1331,36 @@ class EventManagerTest(TestCase, EventManagerTestMixin):
 
         # Ensure that the first event in the (group, environment) pair is
         # marked as being part of a new environment.
-        eventstream_insert.assert_called_with(
-            event=event,
-            is_new=True,
-            is_regression=False,
-            is_new_group_environment=True,
-            primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
-            skip_consume=False,
-            received_timestamp=event.data["received"],
+        eventstream_insert_many.assert_called_with(
+            [
+                dict(
+                    event=event,
+                    is_new=True,
+                    is_regression=False,
+                    is_new_group_environment=True,
+                    primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
+                    skip_consume=False,
+                    received_timestamp=event.data["received"],
+                )
+            ]
         )
 
         event = save_event()
 
         # Ensure that the next event in the (group, environment) pair is *not*
         # marked as being part of a new environment.
-        eventstream_insert.assert_called_with(
-            event=event,
-            is_new=False,
-            is_regression=None,  # XXX: wut
-            is_new_group_environment=False,
-            primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
-            skip_consume=False,
-            received_timestamp=event.data["received"],
+        eventstream_insert_many.assert_called_with(
+            [
+                dict(
+                    event=event,
+                    is_new=False,
+                    is_regression=None,  # XXX: wut
+                    is_new_group_environment=False,
+                    primary_hash="acbd18db4cc2f85cedef654fccc4a4d8",
+                    skip_consume=False,
+                    received_timestamp=event.data["received"],
+                )
+            ]
         )
 
     def test_default_fingerprint(self):
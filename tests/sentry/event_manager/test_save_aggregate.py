@@ -4,8 +4,9 @@ from threading import Thread
 
 import pytest
 
-from sentry.event_manager import _save_aggregate
+from sentry.event_manager import _get_or_create_grouphashes, _save_aggregate
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.models import GroupHash
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +88,22 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv.group.id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv.is_new for rv in return_values) <= CONCURRENCY
+
+
+@pytest.mark.django_db
+def test_get_or_create_grouphashes(default_project, default_group):
+    existing = GroupHash.objects.create(project=default_project, hash="a" * 32, group=default_group)
+    hierarchical = GroupHash.objects.create(project=default_project, hash="c" * 32)
+
+    grouphashes = _get_or_create_grouphashes(
+        default_project, ["a" * 32, "b" * 32, "b" * 32], ["c" * 32, "d" * 32]
+    )
+
+    assert set(grouphashes) == {"a" * 32, "b" * 32, "c" * 32}
+    assert grouphashes["a" * 32].id == existing.id
+    assert grouphashes["a" * 32].group_id == default_group.id
+    created = GroupHash.objects.get(project=default_project, hash="b" * 32)
+    assert grouphashes["b" * 32].id == created.id
+    assert grouphashes["c" * 32].id == hierarchical.id
+    # Hierarchical hashes are only created once chosen as root hash
+    assert not GroupHash.objects.filter(project=default_project, hash="d" * 32).exists()
@@ -23,7 +23,11 @@ class GroupingInput:
         with open(os.path.join(_grouping_fixture_path, self.filename)) as f:
             return json.load(f)
 
-    def create_event(self, grouping_config):
+    def create_event_manager(self, grouping_config):
+        """Returns the not yet normalized ``EventManager`` for this input.
+
+        ``grouping_config`` is updated with the enhancements of the input.
+        """
         grouping_input = dict(self.data)
         # Customize grouping config from the _grouping config
         grouping_info = grouping_input.pop("_grouping", None) or {}
@@ -33,8 +37,11 @@ class GroupingInput:
             e = Enhancements.from_config_string(enhancements or "", bases=enhancement_bases)
             grouping_config["enhancements"] = e.dumps()
 
+        return EventManager(data=grouping_input, grouping_config=grouping_config)
+
+    def create_event(self, grouping_config):
         # Normalize the event
-        mgr = EventManager(data=grouping_input, grouping_config=grouping_config)
+        mgr = self.create_event_manager(grouping_config)
         mgr.normalize()
         data = mgr.get_data()
 
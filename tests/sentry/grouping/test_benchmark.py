@@ -1,6 +1,12 @@
+import tracemalloc
+
 import pytest
 
-from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.api import (
+    get_default_grouping_config_dict,
+    get_grouping_variants_for_event,
+    load_grouping_config,
+)
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
@@ -16,18 +22,72 @@ def benchmark_available():
         return True
 
 
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
-@pytest.mark.parametrize(
+with_benchmark = pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+with_config_name = pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
+
+
+@with_benchmark
+@with_config_name
 def test_benchmark_grouping(config_name, benchmark):
-    config = CONFIGS[config_name]
-    input_iter = iter(grouping_inputs)
+    def get_args(grouping_input, config):
+        return grouping_input, config
+
+    run_benchmark(benchmark, config_name, run_configuration, get_args)
+
+
+@with_benchmark
+@with_config_name
+def test_benchmark_normalize(config_name, benchmark):
+    def get_args(grouping_input, config):
+        return (grouping_input.create_event_manager(config),)
+
+    run_benchmark(benchmark, config_name, run_normalize, get_args)
+
+
+@with_benchmark
+@with_config_name
+def test_benchmark_grouping_variants(config_name, benchmark):
+    def get_args(grouping_input, config):
+        event = grouping_input.create_event(config)
+        event.project = None
+        return event, load_grouping_config(config)
 
-    def setup():
-        return (next(input_iter), config), {}
+    run_benchmark(benchmark, config_name, get_grouping_variants_for_event, get_args)
 
-    benchmark.pedantic(run_configuration, setup=setup, rounds=len(grouping_inputs))
+
+def run_benchmark(benchmark, config_name, func, get_args):
+    """Runs ``func`` once for every grouping input and records the p99 latency
+    and the peak traced memory of the runs in ``benchmark.extra_info``.
+
+    ``get_args`` builds the arguments of ``func`` from a grouping input and
+    config and is not timed. Memory is traced in a separate pass so it does
+    not skew the timings.
+    """
+
+    def iter_args():
+        for grouping_input in grouping_inputs:
+            yield get_args(grouping_input, dict(CONFIGS[config_name]))
+
+    args_iter = iter_args()
+    benchmark.pedantic(func, setup=lambda: (next(args_iter), {}), rounds=len(grouping_inputs))
+
+    timings = sorted(benchmark.stats.stats.data)
+    benchmark.extra_info["p99"] = timings[min(int(len(timings) * 0.99), len(timings) - 1)]
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for args in iter_args():
+            tracemalloc.clear_traces()
+            func(*args)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    benchmark.extra_info["peak_memory_max"] = max(peaks)
+    benchmark.extra_info["peak_memory_mean"] = sum(peaks) / len(peaks)
 
 
 def run_configuration(grouping_input, config):
@@ -37,3 +97,7 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+def run_normalize(event_manager):
+    event_manager.normalize()
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 
 from sentry.grouping.component import GroupingComponent
@@ -412,3 +414,87 @@ def test_sentinel_and_prefix(action, type):
     actions[0][1].update_frame_components_contributions([component], frames, 0)
     expected = action == "+"
     assert getattr(component, f"is_{type}_frame") is expected
+
+
+def test_compiled_rules():
+    config = """
+        family:native function:std::*                   -app
+        family:native,javascript !app:yes function:foo  +group
+        family:all module:core::*                       -group
+        path:**/node_modules/**                         -app
+        !package:linux-gate.so function:bar             ^-group
+        category:telemetry                              -group
+        function:bar                                    category=telemetry
+        [ function:foo ] | function:* | [ function:baz ] +prefix
+        error.type:*Error function:abort                +sentinel
+        [ error.value:oops ] | function:abort           v-group
+        !error.mechanism:NSError function:main          max-frames=2
+    """
+    enhancement = Enhancements.from_config_string(config, bases=["common:2019-03-23"])
+    frames = [
+        {"function": "main", "in_app": True},
+        {"function": "foo", "module": "core::thing", "package": "linux-gate.so"},
+        {"function": "bar", "abs_path": "/app/node_modules/lib.js", "in_app": False},
+        {"function": "baz", "platform": "javascript"},
+        {"function": "std::abort", "in_app": False},
+        {"function": "abort"},
+    ]
+    exception_data = {"type": "ZeroDivisionError", "value": "oops"}
+    modifier_rules, updater_rules = enhancement._get_compiled_rules()
+
+    for compiled, rules in [
+        (modifier_rules, enhancement._modifier_rules),
+        (updater_rules, enhancement._updater_rules),
+    ]:
+        expected = []
+        for rule in rules:
+            matches = _get_matching_frame_actions(rule, frames, "native", exception_data)
+            if matches:
+                expected.append((rule, matches))
+
+        match_frames = [create_match_frame(frame, "native") for frame in frames]
+        assert (
+            list(compiled.iter_matching_frame_actions(match_frames, "native", exception_data, {}))
+            == expected
+        )
+
+    # compiled rules are shared between instances with the same config
+    other = Enhancements.from_config_string(config, bases=["common:2019-03-23"])
+    assert other._get_compiled_rules() == (modifier_rules, updater_rules)
+
+
+def test_compiled_rules_see_modifications():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:foo                                    -app
+        function:* app:no                               category=ignored
+        category:ignored                                -group
+        """
+    )
+    frames = [{"function": "foo", "in_app": True}, {"function": "bar", "in_app": True}]
+
+    enhancement.apply_modifications_to_frame(frames, "native", None)
+    assert frames[0]["in_app"] is False
+    assert frames[0]["data"]["category"] == "ignored"
+    assert "category" not in frames[1].get("data", {})
+
+
+def test_compiled_rules_memoize_frames():
+    enhancement = Enhancements.from_config_string(
+        """
+        function:memoized_*                             -group
+        path:**/memoized/**                             -group
+        """
+    )
+    _, updater_rules = enhancement._get_compiled_rules()
+    frames = [{"function": "memoized_foo"}, {"function": "bar", "abs_path": "/memoized/bar.py"}]
+
+    with mock.patch.object(
+        updater_rules, "_get_static_mask", wraps=updater_rules._get_static_mask
+    ) as get_static_mask:
+        for _ in range(2):
+            match_frames = [create_match_frame(frame, "python") for frame in frames]
+            matches = updater_rules.iter_matching_frame_actions(match_frames, "python", None, {})
+            assert [idx for _, actions in matches for idx, _ in actions] == [0, 1]
+
+    assert get_static_mask.call_count == 2
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import Mock
+
+import msgpack
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.processing.strategies import MessageRejected
+from arroyo.types import Message, Partition, Position, Topic
+
+from sentry.ingest.pipeline import PipelinedIngestStrategy
+
+
+def make_message(partition, offset, type, project_id=1):
+    payload = msgpack.packb({"type": type, "project_id": project_id, "event_id": str(offset)})
+    return Message(partition, offset, KafkaPayload(None, payload, []), datetime.now())
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    monkeypatch.setattr(
+        "sentry.ingest.pipeline.fetch_projects", lambda ids: {id: Mock(id=id) for id in ids}
+    )
+    monkeypatch.setattr(
+        "sentry.ingest.pipeline.process_attachment_chunks",
+        lambda chunks, projects: calls.extend(("chunk", m["event_id"]) for m in chunks),
+    )
+    monkeypatch.setattr(
+        "sentry.ingest.pipeline.process_other_messages",
+        lambda others, projects: calls.extend((m["type"], m["event_id"]) for _, m in others),
+    )
+    return calls
+
+
+def test_batches_are_committed_per_partition(calls):
+    topic = Topic("ingest-attachments")
+    partitions = [Partition(topic, 0), Partition(topic, 1)]
+    commit = Mock()
+
+    strategy = PipelinedIngestStrategy(
+        commit,
+        ThreadPoolExecutor(4),
+        Mock(),
+        max_batch_size=2,
+        max_batch_time=10,
+    )
+
+    for offset in range(4):
+        for partition in partitions:
+            message_type = "attachment_chunk" if offset % 2 == 0 else "event"
+            strategy.submit(make_message(partition, offset, message_type))
+
+    strategy.close()
+    strategy.join()
+
+    committed = {}
+    for (positions,), _ in commit.call_args_list:
+        committed.update(positions)
+
+    assert {partition: position.offset for partition, position in committed.items()} == {
+        partitions[0]: 4,
+        partitions[1]: 4,
+    }
+    assert all(isinstance(position, Position) for position in committed.values())
+
+    # chunks are always stored before the events of the same batch
+    for offset in ("0", "2"):
+        chunk_index = calls.index(("chunk", offset))
+        event_index = calls.index(("event", str(int(offset) + 1)))
+        assert chunk_index < event_index
+
+
+def test_backpressure(calls):
+    partition = Partition(Topic("ingest-events"), 0)
+    executor = Mock()
+
+    strategy = PipelinedIngestStrategy(
+        Mock(),
+        executor,
+        Mock(),
+        max_batch_size=1,
+        max_batch_time=10,
+        max_pending_batches=1,
+    )
+
+    strategy.submit(make_message(partition, 0, "event"))
+    strategy.submit(make_message(partition, 1, "event"))
+
+    # The first batch never completes, so the second one cannot be dispatched
+    # and further messages are rejected.
+    with pytest.raises(MessageRejected):
+        strategy.submit(make_message(partition, 2, "event"))
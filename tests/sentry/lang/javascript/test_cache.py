@@ -1,6 +1,8 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
-from sentry.lang.javascript.cache import SourceCache
+from django.test import override_settings
+
+from sentry.lang.javascript.cache import SourceCache, get_or_parse_view, make_source_view
 
 
 class BasicCacheTest(TestCase):
@@ -37,3 +39,27 @@ class BasicCacheTest(TestCase):
         # fall back to utf-8
         cache.add(url, "foobar".encode("utf-32"), encoding="utf-32")
         assert cache.get(url)[0] == "foobar"
+
+
+class ParsedViewCacheTest(TestCase):
+    def test_shared_between_calls(self):
+        parse = mock.Mock(side_effect=make_source_view)
+        url = "http://example.com/foo.js"
+
+        with override_settings(SENTRY_JS_PARSED_VIEW_CACHE_SIZE=1024):
+            view = get_or_parse_view("source", parse, b"foo\nbar", url)
+            assert get_or_parse_view("source", parse, b"foo\nbar", url) is view
+            assert parse.call_count == 1
+
+            # a changed file is parsed again
+            assert get_or_parse_view("source", parse, b"baz", url)[0] == "baz"
+            assert parse.call_count == 2
+
+    def test_disabled(self):
+        parse = mock.Mock(side_effect=make_source_view)
+        url = "http://example.com/foo.js"
+
+        with override_settings(SENTRY_JS_PARSED_VIEW_CACHE_SIZE=0):
+            get_or_parse_view("source", parse, b"foo", url)
+            get_or_parse_view("source", parse, b"foo", url)
+            assert parse.call_count == 2
@@ -725,6 +725,26 @@ class FetchFileTest(TestCase):
         result.close()
         assert len(cache_getfile.mock_calls) == 2
 
+    @patch(
+        "sentry.lang.javascript.processor.ReleaseFile.cache.getfile_mapped",
+        side_effect=ReleaseFile.cache.getfile_mapped,
+    )
+    def test_mapped_archive_caching(self, cache_getfile_mapped):
+        """Only the location of mapped archives is cached"""
+
+        release = Release.objects.create(version="1", organization_id=self.project.organization_id)
+        self._create_archive(release, "foo")
+
+        with override_options({"releasefile.mmap-archives": True}):
+            for _ in range(2):
+                result = fetch_release_archive_for_url(release, dist=None, url="foo")
+                assert result is not None
+                assert result.read() == b"0123456789"
+                result.close()
+
+        # The release file is only loaded the first time
+        assert len(cache_getfile_mapped.mock_calls) == 1
+
     @responses.activate
     def test_unicode_body(self):
         responses.add(
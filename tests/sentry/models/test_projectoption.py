@@ -1,3 +1,5 @@
+from django.core.cache import cache
+
 from sentry.models import ProjectOption
 from sentry.testutils import TestCase
 
@@ -28,3 +30,18 @@ class ProjectOptionManagerTest(TestCase):
         ProjectOption.objects.create(project=self.project, key="foo", value="bar")
         result = ProjectOption.objects.get_value_bulk([self.project], "foo")
         assert result == {self.project: "bar"}
+
+    def test_get_all_values_many(self):
+        other_project = self.create_project()
+        ProjectOption.objects.create(project=self.project, key="foo", value="bar")
+        ProjectOption.objects.clear_local_cache()
+        cache.delete(ProjectOption.objects._make_key(self.project.id))
+        cache.delete(ProjectOption.objects._make_key(other_project.id))
+
+        with self.assertNumQueries(1):
+            result = ProjectOption.objects.get_all_values_many([self.project.id, other_project.id])
+        assert result == {self.project.id: {"foo": "bar"}, other_project.id: {}}
+
+        with self.assertNumQueries(0):
+            assert ProjectOption.objects.get_all_values(self.project) == {"foo": "bar"}
+            assert ProjectOption.objects.get_all_values(other_project) == {}
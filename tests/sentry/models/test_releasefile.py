@@ -113,6 +113,41 @@ class ReleaseFileCacheTest(TestCase):
         else:
             assert False, "file should not exist"
 
+    def test_getfile_mapped(self):
+        file_content = b"this is a test"
+
+        file = self.create_file(name="dummy.txt")
+        file.putfile(BytesIO(file_content))
+        release_file = self.create_release_file(file=file)
+
+        expected_path = os.path.join(
+            options.get("releasefile.cache-path"),
+            str(self.organization.id),
+            str(file.id),
+        )
+
+        # Files are mapped from disk regardless of the cache limit
+        options.set("releasefile.cache-limit", 1024)
+        with ReleaseFile.cache.getfile_mapped(release_file) as f:
+            assert f.size == len(file_content)
+            assert f.read(4) == b"this"
+            f.seek(-4, os.SEEK_END)
+            assert f.read() == b"test"
+            assert f.name == expected_path
+
+        os.stat(expected_path)
+
+    def test_getfile_mapped_by_id(self):
+        file = self.create_file(name="dummy.txt")
+        file.putfile(BytesIO(b"this is a test"))
+        release_file = self.create_release_file(file=file)
+
+        assert ReleaseFile.cache.getfile_mapped_by_id(self.organization.id, file.id) is None
+
+        ReleaseFile.cache.getfile_mapped(release_file).close()
+        with ReleaseFile.cache.getfile_mapped_by_id(self.organization.id, file.id) as f:
+            assert f.read() == b"this is a test"
+
 
 class ReleaseArchiveTestCase(TestCase):
     def create_archive(self, fields, files, dist=None):
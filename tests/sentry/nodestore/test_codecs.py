@@ -0,0 +1,57 @@
+import pytest
+import zstandard
+
+from sentry.nodestore.codecs import NodePayloadCodec, NodePayloadError, is_encoded
+from sentry.utils import json
+
+
+@pytest.fixture
+def dictionary_path(tmp_path):
+    samples = [
+        json.dumps(
+            {
+                "platform": "javascript",
+                "exception": {"values": [{"type": "TypeError", "value": f"x{i} is undefined"}]},
+            }
+        ).encode("utf8")
+        for i in range(1000)
+    ]
+    path = tmp_path / "javascript.dict"
+    path.write_bytes(zstandard.train_dictionary(4096, samples).as_bytes())
+    return str(path)
+
+
+@pytest.mark.parametrize("serializer", ["json", "msgpack"])
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_roundtrip(serializer, compression, dictionary_path):
+    codec = NodePayloadCodec(serializer, compression, dictionaries={"javascript": dictionary_path})
+    data = {"platform": "javascript", "message": "hello world", "tags": [["foo", "bar"]]}
+
+    value = codec.encode({None: data, "unprocessed": {"message": "raw"}})
+    assert is_encoded(value)
+
+    # Payloads are readable with any codec configuration that knows the dictionary
+    reader = NodePayloadCodec(dictionaries={"javascript": dictionary_path})
+    assert reader.decode(value) == data
+    assert reader.decode(value, subkey="unprocessed") == {"message": "raw"}
+    assert reader.decode(value, subkey="missing") is None
+
+
+def test_fallback_serializer():
+    codec = NodePayloadCodec("msgpack", "zstd")
+    data = {"value": 2**70}
+    assert codec.decode(codec.encode({None: data})) == data
+
+
+def test_unknown_dictionary(dictionary_path):
+    value = NodePayloadCodec(
+        "msgpack", "zstd", dictionaries={"javascript": dictionary_path}
+    ).encode({None: {"platform": "javascript"}})
+
+    with pytest.raises(NodePayloadError):
+        NodePayloadCodec().decode(value)
+
+
+def test_legacy_payloads_are_not_encoded():
+    assert not is_encoded(b'{"foo":"bar"}')
+    assert not is_encoded(b"\x80\x04")
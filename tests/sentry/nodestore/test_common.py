@@ -91,3 +91,48 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+def test_set_multi(ns):
+    nodes = {"a" * 32: {"foo": "a"}, "b" * 32: {"foo": "b"}}
+
+    ns.set_multi(nodes)
+    assert ns.get_multi(list(nodes)) == nodes
+
+    # Existing nodes are overwritten
+    nodes = {"a" * 32: {"foo": "c"}, "b" * 32: {"foo": "d"}, "c" * 32: {"foo": "e"}}
+    ns.set_multi(nodes)
+    assert ns.get_multi(list(nodes)) == nodes
+
+
+def test_set_subkeys_multi(ns):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    ns.set_subkeys_multi(
+        {
+            "node_1": {None: {"foo": "c"}},
+            "node_2": {None: {"foo": "d"}, "other": {"foo": "e"}},
+        }
+    )
+    assert ns.get("node_1") == {"foo": "c"}
+    assert ns.get("node_1", subkey="other") is None
+    assert ns.get("node_2") == {"foo": "d"}
+    assert ns.get("node_2", subkey="other") == {"foo": "e"}
+
+
+@pytest.mark.parametrize(
+    "codec",
+    [{}, {"serializer": "msgpack"}, {"serializer": "json", "compression": "zstd"}],
+    ids=["legacy", "msgpack", "json+zstd"],
+)
+def test_payload_codec(ns, settings, codec):
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+    settings.SENTRY_NODESTORE_CODEC = codec
+    ns.__dict__.pop("payload_codec", None)
+    ns.set_subkeys("node_2", {None: {"foo": "c"}, "other": {"foo": "d"}})
+
+    # old and new payloads can be read side by side
+    for node_id, (default, other) in {"node_1": ("a", "b"), "node_2": ("c", "d")}.items():
+        assert ns._decode(ns._get_bytes(node_id), subkey=None) == {"foo": default}
+        assert ns.get(node_id, subkey="other") == {"foo": other}
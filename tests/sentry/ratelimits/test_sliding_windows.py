@@ -3,14 +3,15 @@ import pytest
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
     Quota,
+    RedisScriptSlidingWindowRateLimiter,
     RedisSlidingWindowRateLimiter,
     RequestedQuota,
 )
 
 
-@pytest.fixture
-def limiter():
-    return RedisSlidingWindowRateLimiter()
+@pytest.fixture(params=[RedisSlidingWindowRateLimiter, RedisScriptSlidingWindowRateLimiter])
+def limiter(request):
+    return request.param()
 
 
 TIMESTAMP_OFFSET = 100
@@ -121,3 +122,38 @@ def test_conflicting_quotas(limiter):
         GrantedQuota(prefix="foo", granted=6, reached_quotas=[]),
         GrantedQuota(prefix="bar", granted=4, reached_quotas=quotas),
     ]
+
+
+def test_refund(limiter):
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+    requests = [RequestedQuota(prefix="foo", requested=6, quotas=quotas)]
+
+    grants = limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+    assert grants == [GrantedQuota(prefix="foo", granted=6, reached_quotas=[])]
+
+    limiter.refund_quotas(requests, grants, TIMESTAMP_OFFSET)
+
+    resp = limiter.check_and_use_quotas(
+        [RequestedQuota(prefix="foo", requested=10, quotas=quotas)], timestamp=TIMESTAMP_OFFSET + 1
+    )
+    assert resp == [GrantedQuota(prefix="foo", granted=10, reached_quotas=[])]
+
+
+def test_script_shared_prefix():
+    # Unlike the two-step implementation, the script also accounts for quota
+    # granted to previous requests with the same prefix within one batch.
+    limiter = RedisScriptSlidingWindowRateLimiter()
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+
+    resp = limiter.check_and_use_quotas(
+        [
+            RequestedQuota(prefix="foo", requested=6, quotas=quotas),
+            RequestedQuota(prefix="foo", requested=6, quotas=quotas),
+        ],
+        timestamp=TIMESTAMP_OFFSET,
+    )
+
+    assert resp == [
+        GrantedQuota(prefix="foo", granted=6, reached_quotas=[]),
+        GrantedQuota(prefix="foo", granted=4, reached_quotas=quotas),
+    ]
@@ -24,3 +24,45 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+@pytest.mark.django_db
+def test_get_many():
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many({"a": {"value": 1}, "b": {"value": 2}})
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": {"value": 1}, "b": {"value": 2}}
+
+
+@pytest.mark.django_db
+def test_local_cache():
+    cache = redis.RedisProjectConfigCache(local_cache_ttl=60)
+    cache.set_many({"a": {"value": 1}})
+
+    config = cache.get("a")
+    assert config == {"value": 1}
+    # Unchanged revision, the decoded config is reused
+    assert cache.get("a") is config
+
+    # Writes from other processes invalidate the cached config
+    redis.RedisProjectConfigCache().set_many({"a": {"value": 2}})
+    assert cache.get("a") == {"value": 2}
+
+    redis.RedisProjectConfigCache().delete_many(["a"])
+    assert cache.get("a") is None
+
+
+@pytest.mark.django_db
+def test_compression_dictionary(tmpdir):
+    configs = [{"publicKey": f"key-{i}", "config": {"features": ["a", "b"]}} for i in range(1000)]
+    path = tmpdir.join("projectconfigs.dict")
+    path.write_binary(redis.train_compression_dictionary(configs, dict_size=4096))
+
+    plain = redis.RedisProjectConfigCache()
+    cache = redis.RedisProjectConfigCache(compression_dictionary=str(path))
+
+    plain.set_many({"a": configs[0]})
+    cache.set_many({"b": configs[1]})
+
+    # Readers with a dictionary can read configs written without one
+    assert cache.get_many(["a", "b"]) == {"a": configs[0], "b": configs[1]}
@@ -20,6 +20,7 @@ from sentry.search.events.builder import (
     MetricsQueryBuilder,
     QueryBuilder,
     TimeseriesMetricQueryBuilder,
+    _plan_cache,
 )
 from sentry.search.events.types import HistogramParams
 from sentry.sentry_metrics import indexer
@@ -721,6 +722,118 @@ class QueryBuilderTest(TestCase):
                 ],
             )
 
+    def test_plan_cache(self):
+        _plan_cache.clear()
+
+        def build(params):
+            return QueryBuilder(
+                Dataset.Discover,
+                params,
+                "user.email:foo@example.com (transaction:a OR transaction:b)",
+                ["transaction", "count()"],
+                orderby=["-count()"],
+            )
+
+        with self.options({"discover.query-plan-cache.enabled": True}):
+            query = build(self.params)
+
+            start = self.start + datetime.timedelta(hours=1)
+            end = self.end + datetime.timedelta(hours=1)
+            with mock.patch.object(QueryBuilder, "resolve_query") as resolve_query:
+                cached = build(dict(self.params, start=start, end=end))
+                assert not resolve_query.called
+
+        assert cached.start == start
+        assert cached.end == end
+        self.assertCountEqual(
+            cached.where,
+            [
+                *query.where[:-3],
+                Condition(Column("timestamp"), Op.GTE, start),
+                Condition(Column("timestamp"), Op.LT, end),
+                Condition(Column("project_id"), Op.IN, self.projects),
+            ],
+        )
+        assert cached.where is not query.where
+        assert cached.columns == query.columns
+        assert cached.orderby == query.orderby
+        assert cached.groupby == query.groupby
+        assert cached.function_alias_map == query.function_alias_map
+        cached.get_snql_query().validate()
+
+    def test_plan_cache_key(self):
+        _plan_cache.clear()
+        query = "transaction:a"
+        columns = ["transaction", "epm()"]
+
+        with self.options({"discover.query-plan-cache.enabled": True}):
+            QueryBuilder(Dataset.Discover, self.params, query, columns)
+
+            # The length of the time range is part of a plan, for functions like epm()
+            params = dict(self.params, end=self.end + datetime.timedelta(hours=1))
+            with mock.patch.object(QueryBuilder, "resolve_query") as resolve_query:
+                QueryBuilder(Dataset.Discover, params, query, columns)
+                assert resolve_query.called
+
+            # So are other params
+            params = dict(self.params, project_id=[1])
+            with mock.patch.object(QueryBuilder, "resolve_query") as resolve_query:
+                QueryBuilder(Dataset.Discover, params, query, columns)
+                assert resolve_query.called
+
+    def test_plan_cache_relative_dates(self):
+        _plan_cache.clear()
+
+        with self.options({"discover.query-plan-cache.enabled": True}):
+            QueryBuilder(Dataset.Discover, self.params, "timestamp:-1d", ["transaction"])
+
+        assert len(_plan_cache) == 0
+
+    def test_plan_cache_database_state(self):
+        _plan_cache.clear()
+        group = self.create_group(project=self.project)
+        params = dict(self.params, organization_id=self.organization.id)
+
+        with self.options({"discover.query-plan-cache.enabled": True}):
+            for query, columns in (
+                ("release:1.2.1", ["transaction"]),
+                (f"issue:{group.qualified_short_id}", ["transaction"]),
+                ("", ["apdex()"]),
+            ):
+                builder = QueryBuilder(Dataset.Discover, params, query, columns)
+                assert not builder.plan_cacheable
+
+        assert len(_plan_cache) == 0
+
+    def test_depends_on_time_range(self):
+        for query, columns, expected in (
+            ("", ["count()", "epm(60)"], False),
+            ("", ["epm()"], True),
+            ("", ["eps()"], True),
+            ("timestamp:-1d", ["count()"], True),
+        ):
+            builder = QueryBuilder(Dataset.Discover, self.params, query, columns)
+            assert builder.depends_on_time_range is expected
+
+    def test_plan_cache_retention(self):
+        _plan_cache.clear()
+        query = "transaction:a"
+
+        with self.options({"discover.query-plan-cache.enabled": True}):
+            QueryBuilder(Dataset.Discover, self.params, query, ["transaction"])
+
+            start = self.start - datetime.timedelta(days=365)
+            end = self.end - datetime.timedelta(days=365)
+            with pytest.raises(QueryOutsideRetentionError), self.options(
+                {"system.event-retention-days": 90}
+            ):
+                QueryBuilder(
+                    Dataset.Discover,
+                    dict(self.params, start=start, end=end),
+                    query,
+                    ["transaction"],
+                )
+
 
 def _metric_percentile_definition(
     org_id, quantile, field="transaction.duration", alias=None
@@ -648,3 +648,40 @@ def test_one_org_limited(caplog, settings):
             [("mapping_sources", b"ch"), ("metric_type", "d")],
         ),
     ]
+
+
+def test_invalid_messages_skipped(caplog):
+    outer_message = _construct_outer_message(
+        [
+            (counter_payload, []),
+            ({**counter_payload, "type": "x"}, []),
+            ({**counter_payload, "tags": {"environment": None}}, []),
+            ({**counter_payload, "tags": {"environment": "x" * 201}}, []),
+        ]
+    )
+    outer_message.payload.append(
+        Message(
+            Partition(Topic("topic"), 0),
+            4,
+            KafkaPayload(None, b"{invalid", []),
+            datetime.now(),
+        )
+    )
+
+    batch = IndexerBatch(UseCaseKey.PERFORMANCE, outer_message)
+    org_strings = batch.extract_strings()
+    assert org_strings == {
+        1: {"c:sessions/session@none", "environment", "init", "production", "session.status"}
+    }
+
+    strings = sorted(org_strings[1])
+    snuba_payloads = batch.reconstruct_messages(
+        {1: {string: i for i, string in enumerate(strings, 1)}},
+        {
+            1: {
+                string: Metadata(id=i, fetch_type=FetchType.CACHE_HIT)
+                for i, string in enumerate(strings, 1)
+            }
+        },
+    )
+    assert [msg.offset for msg in snuba_payloads] == [0]
@@ -0,0 +1,162 @@
+from collections import defaultdict
+
+import pytest
+import rapidjson
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import Message
+
+from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.sentry_metrics.consumers.indexer.batch import (
+    ACCEPTED_METRIC_TYPES,
+    IndexerBatch,
+    PartitionIdxOffset,
+    invalid_metric_tags,
+    valid_metric_name,
+)
+from sentry.sentry_metrics.indexer.base import FetchType, Metadata
+from sentry.utils import json
+from tests.sentry.sentry_metrics.test_batch import _construct_outer_message, distribution_payload
+
+pytestmark = pytest.mark.sentry_metrics
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+class LegacyIndexerBatch(IndexerBatch):
+    """
+    The hot path of ``IndexerBatch`` before payloads were decoded and
+    validated in a single pass: payloads are kept in a dict keyed by offset
+    that is walked twice, and every tag is looked up in the per-org mapping.
+    Logging and quota handling are left out, the benchmark only has valid
+    messages with resolved strings.
+    """
+
+    def extract_strings(self):
+        org_strings = defaultdict(set)
+        self.skipped_offsets = set()
+        self.parsed_payloads_by_offset = {}
+
+        for msg in self.outer_message.payload:
+            partition_offset = PartitionIdxOffset(msg.partition.index, msg.offset)
+            self.parsed_payloads_by_offset[partition_offset] = json.loads(
+                msg.payload.value.decode("utf-8"), use_rapid_json=True
+            )
+
+        for partition_offset, message in self.parsed_payloads_by_offset.items():
+            tags = message.get("tags", {})
+            if (
+                not valid_metric_name(message["name"])
+                or message["type"] not in ACCEPTED_METRIC_TYPES
+                or invalid_metric_tags(tags)
+            ):
+                self.skipped_offsets.add(partition_offset)
+                continue
+            org_strings[message["org_id"]].update({message["name"], *tags.keys(), *tags.values()})
+
+        return org_strings
+
+    def reconstruct_messages(self, mapping, bulk_record_meta):
+        new_messages = []
+
+        for message in self.outer_message.payload:
+            partition_offset = PartitionIdxOffset(message.partition.index, message.offset)
+            if partition_offset in self.skipped_offsets:
+                continue
+            new_payload_value = self.parsed_payloads_by_offset.pop(partition_offset)
+
+            metric_name = new_payload_value["name"]
+            org_id = new_payload_value["org_id"]
+            tags = new_payload_value.get("tags", {})
+            used_tags = {metric_name}
+            new_tags = {}
+            for k, v in tags.items():
+                used_tags.update({k, v})
+                new_tags[str(mapping[org_id][k])] = mapping[org_id][v]
+
+            output_message_meta = defaultdict(dict)
+            fetch_types_encountered = set()
+            for tag in used_tags:
+                if tag in bulk_record_meta[org_id]:
+                    metadata = bulk_record_meta[org_id][tag]
+                    fetch_types_encountered.add(metadata.fetch_type)
+                    output_message_meta[metadata.fetch_type.value][str(metadata.id)] = tag
+
+            new_payload_value["tags"] = new_tags
+            new_payload_value["metric_id"] = mapping[org_id][metric_name]
+            new_payload_value["retention_days"] = 90
+            new_payload_value["mapping_meta"] = output_message_meta
+            new_payload_value["use_case_id"] = self.use_case_id.value
+            del new_payload_value["name"]
+
+            new_payload = KafkaPayload(
+                key=message.payload.key,
+                value=rapidjson.dumps(new_payload_value).encode(),
+                headers=[
+                    *message.payload.headers,
+                    (
+                        "mapping_sources",
+                        "".join(sorted(t.value for t in fetch_types_encountered)).encode(),
+                    ),
+                    ("metric_type", new_payload_value["type"]),
+                ],
+            )
+            new_messages.append(
+                Message(
+                    partition=message.partition,
+                    offset=message.offset,
+                    payload=new_payload,
+                    timestamp=message.timestamp,
+                )
+            )
+
+        return new_messages
+
+
+IMPLEMENTATIONS = {"current": IndexerBatch, "legacy": LegacyIndexerBatch}
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("implementation", sorted(IMPLEMENTATIONS))
+def test_benchmark_batch(implementation, benchmark):
+    batch_cls = IMPLEMENTATIONS[implementation]
+    payloads = [
+        (
+            {
+                **distribution_payload,
+                "org_id": i % 10,
+                "tags": {
+                    "environment": f"env-{i % 3}",
+                    "transaction": f"/api/{i % 50}/",
+                    "release": f"1.0.{i % 7}",
+                },
+            },
+            [],
+        )
+        for i in range(1000)
+    ]
+    outer_message = _construct_outer_message(payloads)
+
+    def run():
+        batch = batch_cls(UseCaseKey.PERFORMANCE, outer_message)
+        org_strings = batch.extract_strings()
+        mapping = {
+            org_id: {string: i for i, string in enumerate(strings, 1)}
+            for org_id, strings in org_strings.items()
+        }
+        meta = {
+            org_id: {
+                string: Metadata(id=id, fetch_type=FetchType.CACHE_HIT)
+                for string, id in org_mapping.items()
+            }
+            for org_id, org_mapping in mapping.items()
+        }
+        return batch.reconstruct_messages(mapping, meta)
+
+    assert len(benchmark(run)) == len(payloads)
@@ -1,3 +1,5 @@
+from unittest import mock
+
 import pytest
 from django.conf import settings
 
@@ -71,3 +73,57 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("a", 2, UseCaseKey.PERFORMANCE.value)
     assert indexer_cache.get("a", UseCaseKey.RELEASE_HEALTH.value) == 1
     assert indexer_cache.get("a", UseCaseKey.PERFORMANCE.value) == 2
+
+
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=10,
+    )
+    local_indexer_cache.set_many({"hello": 2}, use_case_id)
+    indexer_cache.set("bye", 3, use_case_id)
+
+    # Served from the local tier even if the shared cache loses the value
+    cache.clear()
+    assert local_indexer_cache.get_many(["hello", "bye"], use_case_id) == {
+        "hello": 2,
+        "bye": None,
+    }
+
+    indexer_cache.set("bye", 3, use_case_id)
+    assert local_indexer_cache.get_many(["bye", "hello"], use_case_id) == {"bye": 3, "hello": 2}
+    cache.clear()
+    assert local_indexer_cache.get("bye", use_case_id) == 3
+
+    local_indexer_cache.delete_many(["hello", "bye"], use_case_id)
+    assert local_indexer_cache.get_many(["hello", "bye"], use_case_id) == {
+        "hello": None,
+        "bye": None,
+    }
+
+
+def test_negative_cache(use_case_id: str) -> None:
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS,
+        partition_key=_PARTITION_KEY,
+        local_cache_size=10,
+    )
+    with mock.patch("sentry.utils.lru.metrics") as metrics:
+        assert not local_indexer_cache.is_missing("missing", use_case_id)
+        local_indexer_cache.set_missing("missing", use_case_id)
+        assert local_indexer_cache.is_missing("missing", use_case_id)
+
+    assert metrics.incr.call_args_list == [
+        mock.call("sentry_metrics.indexer.negative_cache.miss", amount=1),
+        mock.call("sentry_metrics.indexer.negative_cache.hit", amount=1),
+    ]
+
+    # Indexing the string clears the negative entry
+    local_indexer_cache.set("missing", 4, use_case_id)
+    assert not local_indexer_cache.is_missing("missing", use_case_id)
+
+    # Without a local tier nothing is remembered
+    indexer_cache.set_missing("missing", use_case_id)
+    assert not indexer_cache.is_missing("missing", use_case_id)
@@ -1,3 +1,5 @@
+import pytest
+
 from sentry.sentry_metrics.configuration import (
     PERFORMANCE_PG_NAMESPACE,
     RELEASE_HEALTH_PG_NAMESPACE,
@@ -135,3 +137,27 @@ def test_writes_limiter_respects_namespaces(set_sentry_option):
 
     with writes_limiter_rh.check_write_limits(UseCaseKey.PERFORMANCE, key_collection) as state:
         assert not state.dropped_strings
+
+
+def test_writes_limiter_atomic_refunds_on_error(set_sentry_option):
+    set_sentry_option("sentry-metrics.writes-limiter.atomic", True)
+    set_sentry_option(
+        "sentry-metrics.writes-limiter.limits.performance.per-org",
+        [{"window_seconds": 10, "granularity_seconds": 10, "limit": 2}],
+    )
+    set_sentry_option("sentry-metrics.writes-limiter.limits.performance.global", [])
+    writes_limiter = get_writes_limiter(PERFORMANCE_PG_NAMESPACE)
+
+    key_collection = KeyCollection({1: {"a", "b"}})
+
+    with pytest.raises(ValueError):
+        with writes_limiter.check_write_limits(UseCaseKey.PERFORMANCE, key_collection) as state:
+            assert not state.dropped_strings
+            raise ValueError("write failed")
+
+    # The quota consumed by the failed block has been given back.
+    with writes_limiter.check_write_limits(UseCaseKey.PERFORMANCE, key_collection) as state:
+        assert not state.dropped_strings
+
+    with writes_limiter.check_write_limits(UseCaseKey.PERFORMANCE, key_collection) as state:
+        assert len(state.dropped_strings) == 2
@@ -6,7 +6,7 @@ import pytest
 from sentry.exceptions import InvalidSearchQuery
 from sentry.models import ProjectTransactionThreshold
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.snuba import discover
+from sentry.snuba import discover, timeseries_cache
 from sentry.testutils import SnubaTestCase, TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.utils.samples import load_data
@@ -438,6 +438,46 @@ class TimeseriesQueryTest(TimeseriesBase):
             if "count" in d:
                 assert d["count"] == 2
 
+    def test_timeseries_cache(self):
+        params = {
+            "start": self.day_ago,
+            "end": self.day_ago + timedelta(hours=3, minutes=30),
+            "project_id": [self.project.id],
+        }
+        with self.options({"snuba.timeseries-cache.enabled": True}):
+            uncached = discover.timeseries_query(
+                selected_columns=["count()"], query="", params=params, rollup=3600
+            )
+            with patch(
+                "sentry.snuba.timeseries_cache.bulk_snql_query",
+                side_effect=timeseries_cache.bulk_snql_query,
+            ) as bulk_snql_query:
+                cached = discover.timeseries_query(
+                    selected_columns=["count()"], query="", params=params, rollup=3600
+                )
+
+        # Only the last, incomplete bucket is queried again
+        (requests, _), _ = bulk_snql_query.call_args
+        assert len(requests) == 1
+        assert [d.get("count", 0) for d in uncached.data["data"]] == [0, 2, 1, 0]
+        assert cached.data["data"] == uncached.data["data"]
+
+    def test_timeseries_cache_time_range_dependent(self):
+        params = {
+            "start": self.day_ago,
+            "end": self.day_ago + timedelta(hours=3, minutes=30),
+            "project_id": [self.project.id],
+        }
+        for columns, query in ((["epm()"], ""), (["count()"], "timestamp:-2d")):
+            with self.options({"snuba.timeseries-cache.enabled": True}), patch(
+                "sentry.snuba.timeseries_cache.cache"
+            ) as cache:
+                discover.timeseries_query(
+                    selected_columns=columns, query=query, params=params, rollup=3600
+                )
+            assert not cache.get_many.called
+            assert not cache.set_many.called
+
 
 @pytest.mark.skip("These tests are specific to json which we no longer use")
 class TopEventsTimeseriesQueryTest(TimeseriesBase):
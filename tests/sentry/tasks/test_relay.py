@@ -9,8 +9,11 @@ from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import (
     build_project_config,
+    build_project_configs,
+    compute_projectkey_config,
     invalidate_project_config,
     schedule_build_project_config,
+    schedule_build_project_configs,
     schedule_invalidate_project_config,
 )
 
@@ -79,6 +82,7 @@ def redis_cache(monkeypatch):
     monkeypatch.setattr("sentry.relay.projectconfig_cache.set_many", cache.set_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.delete_many", cache.delete_many)
     monkeypatch.setattr("sentry.relay.projectconfig_cache.get", cache.get)
+    monkeypatch.setattr("sentry.relay.projectconfig_cache.get_many", cache.get_many)
 
     return cache
 
@@ -143,6 +147,80 @@ def test_debounce(
     assert tasks[0]["public_key"] == default_projectkey.public_key
 
 
+@pytest.mark.django_db
+def test_debounce_batch(
+    monkeypatch,
+    default_projectkey,
+    debounce_cache,
+):
+    tasks = []
+
+    def apply_async(args, kwargs):
+        assert not args
+        tasks.append(kwargs)
+
+    monkeypatch.setattr("sentry.tasks.relay.build_project_configs.apply_async", apply_async)
+
+    schedule_build_project_configs([default_projectkey.public_key, "a" * 32])
+    schedule_build_project_configs([default_projectkey.public_key, "b" * 32])
+
+    assert len(tasks) == 2
+    assert tasks[0]["public_keys"] == [default_projectkey.public_key, "a" * 32]
+    assert tasks[1]["public_keys"] == ["b" * 32]
+
+
+@pytest.mark.django_db
+def test_generate_batch(
+    default_project,
+    default_projectkey,
+    redis_cache,
+):
+    other_key = ProjectKey.objects.create(project=default_project)
+    inactive_key = ProjectKey.objects.create(
+        project=default_project, status=ProjectKeyStatus.INACTIVE
+    )
+    public_keys = [
+        default_projectkey.public_key,
+        other_key.public_key,
+        inactive_key.public_key,
+        "a" * 32,
+    ]
+
+    build_project_configs(public_keys)
+
+    for key in (default_projectkey, other_key):
+        cfg = redis_cache.get(key.public_key)
+        assert cfg["projectId"] == default_project.id
+        assert cfg["publicKeys"] == [
+            {
+                "isEnabled": True,
+                "publicKey": key.public_key,
+                "numericId": key.id,
+                "quotas": [],
+            }
+        ]
+
+    assert redis_cache.get(inactive_key.public_key) == {"disabled": True}
+    assert redis_cache.get("a" * 32) == {"disabled": True}
+
+
+@pytest.mark.django_db
+def test_generate_batch_error(default_project, default_projectkey, redis_cache):
+    other_key = ProjectKey.objects.create(project=default_project)
+
+    def compute(key):
+        if key.public_key == other_key.public_key:
+            raise ValueError("boom")
+        return compute_projectkey_config(key)
+
+    with patch("sentry.tasks.relay.compute_projectkey_config", side_effect=compute):
+        build_project_configs([default_projectkey.public_key, other_key.public_key])
+
+    assert redis_cache.get(default_projectkey.public_key)["projectId"] == default_project.id
+    # Failed configs are not cached, so they are computed again on the next request
+    assert redis_cache.get(other_key.public_key) is None
+
+
 @pytest.mark.django_db
 def test_generate(
     monkeypatch,
@@ -188,6 +188,42 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_write_batch(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=1)
+        later = now + timedelta(hours=1)
+
+        self.db.write_batch(
+            incrs=[
+                (TSDBModel.project, 1, now, 1),
+                (TSDBModel.project, 1, now, 1),
+                (TSDBModel.project, 1, later, 2),
+                (TSDBModel.group, 5, now, 1),
+            ],
+            records=[
+                (TSDBModel.users_affected_by_group, 5, ("foo",), now, 1),
+                (TSDBModel.users_affected_by_group, 5, ("foo", "bar"), later, 2),
+            ],
+            frequencies=[
+                (TSDBModel.frequent_environments_by_group, {5: {1: 1}}, now, None),
+                (TSDBModel.frequent_environments_by_group, {5: {1: 1, 2: 1}}, later, None),
+            ],
+        )
+
+        assert self.db.get_sums(TSDBModel.project, [1], now, later) == {1: 3}
+        assert self.db.get_sums(TSDBModel.project, [1], now, later, environment_id=1) == {1: 2}
+        assert self.db.get_sums(TSDBModel.group, [5], now, later) == {5: 1}
+
+        assert self.db.get_distinct_counts_totals(
+            TSDBModel.users_affected_by_group, [5], now, later
+        ) == {5: 2}
+        assert self.db.get_distinct_counts_totals(
+            TSDBModel.users_affected_by_group, [5], now, later, environment_id=1
+        ) == {5: 1}
+
+        assert self.db.get_frequency_totals(
+            TSDBModel.frequent_environments_by_group, {5: [1, 2]}, now, later, rollup=3600
+        ) == {5: {1: 2.0, 2: 1.0}}
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
@@ -1,8 +1,9 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import pytest
 from exam import fixture
 
+from sentry.utils.locking.backends import LockBackend
 from sentry.utils.locking.backends.redis import RedisLockBackend
 from sentry.utils.redis import clusters
 
@@ -59,5 +60,24 @@ class RedisLockBackendTestCase(TestCase):
         assert self.backend.locked(key)
         self.backend.release(key)
 
+    def test_acquire_many(self):
+        duration = 60
+        other_backend = RedisLockBackend(self.cluster)
+        other_backend.acquire("held", duration)
+        self.addCleanup(other_backend.release, "held")
+
+        assert self.backend.acquire_many(["held", "free"], duration) == {
+            "held": False,
+            "free": True,
+        }
+        assert self.backend.locked("free")
+        self.backend.release("free")
+
+    def test_acquire_many_error(self):
+        with mock.patch.object(
+            RedisLockBackend, "acquire", side_effect=Exception("unavailable")
+        ), mock.patch.object(RedisLockBackend, "locked", side_effect=Exception("unavailable")):
+            assert LockBackend.acquire_many(self.backend, ["lock"], 60) == {}
+
     def test_cluster_as_str(self):
         assert RedisLockBackend(cluster="default").cluster == self.cluster
@@ -0,0 +1,55 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from sentry.utils.performance_issues.performance_detection import _detect_performance_problems
+from tests.sentry.utils.performance_issues.test_performance_detection import EVENTS
+
+REPETITIONS = 50
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def repeat_spans(event, repetitions):
+    """Builds a large transaction by repeating the spans of ``event`` back to
+    back, keeping the span tree of every repetition intact."""
+    spans = event.get("spans", [])
+    duration = max((span["timestamp"] for span in spans), default=0) - min(
+        (span["start_timestamp"] for span in spans), default=0
+    )
+
+    def span_id(repetition, original):
+        return f"{repetition:04x}{original[4:]}" if original else original
+
+    repeated_spans = []
+    for repetition in range(repetitions):
+        offset = repetition * duration
+        for span in spans:
+            repeated_spans.append(
+                dict(
+                    span,
+                    span_id=span_id(repetition, span["span_id"]),
+                    parent_span_id=span_id(repetition, span.get("parent_span_id")),
+                    start_timestamp=span["start_timestamp"] + offset,
+                    timestamp=span["timestamp"] + offset,
+                )
+            )
+
+    return dict(event, spans=repeated_spans)
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("event_name", sorted(EVENTS), ids=lambda x: x.replace("-", "_"))
+def test_benchmark_detect_performance_problems(event_name, benchmark):
+    event = repeat_spans(EVENTS[event_name], REPETITIONS)
+    benchmark.extra_info["spans"] = len(event["spans"])
+
+    with patch("sentry.models.ProjectOption.objects.get_value", return_value={}):
+        benchmark(_detect_performance_problems, event, Mock())
@@ -0,0 +1,68 @@
+from sentry.utils.lru import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used key now
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_ttl():
+    clock = Clock()
+    cache = LRUCache(10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 4
+    assert "a" in cache
+    assert cache.get("a") == 1
+
+    clock.now = 5
+    assert "a" not in cache
+    assert cache.get("a", "default") == "default"
+    assert cache.get("b") == 2
+
+
+def test_delete():
+    cache = LRUCache(10)
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    cache.delete("a")
+    cache.delete_many(["b", "missing"])
+    assert cache.get_many(["a", "b", "c"]) == {"c": 3}
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_weigher():
+    cache = LRUCache(10, weigher=len)
+    cache.set_many({"a": "xxxx", "b": "xxxx"})
+    assert cache.weight == 8
+
+    # "a" has to make room for "c"
+    cache.set("c", "xxx")
+    assert cache.get_many(["a", "b", "c"]) == {"b": "xxxx", "c": "xxx"}
+    assert cache.weight == 7
+
+    # values heavier than the whole cache are not stored
+    cache.set("d", "x" * 11)
+    assert "d" not in cache
+    assert cache.weight == 7
+
+    cache.delete("b")
+    assert cache.weight == 3
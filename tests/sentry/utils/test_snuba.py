@@ -4,15 +4,21 @@ from unittest import mock
 
 import pytest
 import pytz
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
 
+from sentry.locks import locks
 from sentry.models import GroupRelease, Project, Release
 from sentry.testutils import TestCase
 from sentry.utils.snuba import (
     Dataset,
     SnubaQueryParams,
     UnqualifiedQueryError,
+    _apply_cache_and_build_results,
+    _encode_cached_result,
     _prepare_query_params,
+    get_cache_key,
     get_json_type,
     get_query_params_to_update_for_projects,
     get_snuba_column_name,
@@ -374,3 +380,75 @@ class QuantizeTimeTest(unittest.TestCase):
                 break
 
         assert i != j
+
+
+@mock.patch("sentry.utils.snuba._bulk_snuba_query")
+class QueryCacheTest(TestCase):
+    query = {"dataset": "events", "selected_columns": ["event_id"]}
+
+    def setUp(self):
+        super().setUp()
+        self.cache_key = get_cache_key(self.query)
+        cache.delete(self.cache_key)
+
+    def run_query(self):
+        (result,) = _apply_cache_and_build_results(
+            [(self.query, lambda x: x, lambda x: x)], use_cache=True
+        )
+        return result
+
+    def hold_lease(self):
+        lease = locks.get(f"{self.cache_key}:lease", duration=10)
+        lease.acquire()
+        self.addCleanup(lease.release)
+
+    def test_cache(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        assert self.run_query() == {"data": [1]}
+        assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 1
+
+    def test_legacy_entry(self, bulk_snuba_query):
+        cache.set(self.cache_key, '{"data": [1]}')
+        assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 0
+
+    def test_stale_revalidate(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [2]}]
+        cache.set(self.cache_key, _encode_cached_result({"data": [1]}, 0))
+        assert self.run_query() == {"data": [2]}
+        assert bulk_snuba_query.call_count == 1
+
+    def test_stale_while_leased(self, bulk_snuba_query):
+        cache.set(self.cache_key, _encode_cached_result({"data": [1]}, 0))
+        self.hold_lease()
+        assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 0
+
+    def test_coalesce(self, bulk_snuba_query):
+        self.hold_lease()
+
+        # The lease holder writes the result while we wait for it
+        cached = _encode_cached_result({"data": [1]}, float("inf"))
+        with mock.patch.object(cache, "get_many", side_effect=[{}, {self.cache_key: cached}]):
+            assert self.run_query() == {"data": [1]}
+
+        assert bulk_snuba_query.call_count == 0
+
+    @override_settings(SENTRY_SNUBA_CACHE_LEASE_WAIT_SECONDS=0.1)
+    def test_coalesce_timeout(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        self.hold_lease()
+        assert self.run_query() == {"data": [1]}
+        assert bulk_snuba_query.call_count == 1
+
+    def test_lease_error(self, bulk_snuba_query):
+        bulk_snuba_query.return_value = [{"data": [1]}]
+        with mock.patch.object(
+            locks.backend, "acquire_many", side_effect=Exception("unavailable")
+        ), mock.patch("sentry.utils.snuba.time.sleep") as sleep:
+            assert self.run_query() == {"data": [1]}
+
+        # Errors are not mistaken for another worker holding the lease
+        assert not sleep.called
+        assert bulk_snuba_query.call_count == 1
@@ -0,0 +1,78 @@
+import os
+from unittest import mock
+
+import pytest
+
+from sentry.models import Organization
+from sentry.utils import json, redis
+from sentry.utils.performance import stageprofiler
+
+
+@stageprofiler.stage("query")
+def query():
+    Organization.objects.filter(slug="nope").exists()
+
+
+@stageprofiler.stage("redis")
+def redis_commands():
+    client = redis.clusters.get("default").get_local_client(0)
+    client.get("stageprofiler:a")
+    with client.pipeline(transaction=False) as pipeline:
+        pipeline.get("stageprofiler:b")
+        pipeline.get("stageprofiler:c")
+        pipeline.execute()
+
+
+def test_not_sampled():
+    with stageprofiler.profile("test", sample_rate=0.0) as profile:
+        with stageprofiler.stage("noop"):
+            pass
+
+    assert profile is None
+    assert stageprofiler.get_active_profile() is None
+
+
+@pytest.mark.django_db
+def test_stages(tmpdir):
+    with mock.patch("sentry.utils.performance.stageprofiler.metrics") as metrics:
+        with stageprofiler.profile(
+            "test", sample_rate=1.0, tags={"platform": "python"}, dump_dir=str(tmpdir)
+        ) as profile:
+            assert stageprofiler.get_active_profile() is profile
+            query()
+            redis_commands()
+            with stageprofiler.profile("nested", sample_rate=1.0) as nested:
+                assert nested is None
+
+    assert stageprofiler.get_active_profile() is None
+
+    query_stage, redis_stage = profile.stages
+    assert query_stage["stage"] == "query"
+    assert query_stage["db_queries"] == 1
+    assert query_stage["redis_commands"] == 0
+    assert redis_stage["stage"] == "redis"
+    assert redis_stage["db_queries"] == 0
+    assert redis_stage["redis_commands"] == 3
+    assert profile.duration >= query_stage["duration"] + redis_stage["duration"]
+
+    metrics.timing.assert_any_call(
+        "test.stage.db_queries", 1, tags={"platform": "python", "stage": "query"}
+    )
+    metrics.timing.assert_any_call(
+        "test.stage.redis_commands", 3, tags={"platform": "python", "stage": "redis"}
+    )
+
+    (filename,) = os.listdir(str(tmpdir))
+    with open(os.path.join(str(tmpdir), filename)) as f:
+        assert json.load(f) == json.loads(json.dumps(profile.as_dict()))
+
+
+def test_stage_error():
+    with mock.patch("sentry.utils.performance.stageprofiler.metrics"):
+        with pytest.raises(ValueError):
+            with stageprofiler.profile("test", sample_rate=1.0) as profile:
+                with stageprofiler.stage("fails"):
+                    raise ValueError()
+
+    assert [stage["stage"] for stage in profile.stages] == ["fails"]
+    assert stageprofiler.get_active_profile() is None
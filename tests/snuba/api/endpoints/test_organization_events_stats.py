@@ -714,7 +714,7 @@ class OrganizationEventsStatsEndpointTest(APITestCase, SnubaTestCase):
 
         assert mock_query.call_count == 1
 
-    @mock.patch("sentry.snuba.discover.bulk_snql_query", return_value=[{"data": []}])
+    @mock.patch("sentry.snuba.timeseries_cache.bulk_snql_query", return_value=[{"data": []}])
     def test_invalid_interval(self, mock_query):
         self.do_request(
             data={
@@ -1273,11 +1273,14 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
         assert results["order"] == 0
         assert [{"count": event_data["count"]}] in [attrs for time, attrs in results["data"]]
 
+    @mock.patch(
+        "sentry.snuba.timeseries_cache.bulk_snql_query", return_value=[{"data": [], "meta": []}]
+    )
     @mock.patch(
         "sentry.search.events.builder.raw_snql_query",
-        side_effect=[{"data": [{"issue.id": 1}], "meta": []}, {"data": [], "meta": []}],
+        return_value={"data": [{"issue.id": 1}], "meta": []},
     )
-    def test_top_events_with_issue_check_query_conditions(self, mock_query):
+    def test_top_events_with_issue_check_query_conditions(self, mock_query, mock_bulk_query):
         """ "Intentionally separate from test_top_events_with_issue
 
         This is to test against a bug where the condition for issues wasn't included and we'd be missing data for
@@ -1302,7 +1305,7 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
 
         assert (
             Condition(Function("coalesce", [Column("group_id"), 0], "issue.id"), Op.IN, [1])
-            in mock_query.mock_calls[1].args[0].query.where
+            in mock_bulk_query.mock_calls[0].args[0][0].query.where
         )
 
     def test_top_events_with_functions(self):
@@ -1951,7 +1954,9 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
         assert other["order"] == 5
         assert [{"count": 0.03}] in [attrs for _, attrs in other["data"]]
 
-    @mock.patch("sentry.snuba.discover.bulk_snql_query", return_value=[{"data": [], "meta": []}])
+    @mock.patch(
+        "sentry.snuba.timeseries_cache.bulk_snql_query", return_value=[{"data": [], "meta": []}]
+    )
     @mock.patch(
         "sentry.search.events.builder.raw_snql_query", return_value={"data": [], "meta": []}
     )
@@ -1989,9 +1994,10 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
                 },
             )
         assert response.status_code == 200
-        assert mock_raw_query.call_count == 2
+        assert mock_raw_query.call_count == 1
+        assert mock_bulk_query.call_count == 2
         # Should've reset to the default for between 1 and 24h
-        assert mock_raw_query.mock_calls[1].args[0].query.granularity.granularity == 300
+        assert mock_bulk_query.mock_calls[1].args[0][0].query.granularity.granularity == 300
 
         with self.feature(self.enabled_features):
             response = self.client.get(
@@ -2009,9 +2015,10 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
                 },
             )
         assert response.status_code == 200
-        assert mock_raw_query.call_count == 4
+        assert mock_raw_query.call_count == 2
+        assert mock_bulk_query.call_count == 3
         # Should've left the interval alone since we're just below the limit
-        assert mock_raw_query.mock_calls[3].args[0].query.granularity.granularity == 1
+        assert mock_bulk_query.mock_calls[2].args[0][0].query.granularity.granularity == 1
 
         with self.feature(self.enabled_features):
             response = self.client.get(
@@ -2028,9 +2035,10 @@ class OrganizationEventsStatsTopNEvents(APITestCase, SnubaTestCase):
                 },
             )
         assert response.status_code == 200
-        assert mock_raw_query.call_count == 6
+        assert mock_raw_query.call_count == 3
+        assert mock_bulk_query.call_count == 4
         # Should've default to 24h's default of 5m
-        assert mock_raw_query.mock_calls[5].args[0].query.granularity.granularity == 300
+        assert mock_bulk_query.mock_calls[3].args[0][0].query.granularity.granularity == 300
 
     def test_top_events_timestamp_fields(self):
         with self.feature(self.enabled_features):
@@ -4,13 +4,15 @@ from unittest import mock
 
 from django.utils import timezone
 
+from sentry.api.event_search import SearchFilter, SearchKey, SearchValue
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.group_stream import StreamGroupSerializerSnuba, snuba_tsdb
 from sentry.models import Environment
 from sentry.testutils import APITestCase, SnubaTestCase
-from sentry.testutils.helpers.datetime import iso_format
+from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import hash_values
+from sentry.utils.snuba import bulk_raw_query
 
 
 class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
@@ -45,6 +47,40 @@ class StreamGroupSerializerTestCase(APITestCase, SnubaTestCase):
             for args, kwargs in get_range.call_args_list:
                 assert kwargs["environment_ids"] is None
 
+    def test_seen_stats_batched(self):
+        for user_id, level in [(1, "error"), (2, "warning")]:
+            event = self.store_event(
+                data={
+                    "fingerprint": ["put-me-in-group1"],
+                    "timestamp": iso_format(before_now(minutes=1)),
+                    "user": {"id": user_id},
+                    "level": level,
+                },
+                project_id=self.project.id,
+            )
+
+        with mock.patch(
+            "sentry.api.serializers.models.group_stream.bulk_raw_query",
+            side_effect=bulk_raw_query,
+        ) as bulk_query:
+            (result,) = serialize(
+                [event.group],
+                serializer=StreamGroupSerializerSnuba(
+                    start=before_now(hours=1),
+                    search_filters=[SearchFilter(SearchKey("level"), "=", SearchValue("error"))],
+                ),
+            )
+
+        # The time range, filtered and lifetime stats are queried at once
+        assert bulk_query.call_count == 1
+        assert len(bulk_query.call_args[0][0]) == 3
+
+        assert result["count"] == "2"
+        assert result["userCount"] == 2
+        assert result["filtered"]["count"] == "1"
+        assert result["filtered"]["userCount"] == 1
+        assert result["lifetime"]["userCount"] == 2
+
     def test_session_count(self):
         group = self.group
 
@@ -67,15 +67,17 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase):
             is_transaction_event=is_transaction_event,
         )
 
-    @patch("sentry.eventstream.insert")
-    def test(self, mock_eventstream_insert):
+    @patch("sentry.eventstream.insert_many")
+    def test(self, mock_eventstream_insert_many):
         now = datetime.utcnow()
 
         event = self.__build_event(now)
 
         # verify eventstream was called by EventManager
-        insert_args, insert_kwargs = list(mock_eventstream_insert.call_args)
-        assert not insert_args
+        (inserts,), kwargs = list(mock_eventstream_insert_many.call_args)
+        assert not kwargs
+        assert len(inserts) == 1
+        insert_args, insert_kwargs = (), inserts[0]
         assert insert_kwargs == {
             "event": event,
             "is_new_group_environment": True,
@@ -97,8 +99,8 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase):
             == 1
         )
 
-    @patch("sentry.eventstream.insert")
-    def test_issueless(self, mock_eventstream_insert):
+    @patch("sentry.eventstream.insert_many")
+    def test_issueless(self, mock_eventstream_insert_many):
         now = datetime.utcnow()
         event = self.__build_transaction_event()
         event.group_id = None
@@ -124,8 +126,8 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase):
         )
         assert len(result["data"]) == 1
 
-    @patch("sentry.eventstream.insert")
-    def test_multiple_groups(self, mock_eventstream_insert):
+    @patch("sentry.eventstream.insert_many")
+    def test_multiple_groups(self, mock_eventstream_insert_many):
         now = datetime.utcnow()
         event = self.__build_transaction_event()
         event.group_id = None
@@ -152,3 +154,32 @@ class SnubaEventStreamTest(TestCase, SnubaTestCase):
         )
         assert len(result["data"]) == 1
         assert result["data"][0]["group_ids"] == [self.group.id]
+
+    @patch("sentry.eventstream.insert_many")
+    def test_insert_many(self, mock_eventstream_insert_many):
+        event = self.__build_event(datetime.utcnow())
+        insert_kwargs = {
+            "event": event,
+            "is_new_group_environment": True,
+            "is_new": True,
+            "is_regression": False,
+            "primary_hash": "acbd18db4cc2f85cedef654fccc4a4d8",
+            "skip_consume": False,
+            "received_timestamp": event.data["received"],
+        }
+
+        self.producer_mock.produce.side_effect = [None, BufferError("queue full")]
+        errors = self.kafka_eventstream.insert_many(
+            [insert_kwargs, insert_kwargs], asynchronous=False
+        )
+
+        assert errors[0] is None
+        assert isinstance(errors[1], BufferError)
+        assert self.producer_mock.produce.call_count == 2
+        assert self.producer_mock.poll.call_count == 1
+        assert self.producer_mock.flush.call_count == 1
+
+        # Delivery failures reported by the producer are surfaced per event.
+        on_delivery = self.producer_mock.produce.call_args_list[0][1]["on_delivery"]
+        on_delivery("delivery failed", Mock())
+        assert errors[0] == "delivery failed"